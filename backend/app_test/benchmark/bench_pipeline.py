@@ -0,0 +1,263 @@
+"""
+End-to-end benchmark of `create_pokemon_complete` against the offline FakeProvider.
+
+Runs N concurrent creations per scenario (default 1, 10 and 100) through the
+real pipeline, schedulers and disk writes, and reports throughput, p50/p95/p99
+end-to-end latency, peak RSS and request bytes sent to the provider. Provider
+latency and error rates are configurable so scheduling regressions show up
+without network access. `--sprite-mode edit chained` runs every scenario in
+both sprite generation modes for comparison. `--draft-quality low` renders
+draft sprites first; latencies then measure time to a playable monster and
+`upgrade_s` the wall time until every background upgrade has landed.
+`--replay DIR` serves a cassette recorded with AI_PROVIDER=record instead, so
+scenarios run against real provider responses and latencies (scaled by
+`--latency-scale`); the latency and error-rate flags are then ignored.
+Calls are reused once the cassette runs out, and identical replayed images
+coalesce across monsters, so record at least as many monsters as a scenario
+creates for representative numbers.
+
+    python -m app_test.benchmark.bench_pipeline --concurrency 1 10 100
+"""
+
+# Standard library
+import argparse
+import asyncio
+import json
+import logging
+import os
+import resource
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+os.environ.setdefault("ENV", "testing")
+os.environ.setdefault("AI_PROVIDER", "fake")
+
+# Third-party
+from prometheus_client import REGISTRY
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, create_engine
+
+# Local application
+from src.core import settings
+from src.core.pokemon_config import MonsterConfig
+from src.database.db import Base
+from src.models import Pokemon
+from src.services import ai_provider, ai_services, pokemon_full, sprite_upgrade
+from src.services.cassette import Cassette, ReplayProvider
+from src.services.fake_provider import FakeProvider, LatencyModel
+from src.services.scheduler import image_scheduler, text_scheduler
+
+
+def percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    rank = (len(ordered) - 1) * pct / 100
+    low, high = int(rank), min(int(rank) + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def current_rss_mb() -> float:
+    try:
+        for line in Path("/proc/self/status").read_text().splitlines():
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+async def sample_peak_rss(peak: list[float], interval: float = 0.05) -> None:
+    while True:
+        peak[0] = max(peak[0], current_rss_mb())
+        await asyncio.sleep(interval)
+
+
+def counter_total(name: str, **labels: str) -> float:
+    """Sum of a Prometheus counter across label sets matching `labels`."""
+    return sum(
+        sample.value
+        for metric in REGISTRY.collect()
+        if metric.name == name
+        for sample in metric.samples
+        if sample.name.endswith("_total")
+        and all(sample.labels.get(k) == v for k, v in labels.items())
+    )
+
+
+def make_payload(i: int) -> dict:
+    return {
+        "name": f"benchmon{i}",
+        "description": f"Benchmark monster number {i}",
+        "physical_attr": "Round, spiky, glowing",
+        "ptype": "Electric",
+    }
+
+
+async def run_scenario(
+    concurrency: int, provider: FakeProvider | ReplayProvider, args
+) -> dict:
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(engine)
+    for scheduler, limit in (
+        (image_scheduler, args.image_concurrency),
+        (text_scheduler, args.text_concurrency),
+    ):
+        scheduler.configure(max_concurrency=limit, rate_per_minute=args.rpm)
+    provider.calls.clear()
+    bytes_before = counter_total("pokemon_provider_request_bytes")
+    dropped_before = counter_total("pokemon_sprites", outcome="dropped")
+    hedges_before = counter_total("pokemon_hedged_requests", outcome="fired")
+
+    latencies: list[float] = []
+    failures = 0
+
+    async def create(i: int):
+        nonlocal failures
+        started = time.perf_counter()
+        try:
+            with Session(engine) as session:
+                await pokemon_full.create_pokemon_complete(
+                    Pokemon(name=f"benchmon{i}"), make_payload(i), session
+                )
+            latencies.append(time.perf_counter() - started)
+        except Exception:
+            failures += 1
+
+    peak = [current_rss_mb()]
+    sampler = asyncio.create_task(sample_peak_rss(peak))
+    started = time.perf_counter()
+    await asyncio.gather(*(create(i) for i in range(concurrency)))
+    wall = time.perf_counter() - started
+    await asyncio.gather(*sprite_upgrade._background_tasks)
+    upgrade_wall = time.perf_counter() - started
+    sampler.cancel()
+
+    return {
+        "mode": settings.SPRITE_GENERATION_MODE,
+        "concurrency": concurrency,
+        "succeeded": len(latencies),
+        "failed": failures,
+        "wall_s": round(wall, 3),
+        "upgrade_s": round(upgrade_wall, 3) if settings.SPRITE_DRAFT_QUALITY else None,
+        "throughput_per_s": round(len(latencies) / wall, 3) if wall else 0.0,
+        "p50_s": round(percentile(latencies, 50), 3),
+        "p95_s": round(percentile(latencies, 95), 3),
+        "p99_s": round(percentile(latencies, 99), 3),
+        "peak_rss_mb": round(peak[0], 1),
+        "provider_calls": len(provider.calls),
+        "request_mb": round(
+            (counter_total("pokemon_provider_request_bytes") - bytes_before) / 2**20,
+            3,
+        ),
+        "hedges": int(
+            counter_total("pokemon_hedged_requests", outcome="fired") - hedges_before
+        ),
+        "dropped_sprites": int(
+            counter_total("pokemon_sprites", outcome="dropped") - dropped_before
+        ),
+        "rate_limited": sum(
+            c["rate_limited"]
+            for s in (image_scheduler, text_scheduler)
+            for c in s.counters.values()
+        ),
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--parse-latency", type=float, nargs=2, default=[0.2, 0.3],
+                        metavar=("MEDIAN", "SIGMA"))
+    parser.add_argument("--image-latency", type=float, nargs=2, default=[0.5, 0.3],
+                        metavar=("MEDIAN", "SIGMA"))
+    parser.add_argument("--edit-latency", type=float, nargs=2, default=[0.5, 0.5],
+                        metavar=("MEDIAN", "SIGMA"))
+    parser.add_argument("--chain-latency", type=float, nargs=2, default=[0.5, 0.5],
+                        metavar=("MEDIAN", "SIGMA"))
+    parser.add_argument("--draft-edit-latency", type=float, nargs=2,
+                        default=[0.15, 0.5], metavar=("MEDIAN", "SIGMA"),
+                        help="latency of draft-quality sprite calls")
+    parser.add_argument("--draft-quality", choices=["low", "medium"], default=None,
+                        help="render draft sprites first and upgrade in the background")
+    parser.add_argument("--sprite-mode", nargs="+", choices=["edit", "chained"],
+                        default=[settings.SPRITE_GENERATION_MODE])
+    parser.add_argument("--image-size", type=int, default=256,
+                        help="edge length of the fake PNGs (drives upload bytes)")
+    parser.add_argument("--hedge-percentile", type=float, default=None,
+                        help="hedge sprite calls slower than this latency percentile")
+    parser.add_argument("--deadline", type=float, default=None,
+                        help="pipeline deadline in seconds (drops optional sprites)")
+    parser.add_argument("--error-rate", type=float, default=0.0,
+                        help="fraction of provider calls answering 429")
+    parser.add_argument("--rpm", type=float, default=6000,
+                        help="per-model requests/minute for both schedulers")
+    parser.add_argument("--image-concurrency", type=int, default=image_scheduler.max_concurrency)
+    parser.add_argument("--text-concurrency", type=int, default=text_scheduler.max_concurrency)
+    parser.add_argument("--replay", metavar="CASSETTE_DIR", default=None,
+                        help="replay a recorded cassette instead of the FakeProvider")
+    parser.add_argument("--latency-scale", type=float, default=1.0,
+                        help="multiplier for replayed latencies (0 = no sleeping)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    return parser.parse_args(argv)
+
+
+async def main(argv=None) -> list[dict]:
+    args = parse_args(argv)
+    logging.getLogger("pokemon").setLevel(logging.ERROR)
+
+    provider = FakeProvider(
+        latency={
+            "parse": LatencyModel(*args.parse_latency),
+            "image": LatencyModel(*args.image_latency),
+            "edit": LatencyModel(*args.edit_latency),
+            "chain": LatencyModel(*args.chain_latency),
+            **{
+                f"{kind}:{args.draft_quality}": LatencyModel(*args.draft_edit_latency)
+                for kind in ("edit", "chain")
+                if args.draft_quality
+            },
+        },
+        error_rate={k: args.error_rate for k in ("parse", "image", "chain", "edit")},
+        image_size=args.image_size,
+        seed=args.seed,
+    )
+    ai_provider.set_provider(provider)
+    ai_services.llm_cache = None  # every run must reach the provider
+    settings.SPRITE_HEDGE_PERCENTILE = args.hedge_percentile
+    settings.PIPELINE_DEADLINE_SECONDS = args.deadline
+    settings.SPRITE_DRAFT_QUALITY = args.draft_quality
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for mode in args.sprite_mode:
+            settings.SPRITE_GENERATION_MODE = mode
+            for concurrency in args.concurrency:
+                MonsterConfig.MONSTER_DIR = Path(tmp) / f"{mode}_c{concurrency}"
+                if args.replay:
+                    # Each scenario replays the cassette from the start
+                    provider = ReplayProvider(
+                        Cassette(args.replay), latency_scale=args.latency_scale
+                    )
+                    ai_provider.set_provider(provider)
+                results.append(await run_scenario(concurrency, provider, args))
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        columns = list(results[0].keys())
+        print("  ".join(f"{c:>16}" for c in columns))
+        for row in results:
+            print("  ".join(f"{row[c]!s:>16}" for c in columns))
+    return results
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
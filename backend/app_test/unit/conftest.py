@@ -24,3 +24,13 @@ def _clean_db(db_session, test_engine):
     print("Cleaning database")
     Base.metadata.drop_all(test_engine)
     Base.metadata.create_all(test_engine)
+
+
+@pytest.fixture
+def enforce_foreign_keys(test_engine):
+    """Enforce FOREIGN KEY constraints, which SQLite leaves off, for one test."""
+    with test_engine.connect() as conn:
+        conn.exec_driver_sql("PRAGMA foreign_keys=ON")
+    yield
+    with test_engine.connect() as conn:
+        conn.exec_driver_sql("PRAGMA foreign_keys=OFF")
@@ -0,0 +1,36 @@
+from src.models import PokemonJob, JobStatus
+from src.database import jobs as jobs_db
+
+
+def _job(job_id="job1"):
+    return PokemonJob(id=job_id, pokemon_name="pickachu", input_data={"name": "a"})
+
+
+def test_create_job(db_session):
+    job = jobs_db.create_job(_job(), db_session)
+    assert job.status == JobStatus.queued
+    assert jobs_db.get_job("job1", db_session) == job
+
+
+def test_update_job(db_session):
+    job = jobs_db.create_job(_job(), db_session)
+    before = job.updated_at
+    updated = jobs_db.update_job(
+        "job1", db_session, status=JobStatus.running, stage="description"
+    )
+    assert updated is not None
+    assert updated.status == JobStatus.running
+    assert updated.stage == "description"
+    assert updated.updated_at >= before
+
+
+def test_update_missing_job(db_session):
+    assert jobs_db.update_job("nope", db_session, stage="setup") is None
+
+
+def test_get_jobs_by_status(db_session):
+    jobs_db.create_job(_job("a"), db_session)
+    jobs_db.create_job(_job("b"), db_session)
+    jobs_db.update_job("b", db_session, status=JobStatus.failed)
+    queued = jobs_db.get_jobs_by_status(JobStatus.queued, db_session)
+    assert [j.id for j in queued] == ["a"]
@@ -1,4 +1,4 @@
-from src.models import Pokemon
+from src.models import Pokemon, PokemonState
 from src.database import pokemon as pokemon_db
 from app_test.unit.database.fixture_pokemon_db import *
 
@@ -43,3 +43,18 @@ def test_get_all_pokemon(db_session, multiple_pokemon):
 
 def test_get_all_pokemon_empty(db_session):
     assert (pokemon_db.get_all_pokemon(db_session)) == []
+
+
+def test_claim_reserved_pokemon_takes_each_egg_once(db_session, multiple_pokemon):
+    for p in multiple_pokemon[:2]:
+        p.state = PokemonState.reserved
+    created = [pokemon_db.create_pokemon(p, db_session) for p in multiple_pokemon]
+
+    first = pokemon_db.claim_reserved_pokemon(db_session)
+    second = pokemon_db.claim_reserved_pokemon(db_session)
+
+    assert first.id == created[0].id and first.name == created[0].name
+    assert second.id == created[1].id and second.name == "geodude"
+    assert first.state == second.state == PokemonState.active
+    assert pokemon_db.claim_reserved_pokemon(db_session) is None
+    assert pokemon_db.count_pokemon_by_state(PokemonState.reserved, db_session) == 0
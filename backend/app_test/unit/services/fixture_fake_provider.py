@@ -0,0 +1,25 @@
+import pytest
+
+from src.core.pokemon_config import MonsterConfig
+from src.services import ai_provider, ai_services
+from src.services.fake_provider import FakeProvider
+from src.services.scheduler import image_scheduler, text_scheduler
+
+
+@pytest.fixture
+def fake_provider(tmp_path, monkeypatch):
+    """Route every provider call to a seeded FakeProvider with no rate limits."""
+    monkeypatch.setattr(MonsterConfig, "MONSTER_DIR", tmp_path / "monsters")
+    monkeypatch.setattr(ai_services, "llm_cache", None)
+    schedulers = (image_scheduler, text_scheduler)
+    saved = [(s.max_concurrency, s.rate_per_minute, s.base_backoff) for s in schedulers]
+    for scheduler in schedulers:
+        scheduler.configure(rate_per_minute=600_000, base_backoff=0.001)
+    provider = FakeProvider(seed=7)
+    ai_provider.set_provider(provider)
+    yield provider
+    ai_provider.set_provider(None)
+    for scheduler, (max_concurrency, rate_per_minute, base_backoff) in zip(
+        schedulers, saved
+    ):
+        scheduler.configure(max_concurrency, rate_per_minute, base_backoff)
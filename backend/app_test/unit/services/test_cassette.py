@@ -0,0 +1,118 @@
+import asyncio
+import threading
+from pathlib import Path
+
+import pytest
+
+from app_test.unit.services.fixture_fake_provider import *
+from src.database import usage as usage_db
+from src.models import Pokemon
+from src.services import ai_provider, pokemon_full
+from src.services.cassette import (
+    Cassette,
+    CassetteMiss,
+    RecordingProvider,
+    ReplayedError,
+    ReplayProvider,
+)
+from src.services.fake_provider import FakeProvider, FakeProviderError
+
+PAYLOAD = {
+    "name": "pickachu",
+    "description": "Some pokemon",
+    "physical_attr": "Yellow",
+    "ptype": "Electric",
+}
+
+
+def _images(directory: str) -> dict[str, bytes]:
+    root = Path(directory)
+    return {
+        str(p.relative_to(root)): p.read_bytes()
+        for folder in ("base", "animations")
+        for p in (root / folder).glob("*.png")
+    }
+
+
+@pytest.mark.asyncio
+async def test_replayed_creation_matches_the_recording(db_session, fake_provider, tmp_path):
+    cassette = Cassette(tmp_path / "cassette")
+    ai_provider.set_provider(RecordingProvider(fake_provider, cassette))
+    recorded = await pokemon_full.create_pokemon_complete(
+        Pokemon(name="pickachu"), PAYLOAD, db_session
+    )
+    recorded_images = _images(recorded.pokemon.image_directory)
+    recorded_usage = usage_db.get_usage_for_pokemon(recorded.pokemon.id, db_session)
+    calls = len(fake_provider.calls)
+
+    replay = ReplayProvider(cassette, latency_scale=0, strict=True)
+    ai_provider.set_provider(replay)
+    replayed = await pokemon_full.create_pokemon_complete(
+        Pokemon(name="pickachu"), PAYLOAD, db_session
+    )
+
+    assert len(fake_provider.calls) == calls  # nothing reached the inner provider
+    assert replay.remaining == 0 and replay.misses == 0
+    assert recorded_images and _images(replayed.pokemon.image_directory) == recorded_images
+    replayed_usage = usage_db.get_usage_for_pokemon(replayed.pokemon.id, db_session)
+    assert sum(r.output_tokens for r in replayed_usage) == sum(
+        r.output_tokens for r in recorded_usage
+    )
+
+
+@pytest.mark.asyncio
+async def test_replay_reraises_recorded_errors(tmp_path):
+    inner = FakeProvider(seed=1, error_rate={"parse": 1.0})
+    cassette = Cassette(tmp_path)
+    recorder = RecordingProvider(inner, cassette)
+    request = dict(model="m", messages=[{"role": "user", "content": "hi"}], response_format=Pokemon)
+    with pytest.raises(FakeProviderError):
+        await recorder.parse(**request)
+
+    replay = ReplayProvider(cassette, latency_scale=0, strict=True)
+    with pytest.raises(ReplayedError) as raised:
+        await replay.parse(**request)
+    assert raised.value.status_code == 429
+    assert raised.value.response.headers["retry-after"] == "0"
+    with pytest.raises(CassetteMiss):
+        await replay.parse(**request)
+
+
+def _request(text: str) -> dict:
+    return dict(model="m", messages=[{"role": "user", "content": text}], response_format=Pokemon)
+
+
+@pytest.mark.asyncio
+async def test_replay_prefers_exact_matches_across_recordings(tmp_path):
+    cassette = Cassette(tmp_path)
+    first = await RecordingProvider(FakeProvider(seed=1), cassette).parse(**_request("A"))
+    # A second recording appends to the same file, and records B while streaming
+    recorder = RecordingProvider(FakeProvider(seed=2), cassette)
+    await recorder.parse(**_request("C"))
+    second = "".join([d async for d in recorder.stream_parse(**_request("B"))])
+
+    replay = ReplayProvider(cassette, latency_scale=0)
+    assert await replay.parse(**_request("B")) == second
+    assert await replay.parse(**_request("A")) == first
+    assert replay.misses == 0
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_are_appended_off_the_loop_in_seq_order(
+    tmp_path, monkeypatch
+):
+    cassette = Cassette(tmp_path)
+    loop_thread = threading.get_ident()
+    threads = set()
+    append = Cassette.append
+
+    def spying_append(self, entry):
+        threads.add(threading.get_ident())
+        append(self, entry)
+
+    monkeypatch.setattr(Cassette, "append", spying_append)
+    recorder = RecordingProvider(FakeProvider(seed=1), cassette)
+    await asyncio.gather(*(recorder.parse(**_request(str(i))) for i in range(20)))
+
+    assert [entry["seq"] for entry in cassette.load()] == list(range(1, 21))
+    assert loop_thread not in threads
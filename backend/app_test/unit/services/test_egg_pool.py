@@ -0,0 +1,157 @@
+import asyncio
+from pathlib import Path
+
+import pytest
+from fastapi import HTTPException
+from sqlmodel import Session
+
+from app_test.unit.services.fixture_fake_provider import *
+from src.core import settings
+from src.core.pokemon_config import MonsterConfig
+from src.database import pokemon as pokemon_db
+from src.models import Pokemon, PokemonState
+from src.services.egg_pool import EggPool, discard_stale_eggs
+from src.services.fake_provider import LatencyModel
+from src.services.lease import lease_expiry
+from src.services.singleflight import creation_flight
+
+
+@pytest.mark.asyncio
+async def test_refill_fills_the_pool_with_reserved_eggs(
+    db_session, test_engine, fake_provider
+):
+    pool = EggPool(size=2, bind=test_engine, concurrency=2, seed=3)
+
+    assert await pool.refill() == 2
+    assert await pool.refill() == 0  # already full
+
+    assert pokemon_db.count_pokemon_by_state(PokemonState.reserved, db_session) == 2
+    eggs = pokemon_db.get_all_pokemon(db_session)
+    for egg in eggs:
+        anim_dir = Path(egg.image_directory) / "animations"
+        assert len(list(anim_dir.glob("*.png"))) == 2 * fake_provider.list_length + 1
+
+
+@pytest.mark.asyncio
+async def test_hatch_claims_each_egg_once(db_session, test_engine, fake_provider):
+    pool = EggPool(size=2, bind=test_engine, seed=3)
+    await pool.refill()
+
+    first = pool.hatch(db_session)
+    with Session(test_engine) as other:
+        second = pool.hatch(other)
+    with pytest.raises(HTTPException) as excinfo:
+        pool.hatch(db_session)
+
+    assert excinfo.value.status_code == 503
+    assert first.pokemon.id != second.pokemon.id
+    assert first.pokemon.state == PokemonState.active
+
+
+@pytest.mark.asyncio
+async def test_refill_waits_while_user_creations_run(test_engine, fake_provider):
+    pool = EggPool(size=1, bind=test_engine)
+    release = asyncio.Event()
+    user_creation = asyncio.ensure_future(creation_flight.do("user", release.wait))
+    await asyncio.sleep(0)
+
+    assert pool.busy()
+    assert await pool.refill() == 0
+    assert fake_provider.calls == []
+
+    release.set()
+    await user_creation
+    assert await pool.refill() == 1
+
+
+@pytest.mark.asyncio
+async def test_incomplete_egg_is_discarded(db_session, test_engine, fake_provider):
+    fake_provider.error_rate["edit"] = 1.0
+    fake_provider.error_status = 500
+    pool = EggPool(size=1, bind=test_engine)
+
+    assert await pool.refill() == 0
+    assert pokemon_db.get_all_pokemon(db_session) == []
+    assert [p.name for p in MonsterConfig.MONSTER_DIR.iterdir()] == [".blobs"]
+    assert not any((MonsterConfig.MONSTER_DIR / ".blobs").glob("??/??/*"))
+
+
+@pytest.mark.asyncio
+async def test_cancelled_incubation_leaves_no_egg(db_session, test_engine, fake_provider):
+    fake_provider.latency["image"] = LatencyModel(median=5.0)
+    pool = EggPool(size=1, bind=test_engine)
+    pool.start()
+    while not pokemon_db.get_all_pokemon(db_session):
+        await asyncio.sleep(0.01)
+
+    await pool.stop()
+
+    assert pokemon_db.get_all_pokemon(db_session) == []
+    assert not any(p.name != ".blobs" for p in MonsterConfig.MONSTER_DIR.iterdir())
+
+
+def test_stale_incubating_eggs_are_discarded(db_session):
+    egg = pokemon_db.create_pokemon(
+        Pokemon(name="stale", state=PokemonState.incubating), db_session
+    )
+    lapsed = pokemon_db.create_pokemon(
+        Pokemon(
+            name="lapsed",
+            state=PokemonState.incubating,
+            lease_expires_at=lease_expiry(-1),
+        ),
+        db_session,
+    )
+    pokemon_db.create_pokemon(
+        Pokemon(
+            name="elsewhere",  # another worker's, still renewed
+            state=PokemonState.incubating,
+            lease_expires_at=lease_expiry(60),
+        ),
+        db_session,
+    )
+    pokemon_db.create_pokemon(Pokemon(name="kept", state=PokemonState.reserved), db_session)
+
+    assert discard_stale_eggs(db_session) == 2
+    assert db_session.get(Pokemon, egg.id) is None
+    assert db_session.get(Pokemon, lapsed.id) is None
+    assert pokemon_db.count_pokemon_by_state(PokemonState.incubating, db_session) == 1
+    assert pokemon_db.count_pokemon_by_state(PokemonState.reserved, db_session) == 1
+
+
+@pytest.mark.asyncio
+async def test_refill_counts_eggs_other_workers_incubate(
+    db_session, test_engine, fake_provider
+):
+    pokemon_db.create_pokemon(
+        Pokemon(
+            name="elsewhere",
+            state=PokemonState.incubating,
+            lease_expires_at=lease_expiry(60),
+        ),
+        db_session,
+    )
+    pool = EggPool(size=2, bind=test_engine, seed=3)
+
+    assert await pool.refill() == 1
+    assert pokemon_db.count_pokemon_by_state(PokemonState.reserved, db_session) == 1
+
+
+@pytest.mark.asyncio
+async def test_incubating_egg_renews_its_lease(
+    db_session, test_engine, fake_provider, monkeypatch
+):
+    monkeypatch.setattr(settings, "EGG_LEASE_SECONDS", 0.06)
+    fake_provider.latency["image"] = LatencyModel(median=0.2)
+    pool = EggPool(size=1, bind=test_engine)
+    incubation = asyncio.ensure_future(pool.incubate())
+    leases = set()
+    while not incubation.done():
+        await asyncio.sleep(0.02)
+        with Session(test_engine) as other:
+            for egg in pokemon_db.get_pokemon_by_state(PokemonState.incubating, other):
+                leases.add(egg.lease_expires_at)
+                assert egg not in pokemon_db.get_lapsed_eggs(other)
+
+    assert await incubation is not None
+    assert len(leases) > 1
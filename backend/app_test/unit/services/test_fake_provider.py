@@ -0,0 +1,247 @@
+import asyncio
+import base64
+
+import pytest
+
+from app_test.unit.services.fixture_fake_provider import *
+from src.core import settings
+from src.core.pokemon_config import MonsterConfig
+from src.database import pokemon as pokemon_db
+from src.models import Pokemon
+from src.services import pokemon_full, sprite_upgrade
+from src.services.fake_provider import (
+    FakeProvider,
+    FakeProviderError,
+    LatencyModel,
+    fake_png,
+)
+from src.services.pokemon_generation import (
+    PokemonDescription,
+    PokemonExpressionSet,
+    PokemonMoveList,
+)
+from src.utils import image_utils
+
+PAYLOAD = {
+    "name": "pickachu",
+    "description": "Some pokemon",
+    "physical_attr": "Yellow",
+    "ptype": "Electric",
+}
+
+
+def test_fake_png_is_png():
+    assert fake_png().startswith(b"\x89PNG\r\n\x1a\n")
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "schema", [PokemonDescription, PokemonMoveList, PokemonExpressionSet]
+)
+async def test_parse_returns_schema_valid_json(schema):
+    content = await FakeProvider(seed=1).parse(
+        model="gpt-5", messages=[], response_format=schema
+    )
+    schema.model_validate_json(content)
+
+
+@pytest.mark.asyncio
+async def test_injected_errors_carry_status():
+    provider = FakeProvider(seed=1, error_rate={"edit": 1.0}, error_status=500)
+    with pytest.raises(FakeProviderError) as excinfo:
+        await provider.edit_image(model="gpt-image-1", image=None, prompt="p")
+    assert excinfo.value.status_code == 500
+
+
+@pytest.mark.asyncio
+async def test_create_pokemon_complete_offline(db_session, fake_provider):
+    result = await pokemon_full.create_pokemon_complete(
+        Pokemon(name="pickachu"), PAYLOAD, db_session
+    )
+
+    folder = MonsterConfig.MONSTER_DIR / f"pickachu_{result.pokemon.id}"
+    sprites = list((folder / "animations").glob("*.png"))
+    # 4 moves + 4 expressions + the generic fallback
+    assert len(sprites) == 2 * fake_provider.list_length + 1
+    assert (folder / "base" / "base.png").read_bytes().startswith(b"\x89PNG")
+    kinds = [kind for kind, _, _ in fake_provider.calls]
+    assert kinds.count("parse") == 3
+    assert kinds.count("image") == 1
+    assert kinds.count("edit") == len(sprites)
+
+
+@pytest.mark.asyncio
+async def test_reference_image_read_once_per_run(db_session, fake_provider, monkeypatch):
+    reads = []
+    original = image_utils.read_reference_image
+
+    def counting_read(path, *args):
+        reads.append(path)
+        return original(path, *args)
+
+    monkeypatch.setattr(image_utils, "read_reference_image", counting_read)
+    references = []
+    edit_image = fake_provider.edit_image
+
+    async def recording_edit(**kwargs):
+        references.append(kwargs["image"])
+        return await edit_image(**kwargs)
+
+    monkeypatch.setattr(fake_provider, "edit_image", recording_edit)
+
+    await pokemon_full.create_pokemon_complete(
+        Pokemon(name="pickachu"), PAYLOAD, db_session
+    )
+
+    assert len(reads) == 1
+    assert len(references) == 2 * fake_provider.list_length + 1
+    assert all(ref is references[0] for ref in references)
+    assert references[0].data.startswith(b"\x89PNG")
+    assert base64.b64decode(references[0].b64) == references[0].data
+
+
+@pytest.mark.asyncio
+async def test_chained_sprites_continue_base_image_response(
+    db_session, fake_provider, monkeypatch
+):
+    monkeypatch.setattr(settings, "SPRITE_GENERATION_MODE", "chained")
+
+    result = await pokemon_full.create_pokemon_complete(
+        Pokemon(name="pickachu"), PAYLOAD, db_session
+    )
+
+    folder = MonsterConfig.MONSTER_DIR / f"pickachu_{result.pokemon.id}"
+    sprites = list((folder / "animations").glob("*.png"))
+    kinds = [kind for kind, _, _ in fake_provider.calls]
+    assert kinds.count("image") == 1
+    assert kinds.count("edit") == 0
+    assert kinds.count("chain") == len(sprites) == 2 * fake_provider.list_length + 1
+
+
+@pytest.mark.asyncio
+async def test_identical_concurrent_creations_are_coalesced(db_session, fake_provider):
+    events: dict[str, list[str]] = {"first": [], "second": []}
+
+    def listener(name):
+        async def on_progress(stage, info):
+            events[name].append(stage)
+
+        return on_progress
+
+    first, second = await asyncio.gather(
+        pokemon_full.create_pokemon_complete(
+            Pokemon(name="pickachu"), PAYLOAD, db_session, listener("first")
+        ),
+        pokemon_full.create_pokemon_complete(
+            Pokemon(name="pickachu"), dict(PAYLOAD), db_session, listener("second")
+        ),
+    )
+
+    assert first.pokemon.id == second.pokemon.id
+    assert len(pokemon_db.get_all_pokemon(db_session)) == 1
+    kinds = [kind for kind, _, _ in fake_provider.calls]
+    assert kinds.count("image") == 1
+    assert kinds.count("parse") == 3
+    assert events["first"] == events["second"]
+    assert events["first"][0] == "setup" and events["first"][-1] == "persist"
+
+
+@pytest.mark.asyncio
+async def test_sprites_start_while_moveset_streams(db_session, fake_provider):
+    fake_provider.latency["parse"] = LatencyModel(0.2)
+    events = []
+
+    async def on_progress(stage, info):
+        events.append((stage, info.get("id")))
+
+    await pokemon_full.create_pokemon_complete(
+        Pokemon(name="pickachu"), PAYLOAD, db_session, on_progress
+    )
+
+    first_move_sprite = next(
+        i for i, (stage, sprite_id) in enumerate(events)
+        if stage == "sprite" and sprite_id.startswith("move_")
+    )
+    assert first_move_sprite < events.index(("movesets", None))
+    sprites = [e for e in events if e[0] == "sprite"]
+    assert len(sprites) == 2 * fake_provider.list_length + 1
+
+
+@pytest.mark.asyncio
+async def test_unstreamed_moveset_dispatches_same_sprites(
+    db_session, fake_provider, monkeypatch
+):
+    monkeypatch.setattr(settings, "STREAM_STRUCTURED_OUTPUT", False)
+
+    result = await pokemon_full.create_pokemon_complete(
+        Pokemon(name="pickachu"), PAYLOAD, db_session
+    )
+
+    folder = MonsterConfig.MONSTER_DIR / f"pickachu_{result.pokemon.id}"
+    assert len(list((folder / "animations").glob("*.png"))) == (
+        2 * fake_provider.list_length + 1
+    )
+
+
+@pytest.mark.asyncio
+async def test_text_only_movesets_draft_alongside_base_image(
+    db_session, fake_provider, monkeypatch
+):
+    monkeypatch.setattr(settings, "MOVESET_FROM_IMAGE", False)
+    fake_provider.latency["image"] = LatencyModel(0.2)
+    events = {}
+
+    async def on_progress(stage, info):
+        events.setdefault(stage, info)
+
+    result = await pokemon_full.create_pokemon_complete(
+        Pokemon(name="pickachu"), PAYLOAD, db_session, on_progress
+    )
+
+    # Both movesets were drafted before the base image call returned
+    assert list(events).index("movesets") < list(events).index("base_image")
+    folder = MonsterConfig.MONSTER_DIR / f"pickachu_{result.pokemon.id}"
+    assert len(list((folder / "animations").glob("*.png"))) == (
+        2 * fake_provider.list_length + 1
+    )
+    path = [step["stage"] for step in events["persist"]["critical_path"]]
+    assert path[0] == "description" and path[-1] == "sprites"
+    assert "base_image" in path
+
+
+@pytest.mark.asyncio
+async def test_draft_sprites_are_upgraded_in_background(
+    db_session, fake_provider, monkeypatch
+):
+    monkeypatch.setattr(settings, "SPRITE_DRAFT_QUALITY", "low")
+    fake_provider.latency["edit:high"] = LatencyModel(0.05)
+    qualities = []
+    edit_image = fake_provider.edit_image
+
+    async def recording_edit(**kwargs):
+        qualities.append(kwargs["quality"])
+        return await edit_image(**kwargs)
+
+    monkeypatch.setattr(fake_provider, "edit_image", recording_edit)
+    events = {}
+
+    async def on_progress(stage, info):
+        events[stage] = info
+
+    result = await pokemon_full.create_pokemon_complete(
+        Pokemon(name="pickachu"), PAYLOAD, db_session, on_progress
+    )
+
+    count = 2 * fake_provider.list_length + 1
+    folder = MonsterConfig.MONSTER_DIR / f"pickachu_{result.pokemon.id}"
+    drafts = {p.name: p.read_bytes() for p in (folder / "animations").glob("*.png")}
+    assert qualities[:count] == ["low"] * count
+    assert events["persist"]["upgrading"] == count
+
+    await asyncio.gather(*sprite_upgrade._background_tasks)
+
+    assert qualities[count:] == ["high"] * count
+    upgraded = {p.name: p.read_bytes() for p in (folder / "animations").glob("*.png")}
+    assert upgraded.keys() == drafts.keys()
+    assert all(upgraded[name] != drafts[name] for name in drafts)
+    assert not list((folder / "animations").glob(".*.tmp"))
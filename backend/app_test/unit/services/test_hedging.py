@@ -0,0 +1,118 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+import pytest
+
+from src.services.hedging import LatencyTracker, hedged
+from src.services.scheduler import ProviderScheduler
+
+
+def test_latency_tracker_waits_for_min_samples():
+    tracker = LatencyTracker(min_samples=3)
+    tracker.observe(1.0)
+    tracker.observe(2.0)
+    assert tracker.percentile(95) is None
+
+    tracker.observe(3.0)
+    assert tracker.percentile(50) == 2.0
+    assert tracker.percentile(95) == 3.0
+
+
+def _calls(*delays, fail=()):
+    """A call factory whose n-th attempt sleeps delays[n] (and fails if n in fail)."""
+    attempts = []
+
+    async def call():
+        n = len(attempts)
+        attempts.append("started")
+        try:
+            await asyncio.sleep(delays[n])
+        except asyncio.CancelledError:
+            attempts[n] = "cancelled"
+            raise
+        if n in fail:
+            raise ValueError(f"attempt {n} failed")
+        attempts[n] = "done"
+        return n
+
+    return call, attempts
+
+
+@pytest.mark.asyncio
+async def test_fast_call_is_not_hedged():
+    call, attempts = _calls(0.0, 0.0)
+    assert await hedged(call, hedge_after=0.05) == 0
+    assert attempts == ["done"]
+
+
+@pytest.mark.asyncio
+async def test_slow_call_is_hedged_and_loser_cancelled():
+    call, attempts = _calls(1.0, 0.0)
+    tracker = LatencyTracker(min_samples=1)
+    hedges = []
+
+    @asynccontextmanager
+    async def hedge_slot():
+        hedges.append(True)
+        yield
+
+    assert (
+        await hedged(call, hedge_after=0.01, hedge_slot=hedge_slot, tracker=tracker)
+        == 1
+    )
+    await asyncio.sleep(0)
+    assert attempts == ["cancelled", "done"]
+    assert hedges == [True]
+    assert len(tracker.samples) == 1
+
+
+@pytest.mark.asyncio
+async def test_hedge_survives_one_failed_attempt():
+    call, attempts = _calls(0.05, 0.1, fail={0})
+    assert await hedged(call, hedge_after=0.01) == 1
+
+
+@pytest.mark.asyncio
+async def test_error_before_hedge_propagates():
+    call, attempts = _calls(0.0, fail={0})
+    with pytest.raises(ValueError):
+        await hedged(call, hedge_after=1.0)
+    assert len(attempts) == 1
+
+
+@pytest.mark.asyncio
+async def test_hedge_takes_its_own_scheduler_slot():
+    scheduler = ProviderScheduler(max_concurrency=2, rate_per_minute=60_000)
+    call, attempts = _calls(1.0, 0.0)
+    seen = []
+
+    async def observed():
+        seen.append(scheduler.in_flight)
+        return await call()
+
+    result = await scheduler.run(
+        "gpt-image-1",
+        lambda: hedged(
+            observed, hedge_after=0.01, hedge_slot=lambda: scheduler.slot("gpt-image-1")
+        ),
+    )
+    assert result == 1
+    assert seen == [1, 2]
+    assert scheduler.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_hedge_is_not_sent_past_the_concurrency_cap():
+    scheduler = ProviderScheduler(max_concurrency=1, rate_per_minute=60_000)
+    call, attempts = _calls(0.05, 0.0)
+
+    result = await scheduler.run(
+        "gpt-image-1",
+        lambda: hedged(
+            call, hedge_after=0.01, hedge_slot=lambda: scheduler.slot("gpt-image-1")
+        ),
+    )
+    await asyncio.sleep(0)  # let the queued duplicate unwind
+    assert result == 0
+    assert attempts == ["done"]
+    assert scheduler.metrics()["queue_depth"] == 0
@@ -0,0 +1,152 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+from sqlmodel import Session
+
+from src.core import settings
+from src.database import jobs as jobs_db
+from src.database import pokemon as pokemon_db
+from src.models import JobStatus, Pokemon, PokemonJob
+from src.response_models import PokemonResponse
+from src.services import job_service, pokemon_full
+from src.services.pokemon_full import PIPELINE_STAGES
+from src.services import pokemon_crud
+from src.services.lease import lease_expiry
+
+PAYLOAD = {
+    "name": "pickachu",
+    "description": "Some pokemon",
+    "physical_attr": "Yellow",
+    "ptype": "Electric",
+}
+
+
+def _queued_job(db_session) -> PokemonJob:
+    return jobs_db.create_job(
+        PokemonJob(
+            id="job1",
+            pokemon_name="pickachu",
+            input_data=PAYLOAD,
+            stages_total=len(PIPELINE_STAGES),
+        ),
+        db_session,
+    )
+
+
+@pytest.mark.asyncio
+async def test_run_pokemon_job_records_stages(db_session, test_engine, monkeypatch):
+    _queued_job(db_session)
+    seen = []
+
+    async def fake_pipeline(pokemon, pokemon_data, session, on_progress=None):
+        created = pokemon_crud.create_pokemon(pokemon, session)
+        for stage in PIPELINE_STAGES:
+            await on_progress(stage, {"pokemon_id": created.id})
+            seen.append(jobs_db.get_job("job1", session).stages_completed)
+        return PokemonResponse(status=200, detail="ok", pokemon=created)
+
+    monkeypatch.setattr(pokemon_full, "create_pokemon_complete", fake_pipeline)
+    await job_service.run_pokemon_job("job1", bind=test_engine)
+
+    assert seen == list(range(1, len(PIPELINE_STAGES) + 1))
+    with Session(test_engine) as session:
+        job = jobs_db.get_job("job1", session)
+        assert job.status == JobStatus.succeeded
+        assert job.pokemon_id == 1
+        assert job.result["pokemon"]["name"] == "pickachu"
+
+
+@pytest.mark.asyncio
+async def test_run_pokemon_job_records_failure(db_session, test_engine, monkeypatch):
+    _queued_job(db_session)
+
+    async def failing_pipeline(pokemon, pokemon_data, session, on_progress=None):
+        raise HTTPException(status_code=500, detail="Description generation failed.")
+
+    monkeypatch.setattr(pokemon_full, "create_pokemon_complete", failing_pipeline)
+    await job_service.run_pokemon_job("job1", bind=test_engine)
+
+    with Session(test_engine) as session:
+        job = jobs_db.get_job("job1", session)
+        assert job.status == JobStatus.failed
+        assert job.error == "Description generation failed."
+
+
+def test_get_job_status_missing(db_session):
+    with pytest.raises(HTTPException) as excinfo:
+        job_service.get_job_status("nope", db_session)
+    assert excinfo.value.status_code == 404
+
+
+def test_fail_interrupted_jobs(db_session):
+    live = lease_expiry(60)
+    for job_id, status, lease in (
+        ("queued", JobStatus.queued, None),
+        ("running", JobStatus.running, lease_expiry(-1)),
+        ("elsewhere", JobStatus.running, live),  # another worker's, still renewed
+        ("done", JobStatus.succeeded, None),
+    ):
+        jobs_db.create_job(
+            PokemonJob(
+                id=job_id,
+                pokemon_name="pickachu",
+                status=status,
+                lease_expires_at=lease,
+            ),
+            db_session,
+        )
+
+    assert job_service.fail_interrupted_jobs(db_session) == 2
+    assert jobs_db.get_job("running", db_session).status == JobStatus.failed
+    assert jobs_db.get_job("queued", db_session).error.startswith("Interrupted")
+    assert jobs_db.get_job("elsewhere", db_session).status == JobStatus.running
+    assert jobs_db.get_job("done", db_session).status == JobStatus.succeeded
+
+
+def test_get_job_status_fails_a_lapsed_job(db_session):
+    jobs_db.create_job(
+        PokemonJob(
+            id="job1",
+            pokemon_name="pickachu",
+            status=JobStatus.running,
+            lease_expires_at=lease_expiry(-1),
+        ),
+        db_session,
+    )
+
+    assert job_service.get_job_status("job1", db_session).status == JobStatus.failed
+
+
+@pytest.mark.asyncio
+async def test_running_job_keeps_renewing_its_lease(
+    db_session, test_engine, monkeypatch
+):
+    monkeypatch.setattr(settings, "JOB_LEASE_SECONDS", 0.06)
+    _queued_job(db_session)
+    leases = []
+
+    async def slow_pipeline(pokemon, pokemon_data, session, on_progress=None):
+        for _ in range(3):
+            await asyncio.sleep(0.05)
+            with Session(test_engine) as other:
+                leases.append(jobs_db.get_job("job1", other).lease_expires_at)
+        raise HTTPException(status_code=500, detail="stop")
+
+    monkeypatch.setattr(pokemon_full, "create_pokemon_complete", slow_pipeline)
+    await job_service.run_pokemon_job("job1", bind=test_engine)
+
+    assert leases == sorted(leases) and len(set(leases)) == 3
+
+
+def test_deleting_the_pokemon_keeps_its_jobs(db_session, enforce_foreign_keys):
+    pokemon = pokemon_crud.create_pokemon(Pokemon(name="pickachu"), db_session)
+    jobs_db.create_job(
+        PokemonJob(id="job1", pokemon_name="pickachu", pokemon_id=pokemon.id),
+        db_session,
+    )
+
+    pokemon_db.delete_pokemon(pokemon, db_session)
+
+    db_session.expire_all()
+    assert jobs_db.get_job("job1", db_session).pokemon_id is None
@@ -0,0 +1,75 @@
+import time
+
+import pytest
+from pydantic import BaseModel
+
+from src.services.llm_cache import LLMCache
+
+
+class Schema(BaseModel):
+    summary: str
+
+
+class OtherSchema(BaseModel):
+    moves: list[str]
+
+
+def _key(prompt="prompt", image_b64=None, response_model=Schema, model="gpt-5"):
+    return LLMCache.make_key(
+        prompt=prompt, model=model, response_model=response_model, image_b64=image_b64
+    )
+
+
+def test_key_covers_every_input():
+    base = _key()
+    assert base == _key()
+    assert base != _key(prompt="other")
+    assert base != _key(model="gpt-4o")
+    assert base != _key(response_model=OtherSchema)
+    assert base != _key(image_b64="aGVsbG8=")
+
+
+def test_hit_and_miss(tmp_path):
+    cache = LLMCache(tmp_path, max_bytes=1024 * 1024)
+    key = _key()
+    assert cache.get(key) is None
+    cache.set(key, '{"summary": "x"}')
+    assert cache.get(key) == '{"summary": "x"}'
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 1, 1)
+
+
+def test_persists_across_instances(tmp_path):
+    LLMCache(tmp_path, max_bytes=1024 * 1024).set("abc", "value")
+    assert LLMCache(tmp_path, max_bytes=1024 * 1024).get("abc") == "value"
+
+
+def test_evicts_least_recently_used(tmp_path):
+    cache = LLMCache(tmp_path, max_bytes=250)
+    cache.set("a", "x" * 50)
+    cache.set("b", "x" * 50)
+    cache.get("a")  # "b" is now the least recently used
+    cache.set("c", "x" * 50)
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_ttl_expiry(tmp_path):
+    cache = LLMCache(tmp_path, max_bytes=1024 * 1024, ttl=0.05)
+    cache.set("a", "value")
+    assert cache.get("a") == "value"
+    time.sleep(0.1)
+    assert cache.get("a") is None
+    assert cache.stats()["entries"] == 0
+
+
+@pytest.mark.asyncio
+async def test_async_access_shares_the_cache(tmp_path):
+    cache = LLMCache(tmp_path, max_bytes=1024 * 1024)
+    await cache.set_async("a", "value")
+    assert cache.get("a") == "value"
+    assert await cache.get_async("a") == "value"
+    assert await cache.get_async("missing") is None
+    assert cache.stats()["hits"] == 2
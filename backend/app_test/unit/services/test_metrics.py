@@ -0,0 +1,66 @@
+import pytest
+from prometheus_client import REGISTRY
+
+from app_test.unit.services.fixture_fake_provider import *
+from app_test.unit.services.test_scheduler import FakeRateLimitError
+from src.models import Pokemon
+from src.services import pokemon_full
+from src.services.metrics import observe_call, render_metrics, stage_timer
+from src.services.scheduler import ProviderScheduler
+
+
+def _count(name, **labels):
+    return REGISTRY.get_sample_value(f"{name}_count", labels) or 0
+
+
+def test_stage_timer_records_outcome():
+    before_ok = _count("pokemon_pipeline_stage_seconds", stage="unit", outcome="ok")
+    before_err = _count("pokemon_pipeline_stage_seconds", stage="unit", outcome="error")
+
+    with stage_timer("unit"):
+        pass
+    with pytest.raises(ValueError):
+        with stage_timer("unit"):
+            raise ValueError("boom")
+
+    assert _count("pokemon_pipeline_stage_seconds", stage="unit", outcome="ok") == before_ok + 1
+    assert (
+        _count("pokemon_pipeline_stage_seconds", stage="unit", outcome="error")
+        == before_err + 1
+    )
+
+
+@pytest.mark.asyncio
+async def test_observe_call_labels_rate_limits():
+    labels = dict(call="unit", model="m", outcome="rate_limited")
+    before = _count("pokemon_provider_call_seconds", **labels)
+
+    async def limited():
+        raise FakeRateLimitError()
+
+    with pytest.raises(FakeRateLimitError):
+        await observe_call("unit", "m", limited())
+    assert _count("pokemon_provider_call_seconds", **labels) == before + 1
+
+
+def test_render_metrics_includes_scheduler_gauges():
+    scheduler = ProviderScheduler(max_concurrency=1, rate_per_minute=60)
+    body, content_type = render_metrics({"unit": scheduler})
+    assert content_type.startswith("text/plain")
+    assert b'pokemon_scheduler_queue_depth{scheduler="unit"} 0.0' in body
+
+
+@pytest.mark.asyncio
+async def test_pipeline_records_every_stage(db_session, fake_provider):
+    stages = ["setup", "description", "base_image", "moveset", "expressions", "sprites"]
+    before = {s: _count("pokemon_pipeline_stage_seconds", stage=s, outcome="ok") for s in stages}
+
+    await pokemon_full.create_pokemon_complete(
+        Pokemon(name="pickachu"),
+        {"name": "pickachu", "description": "d", "physical_attr": "p", "ptype": "t"},
+        db_session,
+    )
+
+    for stage in stages:
+        assert _count("pokemon_pipeline_stage_seconds", stage=stage, outcome="ok") == before[stage] + 1
+    assert REGISTRY.get_sample_value("pokemon_pipelines_in_flight") == 0
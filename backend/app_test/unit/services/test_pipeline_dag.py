@@ -0,0 +1,120 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from src.services.pipeline_dag import Dag, Node
+
+
+def _sleeper(result, delay=0.01, log=None):
+    async def fn(**inputs):
+        if log is not None:
+            log.append(("start", result))
+        await asyncio.sleep(delay)
+        if log is not None:
+            log.append(("end", result))
+        return result
+
+    return fn
+
+
+def _flaky(failures, error=None):
+    attempts = []
+
+    async def fn(**inputs):
+        attempts.append(True)
+        if len(attempts) <= failures:
+            raise error or RuntimeError("transient")
+        return "ok"
+
+    return fn, attempts
+
+
+@pytest.mark.asyncio
+async def test_independent_nodes_run_concurrently_and_receive_dep_outputs():
+    log = []
+    received = {}
+
+    async def join(left, right):
+        received.update(left=left, right=right)
+        return left + right
+
+    dag = Dag(
+        [
+            Node("left", _sleeper(1, delay=0.05, log=log)),
+            Node("right", _sleeper(2, delay=0.05, log=log)),
+            Node("join", join, ("left", "right")),
+        ]
+    )
+    run = await dag.run()
+
+    assert run.outputs["join"] == 3
+    assert received == {"left": 1, "right": 2}
+    # Both started before either finished
+    assert [event for event, _ in log[:2]] == ["start", "start"]
+
+
+@pytest.mark.asyncio
+async def test_retries_transient_failures():
+    fn, attempts = _flaky(failures=2)
+    dag = Dag([Node("flaky", fn, retries=2, backoff=0)])
+
+    run = await dag.run()
+
+    assert run.outputs["flaky"] == "ok"
+    assert len(attempts) == 3
+    assert run.timings["flaky"].attempts == 3
+
+
+@pytest.mark.asyncio
+async def test_client_errors_are_not_retried():
+    fn, attempts = _flaky(failures=5, error=HTTPException(status_code=400))
+    dag = Dag([Node("bad", fn, retries=3, backoff=0)])
+
+    with pytest.raises(HTTPException):
+        await dag.run()
+    assert len(attempts) == 1
+
+
+@pytest.mark.asyncio
+async def test_failure_cancels_the_other_nodes():
+    cancelled = asyncio.Event()
+
+    async def slow():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    fn, _ = _flaky(failures=1)
+    dag = Dag([Node("slow", slow), Node("broken", fn)])
+
+    with pytest.raises(RuntimeError):
+        await dag.run()
+    assert cancelled.is_set()
+
+
+def test_rejects_cycles_and_unknown_deps():
+    noop = _sleeper(None)
+    with pytest.raises(ValueError, match="Cycle"):
+        Dag([Node("a", noop, ("b",)), Node("b", noop, ("a",))])
+    with pytest.raises(ValueError, match="unknown"):
+        Dag([Node("a", noop, ("missing",))])
+
+
+@pytest.mark.asyncio
+async def test_critical_path_follows_the_slowest_chain():
+    async def after(**inputs):
+        return None
+
+    dag = Dag(
+        [
+            Node("fast", _sleeper("fast", delay=0.01)),
+            Node("slow", _sleeper("slow", delay=0.08)),
+            Node("end", after, ("fast", "slow")),
+        ]
+    )
+    run = await dag.run()
+
+    assert [step["stage"] for step in run.critical_path(dag)] == ["slow", "end"]
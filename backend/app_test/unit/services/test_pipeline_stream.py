@@ -0,0 +1,73 @@
+import json
+
+import pytest
+from fastapi import HTTPException
+
+from src.response_models import PokemonResponse
+from src.services import pipeline_stream, pokemon_crud, pokemon_full
+
+PAYLOAD = {
+    "name": "pickachu",
+    "description": "Some pokemon",
+    "physical_attr": "Yellow",
+    "ptype": "Electric",
+}
+
+
+def _parse(chunks):
+    events = []
+    for chunk in chunks:
+        if chunk.startswith(":"):
+            continue
+        event_line, data_line = chunk.strip().split("\n")
+        events.append((event_line[len("event: ") :], json.loads(data_line[len("data: ") :])))
+    return events
+
+
+def test_format_sse():
+    assert pipeline_stream.format_sse("setup", {"pokemon_id": 1}) == (
+        'event: setup\ndata: {"pokemon_id": 1}\n\n'
+    )
+
+
+@pytest.mark.asyncio
+async def test_stream_emits_stages_then_complete(db_session, test_engine, monkeypatch):
+    async def fake_pipeline(pokemon, pokemon_data, session, on_progress=None):
+        created = pokemon_crud.create_pokemon(pokemon, session)
+        await on_progress("setup", {"pokemon_id": created.id})
+        await on_progress("sprite", {"name": "tackle", "url": "/images/x.png"})
+        return PokemonResponse(status=200, detail="ok", pokemon=created)
+
+    monkeypatch.setattr(pokemon_full, "create_pokemon_complete", fake_pipeline)
+    events = await pipeline_stream.stream_pokemon_creation(
+        "pickachu", PAYLOAD, bind=test_engine
+    )
+    parsed = _parse([chunk async for chunk in events])
+
+    assert [name for name, _ in parsed] == ["setup", "sprite", "complete"]
+    assert parsed[1][1]["name"] == "tackle"
+    assert parsed[2][1]["pokemon"]["name"] == "pickachu"
+
+
+@pytest.mark.asyncio
+async def test_stream_reports_errors(test_engine, monkeypatch):
+    async def failing_pipeline(pokemon, pokemon_data, session, on_progress=None):
+        raise HTTPException(status_code=500, detail="Moveset generation failed.")
+
+    monkeypatch.setattr(pokemon_full, "create_pokemon_complete", failing_pipeline)
+    events = await pipeline_stream.stream_pokemon_creation(
+        "pickachu", PAYLOAD, bind=test_engine
+    )
+    parsed = _parse([chunk async for chunk in events])
+    assert parsed == [
+        ("error", {"status_code": 500, "detail": "Moveset generation failed."})
+    ]
+
+
+@pytest.mark.asyncio
+async def test_stream_rejects_invalid_input(test_engine):
+    with pytest.raises(HTTPException) as excinfo:
+        await pipeline_stream.stream_pokemon_creation(
+            "pickachu", {"name": "x"}, bind=test_engine
+        )
+    assert excinfo.value.status_code == 422
@@ -0,0 +1,87 @@
+import json
+
+import pytest
+from fastapi import HTTPException
+
+from src.core.pokemon_config import MonsterConfig
+from src.database import pokemon as pokemon_db
+from src.database import usage as usage_db
+from src.response_models import PokemonResponse
+from src.services import pokemon_batch, pokemon_crud, pokemon_full
+from src.services.singleflight import creation_flight
+
+
+def _payload(name):
+    return {
+        "name": name,
+        "description": "Some pokemon",
+        "physical_attr": "Yellow",
+        "ptype": "Electric",
+    }
+
+
+@pytest.mark.asyncio
+async def test_batch_setup_creates_rows_and_files(db_session, tmp_path, monkeypatch):
+    monkeypatch.setattr(MonsterConfig, "MONSTER_DIR", tmp_path / "monsters")
+
+    rows = await pokemon_batch.batch_pokemon_setup(
+        [_payload("pickachu"), _payload("geodude")], db_session
+    )
+
+    assert [data.name for _, data in rows] == ["pickachu", "geodude"]
+    assert len(pokemon_db.get_all_pokemon(db_session)) == 2
+    for pokemon_id, data in rows:
+        folder = tmp_path / "monsters" / f"{data.name}_{pokemon_id}"
+        saved = json.loads((folder / "data" / "data_user.json").read_text())
+        assert saved["name"] == data.name
+        for sub in MonsterConfig.DATA_DIRS:
+            assert (folder / sub).is_dir()
+
+
+@pytest.mark.asyncio
+async def test_batch_setup_validates_before_writing(db_session, tmp_path, monkeypatch):
+    monkeypatch.setattr(MonsterConfig, "MONSTER_DIR", tmp_path / "monsters")
+
+    with pytest.raises(HTTPException) as excinfo:
+        await pokemon_batch.batch_pokemon_setup(
+            [_payload("pickachu"), {"name": "broken"}], db_session
+        )
+    assert excinfo.value.status_code == 422
+    assert pokemon_db.get_all_pokemon(db_session) == []
+
+
+@pytest.mark.asyncio
+async def test_create_batch_reports_per_monster(
+    db_session, test_engine, tmp_path, monkeypatch
+):
+    monkeypatch.setattr(MonsterConfig, "MONSTER_DIR", tmp_path / "monsters")
+
+    in_flight = []
+
+    async def fake_stages(pokemon_id, pokemon_data, session, on_progress=None, deadline=None):
+        in_flight.append(("pokemon", pokemon_id) in creation_flight)
+        if pokemon_data.name == "geodude":
+            raise HTTPException(status_code=500, detail="Base image failed.")
+        return PokemonResponse(
+            status=200,
+            detail="Pokemon Created Successfully",
+            pokemon=pokemon_crud.get_pokemon_by_id(pokemon_id, session),
+        )
+
+    monkeypatch.setattr(pokemon_full, "run_creation_stages", fake_stages)
+    result = await pokemon_batch.create_pokemon_batch(
+        [_payload("pickachu"), _payload("geodude"), _payload("charizard")],
+        db_session,
+        bind=test_engine,
+        max_parallel=2,
+    )
+
+    assert (result.total, result.succeeded, result.failed) == (3, 2, 1)
+    assert [r.status for r in result.results] == ["succeeded", "failed", "succeeded"]
+    assert result.results[1].detail == "Base image failed."
+    assert all(r.pokemon_id is not None for r in result.results)
+    # Same bookkeeping as a single creation: egg pool sees it, usage is saved
+    assert in_flight == [True, True, True]
+    for r in result.results:
+        stages = {u.stage for u in usage_db.get_usage_for_pokemon(r.pokemon_id, db_session)}
+        assert "total" in stages
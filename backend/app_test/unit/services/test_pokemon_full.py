@@ -0,0 +1,276 @@
+import asyncio
+import base64
+import json
+
+import pytest
+from fastapi import HTTPException
+
+from src.core.pokemon_config import MonsterConfig
+from src.models import Pokemon
+from src.services import pokemon_crud, pokemon_full, pokemon_generation
+from src.services.pokemon_generation import PokemonExpressionSet, PokemonMoveList
+from src.utils import blob_store
+
+
+async def _sprite(delay, value="b64", fail=False):
+    await asyncio.sleep(delay)
+    if fail:
+        raise ValueError("generation failed")
+    return (None, [value])
+
+
+def _meta(name, coro):
+    return {"id": name, "name": name, "task": coro, "data": {"name": name}}
+
+
+@pytest.mark.asyncio
+async def test_run_sprite_tasks_persists_in_completion_order():
+    persisted = []
+
+    async def on_complete(sprite):
+        persisted.append((sprite["name"], sprite["result"]))
+        return f"/tmp/{sprite['name']}.png"
+
+    completed = await pokemon_full.run_sprite_tasks(
+        [
+            _meta("slow", _sprite(0.05, "slow")),
+            _meta("fast", _sprite(0.0, "fast")),
+        ],
+        on_complete=on_complete,
+    )
+
+    assert persisted == [("fast", (None, ["fast"])), ("slow", (None, ["slow"]))]
+    assert [s["name"] for s in completed] == ["fast", "slow"]
+    # Payloads are released once handed off
+    assert all(s["result"] is None for s in completed)
+    assert completed[0]["persisted"] == "/tmp/fast.png"
+
+
+@pytest.mark.asyncio
+async def test_run_sprite_tasks_records_failures():
+    async def on_complete(sprite):
+        if sprite["name"] == "broken_write":
+            raise OSError("disk full")
+
+    completed = await pokemon_full.run_sprite_tasks(
+        [
+            _meta("broken", _sprite(0, fail=True)),
+            _meta("broken_write", _sprite(0)),
+            _meta("ok", _sprite(0)),
+        ],
+        on_complete=on_complete,
+    )
+    by_name = {s["name"]: s for s in completed}
+    assert isinstance(by_name["broken"]["error"], ValueError)
+    assert isinstance(by_name["broken_write"]["persist_error"], OSError)
+    assert "error" not in by_name["ok"] and "persist_error" not in by_name["ok"]
+
+
+@pytest.mark.asyncio
+async def test_run_sprite_tasks_without_callback_keeps_results():
+    completed = await pokemon_full.run_sprite_tasks([_meta("a", _sprite(0, "a"))])
+    assert completed[0]["result"] == (None, ["a"])
+
+
+@pytest.mark.asyncio
+async def test_discarded_sprites_are_cancelled_or_awaited():
+    persisting = asyncio.Event()
+    persisted = []
+
+    async def on_complete(sprite):
+        persisting.set()
+        await asyncio.sleep(0.02)
+        persisted.append(sprite["name"])
+
+    runner = pokemon_full.SpriteRunner(on_complete=on_complete)
+    runner.add(_meta("writing", _sprite(0.0)))
+    runner.add(_meta("rendering", _sprite(5.0)))
+    runner.add(_meta("kept", _sprite(0.05)))
+    await persisting.wait()
+
+    await runner.discard({"writing", "rendering"})
+    assert persisted == ["writing"]  # finished before discard returned
+
+    completed = await runner.results()
+    assert [s["name"] for s in completed] == ["kept"]
+    assert persisted == ["writing", "kept"]
+
+
+# ── Resume from checkpoints ────────────────────────────────────────────────────
+
+PNG = base64.b64encode(b"\x89PNG\r\n\x1a\nFAKE").decode()
+
+USER_DATA = {
+    "name": "pickachu",
+    "description": "Some pokemon",
+    "physical_attr": "Yellow",
+    "ptype": "Electric",
+}
+MOVES = PokemonMoveList.model_validate(
+    {
+        "move_list": [
+            {
+                "name": "Thunder Jolt",
+                "attack_type": "Electric",
+                "move_type": "attack",
+                "category": "special",
+                "description": "Zap",
+                "sprite_animation": "sparks",
+            }
+        ]
+    }
+)
+EXPRESSIONS = PokemonExpressionSet.model_validate(
+    {
+        "expressions": [
+            {
+                "name": "Happy Hop",
+                "mood": "happy",
+                "style": "idle",
+                "description": "Hops",
+                "sprite_animation": "bounce",
+            }
+        ]
+    }
+)
+
+
+@pytest.mark.asyncio
+async def test_run_sprite_tasks_drops_optional_sprites_at_deadline():
+    deadline = asyncio.get_running_loop().time() + 0.05
+    tasks = [
+        {**_meta("fast", _sprite(0.0, "fast")), "optional": True},
+        {**_meta("straggler", _sprite(5.0, "slow")), "optional": True},
+        {**_meta("generic", _sprite(0.1, "generic")), "optional": False},
+    ]
+
+    completed = await pokemon_full.run_sprite_tasks(tasks, deadline=deadline)
+
+    by_name = {c["name"]: c for c in completed}
+    assert by_name["fast"]["result"] == (None, ["fast"])
+    assert by_name["generic"]["result"] == (None, ["generic"])
+    assert by_name["straggler"]["dropped"] is True
+    assert isinstance(by_name["straggler"]["error"], TimeoutError)
+
+
+async def _never_called(*args, **kwargs):
+    raise AssertionError("checkpointed stage was regenerated")
+
+
+@pytest.mark.asyncio
+async def test_resume_only_regenerates_missing_sprites(
+    db_session, tmp_path, monkeypatch
+):
+    monkeypatch.setattr(MonsterConfig, "MONSTER_DIR", tmp_path / "monsters")
+    pokemon = pokemon_crud.create_pokemon(Pokemon(name="pickachu"), db_session)
+    folder = tmp_path / "monsters" / f"pickachu_{pokemon.id}"
+    for sub in MonsterConfig.DATA_DIRS:
+        (folder / sub).mkdir(parents=True)
+    pokemon.image_directory = str(folder)
+    pokemon_crud.create_pokemon(pokemon, db_session)
+
+    data = folder / "data"
+    (data / "data_user.json").write_text(json.dumps(USER_DATA))
+    (data / "monster_data.json").write_text(
+        json.dumps({**USER_DATA, "image_description": "A yellow mouse"})
+    )
+    (data / "moveset.json").write_text(MOVES.model_dump_json())
+    (data / "expressions.json").write_text(EXPRESSIONS.model_dump_json())
+    (folder / "base" / "base.png").write_bytes(b"\x89PNG")
+    (folder / "animations" / "thunder_jolt.png").write_bytes(b"\x89PNG")
+
+    for name in (
+        "generate_pokemon_description_async",
+        "generate_pokemon_base_image_async",
+        "generate_moveset_async",
+        "generate_cute_moveset_async",
+    ):
+        monkeypatch.setattr(pokemon_generation, name, _never_called)
+
+    rendered = []
+
+    async def fake_sprite(response, animation, transparent=False, quality=None):
+        rendered.append(animation)
+        return (None, [PNG])
+
+    monkeypatch.setattr(pokemon_generation, "fwp_image_generation_sprite", fake_sprite)
+
+    events = []
+
+    async def on_progress(stage, info):
+        events.append((stage, info))
+
+    result = await pokemon_full.resume_pokemon_creation(
+        pokemon.id, db_session, on_progress=on_progress
+    )
+
+    assert result.pokemon.id == pokemon.id
+    assert len(rendered) == 2  # happy_hop + generic; thunder_jolt was on disk
+    assert (folder / "animations" / "happy_hop.png").exists()
+    assert (folder / "animations" / "generic.png").exists()
+    sprites = [info for stage, info in events if stage == "sprite"]
+    assert sorted(s["name"] for s in sprites) == ["generic", "happy_hop"]
+    assert dict(events)["sprites"]["skipped"] == 1
+
+
+@pytest.mark.asyncio
+async def test_sprites_of_moves_dropped_by_a_retried_stream_are_removed(
+    db_session, tmp_path, monkeypatch
+):
+    monkeypatch.setattr(MonsterConfig, "MONSTER_DIR", tmp_path / "monsters")
+    pokemon = pokemon_crud.create_pokemon(Pokemon(name="pickachu"), db_session)
+    folder = tmp_path / "monsters" / f"pickachu_{pokemon.id}"
+    for sub in MonsterConfig.DATA_DIRS:
+        (folder / sub).mkdir(parents=True)
+    pokemon.image_directory = str(folder)
+    pokemon_crud.create_pokemon(pokemon, db_session)
+
+    data = folder / "data"
+    (data / "data_user.json").write_text(json.dumps(USER_DATA))
+    (data / "monster_data.json").write_text(
+        json.dumps({**USER_DATA, "image_description": "A yellow mouse"})
+    )
+    (data / "expressions.json").write_text(EXPRESSIONS.model_dump_json())
+    (folder / "base" / "base.png").write_bytes(b"\x89PNG")
+
+    stale = MOVES.move_list[0].model_copy(update={"name": "Static Shock"})
+
+    async def flaky_stream(pokemon_id, description, base_image, on_move):
+        # The first attempt streamed "Static Shock" before failing
+        on_move(1, stale)
+        await asyncio.sleep(0.05)  # its sprite renders and is persisted meanwhile
+        on_move(1, MOVES.move_list[0])
+        return MOVES
+
+    async def fake_sprite(response, animation, transparent=False, quality=None):
+        return (None, [PNG])
+
+    monkeypatch.setattr(pokemon_full, "generate_moveset", flaky_stream)
+    monkeypatch.setattr(pokemon_generation, "fwp_image_generation_sprite", fake_sprite)
+
+    events = []
+
+    async def on_progress(stage, info):
+        events.append((stage, info))
+
+    await pokemon_full.resume_pokemon_creation(
+        pokemon.id, db_session, on_progress=on_progress
+    )
+
+    anim = folder / "animations"
+    assert sorted(p.stem for p in anim.glob("*.png")) == [
+        "generic", "happy_hop", "thunder_jolt"
+    ]
+    assert not (anim / "static_shock.json").exists()
+    assert not any("static_shock" in rel for rel in blob_store.read_manifest(folder))
+    assert dict(events)["sprites"]["total"] == 3
+
+
+@pytest.mark.asyncio
+async def test_resume_without_input_data(db_session, tmp_path, monkeypatch):
+    monkeypatch.setattr(MonsterConfig, "MONSTER_DIR", tmp_path / "monsters")
+    pokemon = pokemon_crud.create_pokemon(Pokemon(name="pickachu"), db_session)
+
+    with pytest.raises(HTTPException) as excinfo:
+        await pokemon_full.resume_pokemon_creation(pokemon.id, db_session)
+    assert excinfo.value.status_code == 409
@@ -0,0 +1,86 @@
+import asyncio
+import time
+
+import pytest
+
+from src.services.scheduler import ProviderScheduler, TokenBucket, retry_after_seconds
+
+
+class FakeResponse:
+    def __init__(self, headers):
+        self.headers = headers
+
+
+class FakeRateLimitError(Exception):
+    status_code = 429
+
+    def __init__(self, retry_after="0"):
+        super().__init__("rate limited")
+        self.response = FakeResponse({"retry-after": retry_after})
+
+
+def test_retry_after_seconds():
+    assert retry_after_seconds(FakeRateLimitError("2")) == 2.0
+    assert retry_after_seconds(ValueError()) is None
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_paces_requests():
+    bucket = TokenBucket(rate_per_minute=600, burst=1)  # 10/s
+    start = time.monotonic()
+    for _ in range(4):
+        await bucket.acquire()
+    assert time.monotonic() - start >= 0.25
+
+
+@pytest.mark.asyncio
+async def test_concurrency_cap():
+    scheduler = ProviderScheduler(max_concurrency=2, rate_per_minute=60_000)
+    peak = 0
+
+    async def call():
+        nonlocal peak
+        peak = max(peak, scheduler.in_flight)
+        await asyncio.sleep(0.01)
+        return "ok"
+
+    results = await asyncio.gather(
+        *[scheduler.run("gpt-image-1", call) for _ in range(6)]
+    )
+    assert results == ["ok"] * 6
+    assert peak == 2
+    metrics = scheduler.metrics()
+    assert metrics["queue_depth"] == 0
+    assert metrics["models"]["gpt-image-1"]["completed"] == 6
+
+
+@pytest.mark.asyncio
+async def test_retries_rate_limited_calls():
+    scheduler = ProviderScheduler(
+        max_concurrency=1, rate_per_minute=60_000, base_backoff=0.01
+    )
+    attempts = 0
+
+    async def flaky():
+        nonlocal attempts
+        attempts += 1
+        if attempts < 3:
+            raise FakeRateLimitError()
+        return "ok"
+
+    assert await scheduler.run("gpt-image-1", flaky) == "ok"
+    counters = scheduler.metrics()["models"]["gpt-image-1"]
+    assert counters["rate_limited"] == 2
+    assert counters["completed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_other_errors_propagate():
+    scheduler = ProviderScheduler(max_concurrency=1, rate_per_minute=60_000)
+
+    async def broken():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        await scheduler.run("gpt-image-1", broken)
+    assert scheduler.metrics()["models"]["gpt-image-1"]["failed"] == 1
@@ -0,0 +1,82 @@
+import asyncio
+
+import pytest
+
+from src.services.singleflight import SingleFlight
+
+
+def _counting(result=None, delay=0.01, error=None):
+    calls = []
+
+    async def fn():
+        calls.append(True)
+        await asyncio.sleep(delay)
+        if error is not None:
+            raise error
+        return result
+
+    return fn, calls
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_one_computation():
+    flight = SingleFlight("test")
+    fn, calls = _counting(result="shared")
+
+    results = await asyncio.gather(*(flight.do("k", fn) for _ in range(5)))
+
+    assert results == ["shared"] * 5
+    assert len(calls) == 1
+    assert "k" not in flight
+
+
+@pytest.mark.asyncio
+async def test_different_keys_and_later_calls_run_separately():
+    flight = SingleFlight("test")
+    fn, calls = _counting()
+
+    await asyncio.gather(flight.do("a", fn), flight.do("b", fn))
+    await flight.do("a", fn)
+
+    assert len(calls) == 3
+
+
+@pytest.mark.asyncio
+async def test_errors_reach_every_waiter():
+    flight = SingleFlight("test")
+    fn, calls = _counting(error=ValueError("boom"))
+
+    results = await asyncio.gather(
+        flight.do("k", fn), flight.do("k", fn), return_exceptions=True
+    )
+
+    assert [type(r) for r in results] == [ValueError, ValueError]
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_cancelling_one_waiter_keeps_the_computation():
+    flight = SingleFlight("test")
+    fn, _ = _counting(result="done", delay=0.05)
+
+    first = asyncio.create_task(flight.do("k", fn))
+    second = asyncio.create_task(flight.do("k", fn))
+    await asyncio.sleep(0.01)
+    first.cancel()
+
+    assert await second == "done"
+
+
+@pytest.mark.asyncio
+async def test_cancelling_every_waiter_cancels_the_computation():
+    flight = SingleFlight("test")
+    fn, _ = _counting(delay=10)
+
+    waiter = asyncio.create_task(flight.do("k", fn))
+    await asyncio.sleep(0.01)
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    await asyncio.sleep(0)
+
+    assert "k" not in flight
@@ -0,0 +1,66 @@
+import os
+
+import pytest
+
+pytest.importorskip("PIL")
+
+from src.core import settings
+from src.services import sprite_atlas
+from src.services.fake_provider import fake_png
+
+
+@pytest.fixture
+def monster_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "SPRITE_ATLAS_CELL", 32)
+    monkeypatch.setattr(settings, "IMAGE_VARIANT_FORMATS", [])
+    anim = tmp_path / "animations"
+    anim.mkdir()
+    for seed, name in enumerate(["idle", "tackle", "thunder"]):
+        (anim / f"{name}.png").write_bytes(fake_png(64, 64, seed=seed + 1))
+    return tmp_path
+
+
+def _opened_sheets(monkeypatch):
+    opened = []
+    original = sprite_atlas.Image.open
+
+    def counting_open(path, *args, **kwargs):
+        if "animations" in str(path):
+            opened.append(os.path.basename(path))
+        return original(path, *args, **kwargs)
+
+    monkeypatch.setattr(sprite_atlas.Image, "open", counting_open)
+    return opened
+
+
+def test_atlas_packs_every_sheet_with_a_versioned_image(monster_dir):
+    manifest = sprite_atlas.build_atlas(monster_dir)
+
+    assert set(manifest["sprites"]) == {"idle", "tackle", "thunder"}
+    assert (manifest["columns"], manifest["rows"]) == (2, 2)
+    image = monster_dir / "atlas" / manifest["image"]
+    assert manifest["image"] == f"atlas.{manifest['version']}.png"
+    with sprite_atlas.Image.open(image) as atlas:
+        tackle = manifest["sprites"]["tackle"]
+        assert atlas.getpixel((tackle["x"] + 1, tackle["y"] + 1))[:3] == (106, 194, 130)
+
+
+def test_rebuild_only_redraws_changed_sheets(monster_dir, monkeypatch):
+    first = sprite_atlas.build_atlas(monster_dir)
+    opened = _opened_sheets(monkeypatch)
+
+    assert sprite_atlas.build_atlas(monster_dir) == first
+    assert opened == []
+
+    (monster_dir / "animations" / "tackle.png").write_bytes(fake_png(64, 64, seed=9))
+    (monster_dir / "animations" / "bite.png").write_bytes(fake_png(64, 64, seed=4))
+    second = sprite_atlas.build_atlas(monster_dir)
+
+    assert sorted(opened) == ["bite.png", "tackle.png"]
+    assert second["version"] != first["version"]
+    for name in ("idle", "tackle", "thunder"):
+        assert second["sprites"][name]["slot"] == first["sprites"][name]["slot"]
+    # The new version is written and the previous one kept for old manifests
+    assert sorted(p.name for p in (monster_dir / "atlas").glob("atlas.*.png")) == sorted(
+        [first["image"], second["image"]]
+    )
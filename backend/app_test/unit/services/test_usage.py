@@ -0,0 +1,100 @@
+from pathlib import Path
+
+import pytest
+
+from app_test.unit.services.fixture_fake_provider import *
+from src.core import settings
+from src.database import usage as usage_db
+from src.models import Pokemon, PokemonUsage
+from src.services import pokemon_full, usage
+from src.services.metrics import observe_call, stage_timer
+from src.services.usage import UsageLedger, report_usage, track_usage
+from src.web import pokemon as pokemon_routes
+
+PAYLOAD = {
+    "name": "pickachu",
+    "description": "Some pokemon",
+    "physical_attr": "Yellow",
+    "ptype": "Electric",
+}
+
+
+async def _call(input_tokens, output_tokens, error=None):
+    report_usage(input_tokens, output_tokens, images=1)
+    if error is not None:
+        raise error
+    return "ok"
+
+
+@pytest.mark.asyncio
+async def test_ledger_attributes_calls_to_the_enclosing_stage(monkeypatch):
+    monkeypatch.setattr(settings, "MODEL_PRICES", {"m": (1.0, 2.0)})
+    ledger = UsageLedger()
+
+    with track_usage(ledger):
+        with stage_timer("base_image"):
+            await observe_call("edit_image", "m", _call(100, 1000))
+            with pytest.raises(RuntimeError):
+                await observe_call("edit_image", "m", _call(0, 0, RuntimeError()))
+    await observe_call("edit_image", "m", _call(5, 5))  # outside any creation
+
+    (row,) = [r for r in ledger.rows(pokemon_id=1) if r.stage == "base_image"]
+    assert row.calls == 2
+    assert row.retries == 1
+    assert row.image_calls == 2
+    assert (row.input_tokens, row.output_tokens) == (100, 1000)
+    assert row.cost_usd == pytest.approx((100 * 1.0 + 1000 * 2.0) / 1e6)
+    assert row.seconds >= row.call_seconds
+
+
+def test_summarize_stages_reports_p95_and_cost():
+    rows = [
+        PokemonUsage(pokemon_id=i, stage="sprites", seconds=float(i), cost_usd=0.5)
+        for i in range(1, 21)
+    ] + [PokemonUsage(pokemon_id=1, stage="description", seconds=2.0, calls=1)]
+
+    summary = {s["stage"]: s for s in usage.summarize_stages(rows)}
+
+    assert summary["sprites"]["runs"] == 20
+    assert summary["sprites"]["p95_s"] == 19.0
+    assert summary["sprites"]["cost_usd"] == 10.0
+    assert summary["sprites"]["cost_per_run_usd"] == 0.5
+    assert summary["description"]["calls"] == 1
+
+
+@pytest.mark.asyncio
+async def test_creation_persists_usage_per_stage(db_session, fake_provider):
+    result = await pokemon_full.create_pokemon_complete(
+        Pokemon(name="pickachu"), PAYLOAD, db_session
+    )
+
+    rows = {r.stage: r for r in usage_db.get_usage_for_pokemon(result.pokemon.id, db_session)}
+    assert rows["description"].calls == 1
+    assert rows["base_image"].image_calls == 1
+    assert rows["sprites"].image_calls == 2 * fake_provider.list_length + 1
+    assert rows["moveset"].input_tokens > 0 and rows["moveset"].output_tokens > 0
+    assert rows["total"].seconds >= rows["sprites"].seconds
+    assert sum(r.calls for r in rows.values()) == len(fake_provider.calls)
+    assert sum(r.cost_usd for r in rows.values()) > 0
+
+    report = usage.stage_report(hours=1, session=db_session)
+    assert report["monsters"] == 1
+    assert {s["stage"] for s in report["stages"]} >= {"description", "sprites"}
+
+
+@pytest.mark.asyncio
+async def test_deleting_a_monster_deletes_its_usage(
+    db_session, fake_provider, enforce_foreign_keys
+):
+    result = await pokemon_full.create_pokemon_complete(
+        Pokemon(name="pickachu"), PAYLOAD, db_session
+    )
+    pokemon_id = result.pokemon.id
+    folder = Path(result.pokemon.image_directory)
+    assert usage_db.get_usage_for_pokemon(pokemon_id, db_session)
+
+    await pokemon_routes.delete_pokemon(pokemon_id, db_session)
+
+    assert db_session.get(Pokemon, pokemon_id) is None
+    assert usage_db.get_usage_for_pokemon(pokemon_id, db_session) == []
+    assert not folder.exists()
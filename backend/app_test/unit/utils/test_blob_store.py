@@ -0,0 +1,129 @@
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from src.core.pokemon_config import MonsterConfig
+from src.utils import blob_store
+
+SPRITE = b"\x89PNG sprite bytes" * 64
+
+
+@pytest.fixture
+def monsters(tmp_path, monkeypatch):
+    monkeypatch.setattr(MonsterConfig, "MONSTER_DIR", tmp_path)
+    for name in ("pika_1", "pika_2"):
+        (tmp_path / name).mkdir()
+    return tmp_path
+
+
+def test_identical_files_are_stored_once(monsters):
+    first = blob_store.put_bytes(SPRITE, monsters / "pika_1" / "base" / "base.png")
+    second = blob_store.put_chunks(
+        [SPRITE[:100], SPRITE[100:]], monsters / "pika_2" / "animations" / "idle.png"
+    )
+
+    assert first.read_bytes() == second.read_bytes() == SPRITE
+    assert os.path.samefile(first, second)
+    assert len(list((monsters / ".blobs").glob("??/??/*"))) == 1
+
+    entry = blob_store.read_manifest(monsters / "pika_2")["animations/idle.png"]
+    assert entry["size"] == len(SPRITE)
+    assert blob_store.blob_path(entry["sha256"]).is_file()
+
+
+def test_rewriting_the_same_content_is_a_no_op(monsters):
+    target = monsters / "pika_1" / "data" / "moveset.json"
+    blob_store.put_bytes(b"{}", target)
+    before = target.stat()
+    manifest_before = (monsters / "pika_1" / "manifest.json").stat()
+
+    blob_store.put_bytes(b"{}", target)
+
+    assert target.stat().st_ino == before.st_ino
+    assert target.stat().st_mtime_ns == before.st_mtime_ns
+    assert (monsters / "pika_1" / "manifest.json").stat().st_mtime_ns == manifest_before.st_mtime_ns
+
+
+def test_verify_reports_tampered_and_missing_files(monsters):
+    monster = monsters / "pika_1"
+    blob_store.put_bytes(SPRITE, monster / "base" / "base.png")
+    blob_store.put_bytes(b'{"name": "pika"}', monster / "data" / "data_user.json")
+    blob_store.put_bytes(b"gone", monster / "animations" / "idle.png")
+    assert blob_store.verify_monster(monster, deep=True) == []
+
+    # A copy with other content of the same size, and a deleted sprite
+    tampered = monster / "data" / "data_user.json"
+    tampered.unlink()
+    tampered.write_bytes(b'{"name": "evil"}')
+    (monster / "animations" / "idle.png").unlink()
+
+    assert sorted(
+        (p["path"], p["problem"]) for p in blob_store.verify_monster(monster)
+    ) == [("animations/idle.png", "missing file"), ("data/data_user.json", "content mismatch")]
+
+
+def test_gc_drops_blobs_of_removed_monsters(monsters):
+    blob_store.put_bytes(SPRITE, monsters / "pika_1" / "base" / "base.png")
+    blob_store.put_bytes(SPRITE, monsters / "pika_2" / "base" / "base.png")
+    blob_store.put_bytes(b"only pika_2", monsters / "pika_2" / "data" / "moveset.json")
+
+    shutil.rmtree(monsters / "pika_2")
+    assert blob_store.gc_blobs() == 1
+    assert blob_store.verify_monster(monsters / "pika_1", deep=True) == []
+
+
+def test_gc_skips_blobs_removed_while_it_scans(monsters, monkeypatch):
+    blob_store.put_bytes(SPRITE, monsters / "pika_1" / "base" / "base.png")
+    shutil.rmtree(monsters / "pika_1")
+    listed_then_removed = blob_store.blob_path("ab" * 32)  # by another worker
+    glob = Path.glob
+
+    def racing_glob(self, pattern):
+        yield from glob(self, pattern)
+        if pattern == "??/??/*":
+            yield listed_then_removed
+
+    monkeypatch.setattr(Path, "glob", racing_glob)
+    assert blob_store.gc_blobs() == 1
+
+
+@pytest.mark.skipif(blob_store.fcntl is None, reason="needs fcntl")
+def test_monster_lock_holds_across_processes(monsters):
+    fcntl = blob_store.fcntl
+    with blob_store._monster_lock(monsters / "pika_1"):
+        lock_file = next((monsters / ".blobs" / "locks").glob("monster-*"))
+        fd = os.open(lock_file, os.O_RDWR)  # as another worker would
+        try:
+            with pytest.raises(BlockingIOError):
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        finally:
+            os.close(fd)
+
+
+def test_remove_file_drops_its_entry_and_unshared_blob(monsters):
+    shared = blob_store.put_bytes(SPRITE, monsters / "pika_1" / "animations" / "a.png")
+    blob_store.put_bytes(SPRITE, monsters / "pika_2" / "animations" / "a.png")
+    own = blob_store.put_bytes(b"only here", monsters / "pika_1" / "animations" / "a.json")
+
+    assert blob_store.remove_file(own) and blob_store.remove_file(shared)
+    assert not blob_store.remove_file(own)
+    assert blob_store.read_manifest(monsters / "pika_1") == {}
+    assert len(list((monsters / ".blobs").glob("??/??/*"))) == 1
+    assert blob_store.verify_monster(monsters / "pika_2", deep=True) == []
+
+
+def test_concurrent_writes_and_removal_keep_one_blob(monsters):
+    targets = [monsters / "pika_1" / "animations" / f"{i}.png" for i in range(16)]
+    with ThreadPoolExecutor(8) as pool:
+        list(pool.map(lambda t: blob_store.put_bytes(SPRITE, t), targets))
+    assert len({t.stat().st_ino for t in targets}) == 1
+
+    assert blob_store.remove_monster(monsters / "pika_1") == 1
+    with pytest.raises(FileNotFoundError):  # a late write does not resurrect it
+        blob_store.put_bytes(SPRITE, targets[0])
+    assert not (monsters / "pika_1").exists()
+    assert not any((monsters / ".blobs").glob("??/??/*"))
+
@@ -0,0 +1,57 @@
+import base64
+
+import pytest
+from fastapi import HTTPException
+
+from src.utils import image_utils
+from src.utils.image_utils import extract_base64, replace_image_data, write_image_data
+
+DATA = bytes(range(256)) * 50
+B64 = base64.b64encode(DATA).decode("ascii")
+
+
+@pytest.mark.parametrize(
+    "image_data",
+    [
+        [B64],
+        (B64.encode(),),
+        {"b64_json": B64},
+        [{"image_base64": B64}],
+        f"data:image/png;base64,{B64}",
+        "\n".join(B64[i : i + 76] for i in range(0, len(B64), 76)),
+    ],
+)
+def test_extract_base64_normalizes_every_shape(image_data):
+    assert base64.b64decode(extract_base64(image_data)) == DATA
+
+
+@pytest.mark.asyncio
+async def test_write_decodes_in_chunks_and_leaves_no_temp_files(tmp_path, monkeypatch):
+    chunks = []
+    original = image_utils.iter_base64_chunks
+
+    def recording_chunks(b64, chunk_size=None):
+        for chunk in original(b64, chunk_size):
+            chunks.append(len(chunk))
+            yield chunk
+
+    monkeypatch.setattr(image_utils, "IMAGE_DECODE_CHUNK", 64)
+    monkeypatch.setattr(image_utils, "iter_base64_chunks", recording_chunks)
+
+    result = await write_image_data([B64], tmp_path / "sprites", filename="tackle")
+
+    assert result["filepath"].read_bytes() == DATA
+    assert max(chunks) == 48 and sum(chunks) == len(DATA)
+    assert [p.name for p in (tmp_path / "sprites").iterdir()] == ["tackle.png"]
+
+
+@pytest.mark.asyncio
+async def test_failed_replace_keeps_the_previous_image(tmp_path):
+    target = tmp_path / "tackle.png"
+    target.write_bytes(b"old")
+
+    with pytest.raises(HTTPException):
+        await replace_image_data([B64[:-10] + "!!!!!!!!!!"], target)
+
+    assert target.read_bytes() == b"old"
+    assert [p.name for p in tmp_path.iterdir()] == ["tackle.png"]
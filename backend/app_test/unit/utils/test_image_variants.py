@@ -0,0 +1,80 @@
+import base64
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.core import settings
+from src.services.fake_provider import fake_png
+from src.utils import image_variants
+from src.utils.image_utils import write_image
+from src.web.images import ImageFiles
+
+BROWSER_ACCEPT = "image/avif,image/webp,image/apng,image/*,*/*;q=0.8"
+
+
+@pytest.fixture(autouse=True)
+def variant_settings(monkeypatch):
+    monkeypatch.setattr(settings, "IMAGE_VARIANT_FORMATS", ["webp"])
+    monkeypatch.setattr(settings, "IMAGE_THUMBNAIL_SIZES", [128, 256])
+
+
+def test_candidates_prefer_accepted_formats_and_fitting_thumbnails():
+    path = "monsters/pika_1/animations/tackle.png"
+
+    assert image_variants.variant_candidates(path, BROWSER_ACCEPT) == [
+        "monsters/pika_1/animations/_variants/tackle.webp",
+        path,
+    ]
+    assert image_variants.variant_candidates(path, "image/png", size=200) == [
+        "monsters/pika_1/animations/_variants/tackle@256.png",
+        path,
+    ]
+    assert image_variants.variant_candidates(path, "image/webp;q=0", size=2048) == [path]
+    assert image_variants.variant_candidates("monsters/data.json", BROWSER_ACCEPT) == [
+        "monsters/data.json"
+    ]
+
+
+def test_image_files_serve_variants_and_fall_back_to_the_original(tmp_path):
+    sprite = tmp_path / "pika_1" / "animations" / "tackle.png"
+    sprite.parent.mkdir(parents=True)
+    sprite.write_bytes(fake_png())
+    image_variants.variant_path(sprite, "webp", 256).parent.mkdir()
+    image_variants.variant_path(sprite, "webp", 256).write_bytes(b"small webp")
+
+    app = FastAPI()
+    app.mount("/images", ImageFiles(directory=tmp_path), name="images")
+    client = TestClient(app)
+
+    thumb = client.get(
+        "/images/pika_1/animations/tackle.png?size=256", headers={"Accept": BROWSER_ACCEPT}
+    )
+    assert thumb.content == b"small webp"
+    assert thumb.headers["content-type"] == "image/webp"
+    assert thumb.headers["vary"] == "Accept"
+
+    full = client.get("/images/pika_1/animations/tackle.png", headers={"Accept": BROWSER_ACCEPT})
+    assert full.content == fake_png()
+    assert full.headers["content-type"] == "image/png"
+
+
+@pytest.mark.asyncio
+async def test_written_images_get_webp_and_thumbnail_variants(tmp_path):
+    pytest.importorskip("PIL")
+    png = fake_png(width=512, height=512, seed=3)
+
+    path = await write_image([base64.b64encode(png).decode()], tmp_path / "base.png")
+
+    written = sorted(p.name for p in (tmp_path / image_variants.VARIANTS_DIR).iterdir())
+    assert written == [
+        "base.webp", "base@128.png", "base@128.webp", "base@256.png", "base@256.webp"
+    ]
+    assert path.read_bytes() == png
+
+
+def test_missing_pillow_is_reported(monkeypatch, caplog):
+    monkeypatch.setattr(image_variants, "Image", None)
+
+    assert image_variants.warn_if_unavailable() is False
+    assert "image variants are disabled" in caplog.text
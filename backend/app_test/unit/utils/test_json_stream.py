@@ -0,0 +1,36 @@
+import json
+
+import pytest
+
+from src.utils.json_stream import JsonListItems
+
+DOC = json.dumps(
+    {
+        "other": [{"name": "ignored"}],
+        "move_list": [
+            {"name": 'Tricky "}] quote', "tags": [1, {"x": 2}]},
+            {"name": "Second"},
+        ],
+        "tail": "move_list",
+    }
+)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 7, len(DOC)])
+def test_items_are_returned_whole_regardless_of_chunking(chunk_size):
+    parser = JsonListItems("move_list")
+    items = []
+    for start in range(0, len(DOC), chunk_size):
+        items.extend(parser.feed(DOC[start : start + chunk_size]))
+
+    assert items == [
+        (0, {"name": 'Tricky "}] quote', "tags": [1, {"x": 2}]}),
+        (1, {"name": "Second"}),
+    ]
+
+
+def test_item_is_returned_as_soon_as_it_closes():
+    parser = JsonListItems("move_list")
+    assert parser.feed('{"move_list": [{"name": "a"}') == [(0, {"name": "a"})]
+    assert parser.feed(', {"name": "b"') == []
+    assert parser.feed("}]}") == [(1, {"name": "b"})]
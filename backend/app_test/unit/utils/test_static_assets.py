@@ -0,0 +1,81 @@
+import gzip
+import hashlib
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.utils.static_assets import asset_info, precompress_dir, versioned_url
+from src.web.static_files import IMMUTABLE, REVALIDATE, CachedStaticFiles
+
+BUNDLE = b"console.log('monsters');\n" * 200
+
+
+@pytest.fixture
+def site(tmp_path):
+    (tmp_path / "assets").mkdir()
+    (tmp_path / "assets" / "index-Ab12Cd34.js").write_bytes(BUNDLE)
+    (tmp_path / "index.html").write_bytes(b"<html>" + b" " * 2048 + b"</html>")
+    app = FastAPI()
+    app.mount(
+        "/", CachedStaticFiles(directory=tmp_path, html=True, immutable=r"^assets/")
+    )
+    return tmp_path, TestClient(app)
+
+
+def test_strong_etag_and_if_none_match(site):
+    root, client = site
+    digest = hashlib.sha256((root / "index.html").read_bytes()).hexdigest()
+
+    first = client.get("/index.html", headers={"Accept-Encoding": "identity"})
+    assert first.headers["etag"] == f'"{digest}"'
+    assert first.headers["cache-control"] == REVALIDATE
+
+    again = client.get("/index.html", headers={"If-None-Match": first.headers["etag"]})
+    assert again.status_code == 304
+    assert again.content == b""
+
+
+def test_versioned_and_hashed_urls_are_immutable(site):
+    root, client = site
+    url = versioned_url("/index.html", root / "index.html")
+
+    assert client.get(url).headers["cache-control"] == IMMUTABLE
+    assert client.get("/index.html?v=stale").headers["cache-control"] == REVALIDATE
+    assert client.get("/assets/index-Ab12Cd34.js").headers["cache-control"] == IMMUTABLE
+
+
+def test_precompressed_siblings_are_served_when_accepted(site):
+    root, client = site
+    assert precompress_dir(root) >= 2
+    assert precompress_dir(root) == 0  # already current
+
+    response = client.get(
+        "/assets/index-Ab12Cd34.js", headers={"Accept-Encoding": "gzip"}
+    )
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["content-type"].startswith("text/javascript")
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert int(response.headers["content-length"]) < len(BUNDLE)
+    assert response.content == BUNDLE  # decoded by the client
+
+    plain = client.get(
+        "/assets/index-Ab12Cd34.js", headers={"Accept-Encoding": "gzip;q=0"}
+    )
+    assert "content-encoding" not in plain.headers
+    assert gzip.decompress((root / "assets" / "index-Ab12Cd34.js.gz").read_bytes()) == BUNDLE
+
+
+def test_range_requests_honour_if_range(site):
+    root, client = site
+    etag = f'"{asset_info(root / "assets" / "index-Ab12Cd34.js").digest}"'
+    headers = {"Accept-Encoding": "identity", "Range": "bytes=0-9"}
+
+    partial = client.get("/assets/index-Ab12Cd34.js", headers={**headers, "If-Range": etag})
+    assert partial.status_code == 206
+    assert partial.content == BUNDLE[:10]
+
+    changed = client.get(
+        "/assets/index-Ab12Cd34.js", headers={**headers, "If-Range": '"old"'}
+    )
+    assert changed.status_code == 200
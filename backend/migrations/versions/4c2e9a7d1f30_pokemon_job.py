@@ -0,0 +1,52 @@
+"""pokemon job table
+
+Revision ID: 4c2e9a7d1f30
+Revises: b8f6e85fa7be
+Create Date: 2026-10-18 09:12:04.311842
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = "4c2e9a7d1f30"
+down_revision: Union[str, Sequence[str], None] = "b8f6e85fa7be"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "pokemonjob",
+        sa.Column("id", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.Column("pokemon_name", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("pokemon_id", sa.Integer(), nullable=True),
+        sa.Column(
+            "status",
+            sa.Enum("queued", "running", "succeeded", "failed", name="jobstatus"),
+            nullable=False,
+        ),
+        sa.Column("stage", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column("stages_completed", sa.Integer(), nullable=False),
+        sa.Column("stages_total", sa.Integer(), nullable=False),
+        sa.Column("input_data", sa.JSON(), nullable=True),
+        sa.Column("result", sa.JSON(), nullable=True),
+        sa.Column("error", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column("lease_expires_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["pokemon_id"], ["pokemon.id"], ondelete="SET NULL"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("pokemonjob")
+    sa.Enum(name="jobstatus").drop(op.get_bind(), checkfirst=True)
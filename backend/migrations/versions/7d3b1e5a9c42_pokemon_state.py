@@ -0,0 +1,42 @@
+"""pokemon state for the egg pool
+
+Revision ID: 7d3b1e5a9c42
+Revises: 4c2e9a7d1f30
+Create Date: 2026-10-18 14:37:51.902114
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "7d3b1e5a9c42"
+down_revision: Union[str, Sequence[str], None] = "4c2e9a7d1f30"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+pokemon_state = sa.Enum("active", "incubating", "reserved", name="pokemonstate")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    pokemon_state.create(op.get_bind(), checkfirst=True)
+    op.add_column(
+        "pokemon",
+        sa.Column(
+            "state", pokemon_state, nullable=False, server_default="active"
+        ),
+    )
+    op.add_column("pokemon", sa.Column("lease_expires_at", sa.DateTime(), nullable=True))
+    op.create_index(op.f("ix_pokemon_state"), "pokemon", ["state"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f("ix_pokemon_state"), table_name="pokemon")
+    op.drop_column("pokemon", "lease_expires_at")
+    op.drop_column("pokemon", "state")
+    pokemon_state.drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,58 @@
+"""pokemon usage table
+
+Revision ID: 9a4f6c2d8e15
+Revises: 7d3b1e5a9c42
+Create Date: 2026-10-18 16:05:22.418930
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = "9a4f6c2d8e15"
+down_revision: Union[str, Sequence[str], None] = "7d3b1e5a9c42"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "pokemonusage",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("pokemon_id", sa.Integer(), nullable=False),
+        sa.Column("stage", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("seconds", sa.Float(), nullable=False),
+        sa.Column("call_seconds", sa.Float(), nullable=False),
+        sa.Column("calls", sa.Integer(), nullable=False),
+        sa.Column("retries", sa.Integer(), nullable=False),
+        sa.Column("image_calls", sa.Integer(), nullable=False),
+        sa.Column("input_tokens", sa.Integer(), nullable=False),
+        sa.Column("output_tokens", sa.Integer(), nullable=False),
+        sa.Column("cost_usd", sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(["pokemon_id"], ["pokemon.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        op.f("ix_pokemonusage_created_at"), "pokemonusage", ["created_at"], unique=False
+    )
+    op.create_index(
+        op.f("ix_pokemonusage_pokemon_id"), "pokemonusage", ["pokemon_id"], unique=False
+    )
+    op.create_index(
+        op.f("ix_pokemonusage_stage"), "pokemonusage", ["stage"], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f("ix_pokemonusage_stage"), table_name="pokemonusage")
+    op.drop_index(op.f("ix_pokemonusage_pokemon_id"), table_name="pokemonusage")
+    op.drop_index(op.f("ix_pokemonusage_created_at"), table_name="pokemonusage")
+    op.drop_table("pokemonusage")
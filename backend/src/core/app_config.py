@@ -23,6 +23,82 @@ class Settings(BaseSettings):
 
     FIREBASE_PATH: Optional[str | Path] = None
 
+    # "fake" swaps OpenAI for the offline FakeProvider (tests, benchmarks);
+    # "record" calls OpenAI and saves every call to CASSETTE_DIR, "replay"
+    # serves a recorded cassette offline (see services/cassette.py)
+    AI_PROVIDER: Literal["openai", "fake", "record", "replay"] = "openai"
+    CASSETTE_DIR: Optional[str] = None
+    CASSETTE_LATENCY_SCALE: float = 1.0  # 0 replays without sleeping
+    CASSETTE_STRICT: bool = False  # fail on requests not in the cassette
+
+    # Provider scheduling (shared by every pipeline in the process)
+    IMAGE_MAX_CONCURRENCY: int = 4
+    IMAGE_REQUESTS_PER_MINUTE: float = 30
+    IMAGE_MAX_RETRIES: int = 4
+    TEXT_MAX_CONCURRENCY: int = 8
+    TEXT_REQUESTS_PER_MINUTE: float = 60
+    TEXT_MAX_RETRIES: int = 4
+    BATCH_MAX_MONSTERS: int = 8  # monsters of one batch in flight at once
+
+    # "edit" uploads base.png with every sprite request; "chained" continues the
+    # base-image response via previous_response_id so nothing is re-uploaded.
+    SPRITE_GENERATION_MODE: Literal["edit", "chained"] = "edit"
+
+    # Tiered sprites: with a draft quality set, creations render sprites at
+    # that quality so the monster is playable sooner, then a background job
+    # re-renders them at SPRITE_QUALITY and swaps the files in place.
+    SPRITE_QUALITY: Literal["low", "medium", "high"] = "high"
+    SPRITE_DRAFT_QUALITY: Optional[Literal["low", "medium", "high"]] = None
+
+    # Tail-latency control for sprites (None disables each one). A sprite call
+    # still running past the recent pXX latency gets one duplicate request.
+    SPRITE_HEDGE_PERCENTILE: Optional[float] = None
+    SPRITE_HEDGE_MIN_SAMPLES: int = 20
+    SPRITE_TIMEOUT_SECONDS: Optional[float] = None  # per provider attempt
+    # Budget for a whole creation; optional sprites still running past it are dropped
+    PIPELINE_DEADLINE_SECONDS: Optional[float] = None
+
+    # Stream moveset JSON so each move's sprite starts as soon as it is parsed
+    STREAM_STRUCTURED_OUTPUT: bool = True
+    # False drafts movesets from the description alone, concurrently with the
+    # base image, instead of showing the model the finished image
+    MOVESET_FROM_IMAGE: bool = True
+    PIPELINE_STAGE_RETRIES: int = 1  # extra attempts per stage on non-4xx errors
+    # Background jobs hold a lease their worker renews every third of this;
+    # a job whose lease lapses is failed (its worker stopped mid-run)
+    JOB_LEASE_SECONDS: float = 60.0
+
+    # Pre-generated "egg" pool: keep EGG_POOL_SIZE complete monsters reserved
+    # so hatching one is a single UPDATE (0 disables the refill worker). Eggs
+    # only incubate while no user creation is running.
+    EGG_POOL_SIZE: int = 0
+    EGG_POOL_CONCURRENCY: int = 1
+    EGG_POOL_POLL_SECONDS: float = 30.0
+    # Incubating eggs hold a lease like jobs; a lapsed one is discarded at startup
+    EGG_LEASE_SECONDS: float = 60.0
+
+    # Derivatives written next to every saved image (see utils/image_variants.py)
+    # and picked by the /images mount from Accept and ?size=. Needs Pillow;
+    # without it only the original PNGs are stored and served.
+    IMAGE_VARIANT_FORMATS: list[Literal["webp", "avif"]] = ["webp"]
+    IMAGE_THUMBNAIL_SIZES: list[int] = [128, 256]
+    IMAGE_VARIANT_QUALITY: int = 80
+    # Edge of one sprite sheet in the per-monster atlas (services/sprite_atlas.py)
+    SPRITE_ATLAS_CELL: int = 256
+
+    # Structured-output cache for description/moveset calls
+    LLM_CACHE_ENABLED: bool = True
+    LLM_CACHE_DIR: Optional[str] = None
+    LLM_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    LLM_CACHE_TTL_SECONDS: Optional[float] = None
+
+    # USD per 1M (input, output) tokens, used to price the usage table. Set as
+    # JSON to track provider price changes; unknown models are priced at 0.
+    MODEL_PRICES: dict[str, tuple[float, float]] = {
+        "gpt-5": (1.25, 10.0),
+        "gpt-image-1": (10.0, 40.0),
+    }
+
     @field_validator("BACKEND_CORS_ORIGINS", mode="before")
     @classmethod
     def assemble_cors_origins(cls, v: str | list[str]) -> list[str] | str:
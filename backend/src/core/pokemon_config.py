@@ -12,6 +12,9 @@ class MonsterConfig:
 
     BASE_DIR = Path(__file__).resolve().parent.parent.parent
     MONSTER_DIR = (BASE_DIR / "src" / "images" / "monsters").resolve()
+    CACHE_DIR = (BASE_DIR / ".cache").resolve()
+    # URL prefix MONSTER_DIR is served under (see the /images mount in main.py)
+    MONSTER_URL = "/images/monsters"
 
     DATA_DIRS = ["animations", "data", "base"]
 
@@ -19,4 +22,6 @@ class MonsterConfig:
     FILES = {
         "base_data": "data_user.json",  # stores raw form data
         "description": "monster_data.json",  # stores cleaned description
+        "moveset": "moveset.json",  # battle moveset checkpoint
+        "expressions": "expressions.json",  # expressive moveset checkpoint
     }
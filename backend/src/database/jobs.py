@@ -0,0 +1,49 @@
+from datetime import datetime
+from typing import Any, Sequence
+
+from sqlmodel import or_, select
+
+from src.models import PokemonJob, JobStatus
+from src.database.db import SessionType
+
+
+def create_job(job: PokemonJob, session: SessionType) -> PokemonJob:
+    session.add(job)
+    session.commit()
+    session.refresh(job)
+    return job
+
+
+def get_job(job_id: str, session: SessionType) -> PokemonJob | None:
+    return session.get(PokemonJob, job_id)
+
+
+def update_job(job_id: str, session: SessionType, **fields: Any) -> PokemonJob | None:
+    job = session.get(PokemonJob, job_id)
+    if job is None:
+        return None
+    for key, value in fields.items():
+        setattr(job, key, value)
+    job.updated_at = datetime.now()
+    session.add(job)
+    session.commit()
+    session.refresh(job)
+    return job
+
+
+def get_expired_jobs(session: SessionType) -> Sequence[PokemonJob]:
+    """Queued or running jobs whose lease has lapsed (or that never had one)."""
+    statement = select(PokemonJob).where(
+        PokemonJob.status.in_([JobStatus.queued, JobStatus.running]),
+        or_(
+            PokemonJob.lease_expires_at.is_(None),
+            PokemonJob.lease_expires_at <= datetime.now(),
+        ),
+    )
+    return session.exec(statement).all()
+
+
+def get_jobs_by_status(
+    status: JobStatus, session: SessionType
+) -> Sequence[PokemonJob]:
+    return session.exec(select(PokemonJob).where(PokemonJob.status == status)).all()
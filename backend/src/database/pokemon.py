@@ -1,6 +1,9 @@
-from src.models import Pokemon
+from datetime import datetime
+
+from src.models import Pokemon, PokemonState
 from src.database.db import SessionType
-from sqlmodel import select, delete
+from sqlalchemy import func, update
+from sqlmodel import or_, select, delete
 from typing import Sequence
 
 
@@ -24,3 +27,95 @@ def delete_pokemon(pokemon: Pokemon, session: SessionType) -> None:
 
 def get_all_pokemon(session: SessionType) -> Sequence[Pokemon]:
     return session.exec(select(Pokemon)).all()
+
+
+def count_pokemon_by_state(state: PokemonState, session: SessionType) -> int:
+    statement = select(func.count()).select_from(Pokemon).where(Pokemon.state == state)
+    return session.exec(statement).one()
+
+
+def get_pokemon_by_state(state: PokemonState, session: SessionType) -> Sequence[Pokemon]:
+    return session.exec(select(Pokemon).where(Pokemon.state == state)).all()
+
+
+def get_lapsed_eggs(session: SessionType) -> Sequence[Pokemon]:
+    """Incubating eggs whose lease has lapsed (or that never had one)."""
+    statement = select(Pokemon).where(
+        Pokemon.state == PokemonState.incubating,
+        or_(
+            Pokemon.lease_expires_at.is_(None),
+            Pokemon.lease_expires_at <= datetime.now(),
+        ),
+    )
+    return session.exec(statement).all()
+
+
+def count_unclaimed_eggs(session: SessionType) -> int:
+    """Reserved eggs plus incubating ones some worker still holds a lease on."""
+    statement = (
+        select(func.count())
+        .select_from(Pokemon)
+        .where(
+            or_(
+                Pokemon.state == PokemonState.reserved,
+                (Pokemon.state == PokemonState.incubating)
+                & (Pokemon.lease_expires_at > datetime.now()),
+            )
+        )
+    )
+    return session.exec(statement).one()
+
+
+def renew_egg_lease(
+    pokemon_id: int, expires_at: datetime, session: SessionType
+) -> None:
+    statement = (
+        update(Pokemon)
+        .where(Pokemon.id == pokemon_id, Pokemon.state == PokemonState.incubating)
+        .values(lease_expires_at=expires_at)
+    )
+    session.execute(statement)
+    session.commit()
+
+
+def set_pokemon_state(
+    pokemon_id: int, state: PokemonState, session: SessionType
+) -> Pokemon | None:
+    pokemon = session.get(Pokemon, pokemon_id)
+    if pokemon is None:
+        return None
+    pokemon.state = state
+    session.add(pokemon)
+    session.commit()
+    session.refresh(pokemon)
+    return pokemon
+
+
+def claim_reserved_pokemon(session: SessionType) -> Pokemon | None:
+    """
+    Activate one reserved egg with a single UPDATE; None when none is left.
+
+    The row is picked and flipped in the same statement, and the state is
+    re-checked in its WHERE clause, so concurrent claims never share an egg.
+    On PostgreSQL `SKIP LOCKED` lets them pick different rows instead of
+    queueing on the same one.
+    """
+    candidate = (
+        select(Pokemon.id)
+        .where(Pokemon.state == PokemonState.reserved)
+        .order_by(Pokemon.id)
+        .limit(1)
+        .with_for_update(skip_locked=True)
+        .scalar_subquery()
+    )
+    statement = (
+        update(Pokemon)
+        .where(Pokemon.id == candidate, Pokemon.state == PokemonState.reserved)
+        .values(state=PokemonState.active, created_at=datetime.now())
+        .returning(Pokemon.id)
+    )
+    pokemon_id = session.execute(statement).scalar_one_or_none()
+    session.commit()
+    if pokemon_id is None:
+        return None
+    return session.get(Pokemon, pokemon_id, populate_existing=True)
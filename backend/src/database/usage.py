@@ -0,0 +1,28 @@
+from datetime import datetime
+from typing import Sequence
+
+from sqlmodel import select
+
+from src.models import PokemonUsage
+from src.database.db import SessionType
+
+
+def add_usage(rows: list[PokemonUsage], session: SessionType) -> None:
+    session.add_all(rows)
+    session.commit()
+
+
+def get_usage_for_pokemon(
+    pokemon_id: int, session: SessionType
+) -> Sequence[PokemonUsage]:
+    statement = (
+        select(PokemonUsage)
+        .where(PokemonUsage.pokemon_id == pokemon_id)
+        .order_by(PokemonUsage.id)
+    )
+    return session.exec(statement).all()
+
+
+def get_usage_since(since: datetime, session: SessionType) -> Sequence[PokemonUsage]:
+    statement = select(PokemonUsage).where(PokemonUsage.created_at >= since)
+    return session.exec(statement).all()
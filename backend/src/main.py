@@ -1,10 +1,24 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Response
 from contextlib import asynccontextmanager
-from src.database.db import create_db_and_tables
+import asyncio
+from sqlmodel import Session
+from src.database.db import create_db_and_tables, engine
+from src.services.scheduler import image_scheduler, text_scheduler
+from src.services.llm_cache import llm_cache
+from src.services.metrics import render_metrics
+from src.services.egg_pool import discard_stale_eggs, egg_pool
+from src.services.job_service import fail_interrupted_jobs
+from src.services import sprite_atlas
 
 from src.web.pokemon import router
 from src.web.pokemon_folder import router as pw_router
-from fastapi.staticfiles import StaticFiles
+from src.web.jobs import router as jobs_router
+from src.web.usage import router as usage_router
+from src.web.images import ImageFiles
+from src.web.static_files import CachedStaticFiles
+from src.utils.static_assets import precompress_dir
+from src.utils.blob_store import gc_blobs
+from src.utils import image_variants
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.routing import APIRoute
 from pathlib import Path
@@ -15,12 +29,25 @@ async def lifespan(_: FastAPI):
     print("Creating tables")
     create_db_and_tables()
     print("Complete")
+    with Session(engine) as session:
+        discard_stale_eggs(session)  # interrupted by the last shutdown
+        fail_interrupted_jobs(session)
+    await asyncio.to_thread(gc_blobs)  # safe alongside other workers
+    image_variants.warn_if_unavailable()
+    sprite_atlas.warn_if_unavailable()
+    if FRONTEND_DIR.is_dir():
+        await asyncio.to_thread(precompress_dir, FRONTEND_DIR)  # .br/.gz siblings
+    if egg_pool.size:
+        egg_pool.start()
     yield
+    await egg_pool.stop()
 
 
 app = FastAPI(lifespan=lifespan)
 app.include_router(router)
 app.include_router(pw_router)
+app.include_router(jobs_router)
+app.include_router(usage_router)
 
 origins = [
     "http://localhost:5173",  # Vite dev
@@ -44,11 +71,39 @@ def list_images():
     return [p.name for p in IMAGES_DIR.iterdir() if p.is_file()]
 
 
+@app.get("/metrics")
+def metrics():
+    """Prometheus scrape endpoint: stage/provider histograms and in-flight gauges."""
+    body, content_type = render_metrics({"image": image_scheduler, "text": text_scheduler})
+    return Response(content=body, media_type=content_type)
+
+
+@app.get("/debug/scheduler")
+def scheduler_metrics():
+    """Queue depth, in-flight calls and per-model limits of the provider schedulers."""
+    return {"image": image_scheduler.metrics(), "text": text_scheduler.metrics()}
+
+
+@app.get("/debug/cache")
+def cache_stats():
+    """Hit/miss counters and size of the structured-output cache."""
+    return llm_cache.stats() if llm_cache else {"enabled": False}
+
+
 IMAGES_DIR = Path(__file__).resolve().parent / "images"
+FRONTEND_DIR = Path("frontend")
 
+# Strong ETags everywhere; `?v=<hash>` URLs (format_image_url), versioned atlas
+# files and Vite's hashed assets/ are cached as immutable
 app.mount(
     "/images",
-    StaticFiles(directory=IMAGES_DIR),  # no need for html=True here
+    ImageFiles(  # WebP/AVIF/thumbnails by Accept and ?size=
+        directory=IMAGES_DIR, immutable=r"/atlas/atlas\.[0-9a-f]{12}\.png$"
+    ),
     name="images",
 )
-app.mount("/", StaticFiles(directory="frontend", html=True), name="frontend")
+app.mount(
+    "/",
+    CachedStaticFiles(directory=FRONTEND_DIR, html=True, immutable=r"^assets/"),
+    name="frontend",
+)
@@ -1,4 +1,5 @@
 from sqlmodel import SQLModel, Field
+from sqlalchemy import Column, JSON
 from datetime import datetime
 from enum import Enum
 from typing import Union, Mapping, Any, Optional, List, TypedDict
@@ -11,11 +12,65 @@ class Region(Enum):
     johto = "Jothto"
 
 
+class PokemonState(str, Enum):
+    active = "active"
+    incubating = "incubating"  # egg still being generated for the pool
+    reserved = "reserved"  # complete egg waiting to be hatched
+
+
 class Pokemon(SQLModel, table=True):
     id: int | None = Field(default=None, primary_key=True)
     created_at: datetime = Field(default_factory=lambda: datetime.now())
     name: str
     image_directory: str | None = Field(default_factory=None)
+    state: PokemonState = Field(default=PokemonState.active, index=True)
+    # Incubating eggs only: renewed by the worker incubating it (see egg_pool)
+    lease_expires_at: datetime | None = None
+
+
+class JobStatus(str, Enum):
+    queued = "queued"
+    running = "running"
+    succeeded = "succeeded"
+    failed = "failed"
+
+
+class PokemonJob(SQLModel, table=True):
+    """Background creation job; lives in the database so any worker can report on it."""
+
+    id: str = Field(primary_key=True)
+    created_at: datetime = Field(default_factory=lambda: datetime.now())
+    updated_at: datetime = Field(default_factory=lambda: datetime.now())
+    pokemon_name: str
+    pokemon_id: int | None = Field(
+        default=None, foreign_key="pokemon.id", ondelete="SET NULL"
+    )
+    status: JobStatus = Field(default=JobStatus.queued)
+    # Renewed by the worker running the job; once it lapses the job is failed
+    lease_expires_at: datetime | None = None
+    stage: str | None = None
+    stages_completed: int = 0
+    stages_total: int = 0
+    input_data: dict = Field(default_factory=dict, sa_column=Column(JSON))
+    result: dict | None = Field(default=None, sa_column=Column(JSON))
+    error: str | None = None
+
+
+class PokemonUsage(SQLModel, table=True):
+    """Provider usage and wall time of one pipeline stage of one creation run."""
+
+    id: int | None = Field(default=None, primary_key=True)
+    created_at: datetime = Field(default_factory=lambda: datetime.now(), index=True)
+    pokemon_id: int = Field(foreign_key="pokemon.id", index=True, ondelete="CASCADE")
+    stage: str = Field(index=True)
+    seconds: float = 0.0  # stage wall time
+    call_seconds: float = 0.0  # summed provider call time
+    calls: int = 0
+    retries: int = 0  # failed attempts that were retried or gave up
+    image_calls: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cost_usd: float = 0.0
 
 
 class PokemonData(BaseModel):
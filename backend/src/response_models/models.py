@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import List, Any
+from typing import List, Any, Literal
 from src.models import Pokemon
 
 
@@ -11,3 +11,22 @@ class PokemonResponse(BaseModel):
 
 class PokemonResponsePaths(PokemonResponse):
     paths: List[Any]
+
+
+class BatchItemResult(BaseModel):
+    index: int
+    name: str
+    pokemon_id: int | None = None
+    status: Literal["succeeded", "failed"]
+    detail: str
+    seconds: float
+
+
+class BatchCreateResponse(BaseModel):
+    status: str | int
+    detail: str
+    total: int
+    succeeded: int
+    failed: int
+    seconds: float
+    results: List[BatchItemResult]
@@ -0,0 +1,223 @@
+# Standard library
+from functools import lru_cache
+from typing import Any, AsyncIterator, Optional, Protocol
+
+# Third-party
+from openai import AsyncOpenAI, OpenAI
+from pydantic import BaseModel
+
+# Local application
+from src.core import settings
+from src.services.usage import report_usage
+from src.utils.image_utils import ReferenceImage
+
+ImageResult = tuple[Any, list[str]]  # (raw provider response, [base64 images])
+
+
+class AIProvider(Protocol):
+    """
+    The provider calls the generation pipeline makes.
+
+    `ai_services` and `pokemon_generation` only talk to the provider through
+    this interface, so the OpenAI implementation can be swapped for
+    `FakeProvider` in tests and benchmarks. Implementations pass each
+    response's token counts to `usage.report_usage`.
+    """
+
+    async def parse(
+        self, *, model: str, messages: list, response_format: type[BaseModel]
+    ) -> Optional[str]:
+        """Structured chat completion; returns the JSON content."""
+        ...
+
+    def stream_parse(
+        self, *, model: str, messages: list, response_format: type[BaseModel]
+    ) -> AsyncIterator[str]:
+        """`parse`, yielding the JSON content in chunks as it is generated."""
+        ...
+
+    async def generate_image(
+        self,
+        *,
+        model: str,
+        prompt: str,
+        transparent: bool = False,
+        previous_response_id: Optional[str] = None,
+        quality: Optional[str] = None,
+    ) -> ImageResult:
+        """
+        Text-to-image generation. With `previous_response_id` the request
+        continues that response, so images it produced need not be re-sent.
+        `quality` defaults to the provider's own choice.
+        """
+        ...
+
+    async def edit_image(
+        self,
+        *,
+        model: str,
+        image: ReferenceImage,
+        prompt: str,
+        size: str = "1024x1024",
+        quality: str = "high",
+        background: str = "opaque",
+    ) -> ImageResult:
+        """Image generation conditioned on a reference image."""
+        ...
+
+
+def image_generation_request(
+    model: str,
+    prompt: str,
+    transparent: bool = False,
+    previous_response_id: Optional[str] = None,
+    quality: Optional[str] = None,
+) -> dict:
+    request = dict(
+        model=model,
+        input=prompt,
+        tools=[
+            {
+                "type": "image_generation",
+                "background": "transparent" if transparent else "opaque",
+                "size": "1024x1024",
+            }
+        ],
+    )
+    if previous_response_id:
+        request["previous_response_id"] = previous_response_id
+    if quality:
+        request["tools"][0]["quality"] = quality
+    return request
+
+
+def image_generation_result(response) -> ImageResult:
+    image_data = [
+        output.result
+        for output in response.output
+        if output.type == "image_generation_call"
+    ]
+    usage = getattr(response, "usage", None)
+    report_usage(
+        input_tokens=getattr(usage, "input_tokens", 0),
+        output_tokens=getattr(usage, "output_tokens", 0),
+        images=len(image_data),
+    )
+    return (response, image_data)
+
+
+def report_completion_usage(completion) -> None:
+    usage = getattr(completion, "usage", None)
+    report_usage(
+        input_tokens=getattr(usage, "prompt_tokens", 0),
+        output_tokens=getattr(usage, "completion_tokens", 0),
+    )
+
+
+@lru_cache(maxsize=1)
+def get_client() -> OpenAI:
+    return OpenAI()
+
+
+@lru_cache(maxsize=1)
+def get_async_client() -> AsyncOpenAI:
+    # Every async call goes through a ProviderScheduler, which owns the retries
+    return AsyncOpenAI(max_retries=0)
+
+
+class OpenAIProvider:
+    """AIProvider backed by the OpenAI API."""
+
+    async def parse(self, *, model, messages, response_format):
+        completion = await get_async_client().chat.completions.parse(
+            model=model,
+            messages=messages,
+            response_format=response_format,
+        )
+        report_completion_usage(completion)
+        return completion.choices[0].message.content
+
+    async def stream_parse(self, *, model, messages, response_format):
+        async with get_async_client().chat.completions.stream(
+            model=model,
+            messages=messages,
+            response_format=response_format,
+            stream_options={"include_usage": True},
+        ) as stream:
+            async for event in stream:
+                if event.type == "content.delta":
+                    yield event.delta
+            report_completion_usage(await stream.get_final_completion())
+
+    async def generate_image(
+        self,
+        *,
+        model,
+        prompt,
+        transparent=False,
+        previous_response_id=None,
+        quality=None,
+    ):
+        response = await get_async_client().responses.create(
+            **image_generation_request(
+                model, prompt, transparent, previous_response_id, quality
+            )
+        )
+        return image_generation_result(response)
+
+    async def edit_image(
+        self,
+        *,
+        model,
+        image,
+        prompt,
+        size="1024x1024",
+        quality="high",
+        background="opaque",
+    ):
+        result = await get_async_client().images.edit(
+            model=model,
+            image=[image.as_upload()],
+            prompt=prompt,
+            background=background,
+            size=size,
+            quality=quality,
+        )
+        if not result or not result.data:
+            raise ValueError("Image generation failed, no data returned.")
+        images = [d.b64_json for d in result.data if d.b64_json]
+        if not images:
+            raise ValueError("Image generation failed, no data returned.")
+        usage = getattr(result, "usage", None)
+        report_usage(
+            input_tokens=getattr(usage, "input_tokens", 0),
+            output_tokens=getattr(usage, "output_tokens", 0),
+            images=len(images),
+        )
+        return (result, images)
+
+
+_provider: Optional[AIProvider] = None
+
+
+def get_provider() -> AIProvider:
+    """The process-wide provider, chosen by `settings.AI_PROVIDER`."""
+    global _provider
+    if _provider is None:
+        if settings.AI_PROVIDER == "fake":
+            from src.services.fake_provider import FakeProvider
+
+            _provider = FakeProvider()
+        elif settings.AI_PROVIDER in ("record", "replay"):
+            from src.services.cassette import cassette_provider
+
+            _provider = cassette_provider(settings.AI_PROVIDER)
+        else:
+            _provider = OpenAIProvider()
+    return _provider
+
+
+def set_provider(provider: Optional[AIProvider]) -> None:
+    """Install a provider (None restores the configured default on next use)."""
+    global _provider
+    _provider = provider
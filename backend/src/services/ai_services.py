@@ -1,55 +1,225 @@
-from openai import OpenAI
+import json
+from typing import Any, Callable, Optional
+
 from dotenv import load_dotenv
 from .prompts import *
-import base64
+from src.core import settings
 from src.models import *
+from src.services.ai_provider import (
+    get_client,
+    get_provider,
+    image_generation_request,
+    image_generation_result,
+)
+from src.services.llm_cache import LLMCache, llm_cache
+from src.services.metrics import PROVIDER_REQUEST_BYTES, observe_call
+from src.services.scheduler import image_scheduler, text_scheduler
+from src.services.singleflight import provider_flight
+from src.utils.image_utils import ReferenceImage, read_reference_image
+from src.utils.json_stream import JsonListItems
 
 load_dotenv()
-client = OpenAI()
 
+TEXT_MODEL = "gpt-5"
+
+
+def _multimodal_messages(prompt: str, image: ReferenceImage) -> list:
+    return [
+        {
+            "role": "user",
+            "content": [
+                {"type": "text", "text": prompt},
+                {
+                    "type": "image_url",
+                    "image_url": {
+                        "url": image.data_url,
+                    },
+                },
+            ],
+        }
+    ]
+
+
+def _cache_key(prompt: str, response_model, image_b64: str | None = None):
+    # Also keys in-flight coalescing, so it is computed even with the cache off
+    return LLMCache.make_key(
+        prompt=prompt,
+        model=TEXT_MODEL,
+        response_model=response_model,
+        image_b64=image_b64,
+    )
+
+
+def _cache_get(key: str | None):
+    return llm_cache.get(key) if llm_cache is not None and key else None
+
+
+def _cache_set(key: str | None, content: str | None):
+    if llm_cache is not None and key and content:
+        llm_cache.set(key, content)
 
-def encode_image(image_path):
-    with open(image_path, "rb") as image_file:
-        return base64.b64encode(image_file.read()).decode("utf-8")
+
+async def _cache_get_async(key: str | None):
+    if llm_cache is None or not key:
+        return None
+    return await llm_cache.get_async(key)
+
+
+async def _cache_set_async(key: str | None, content: str | None):
+    if llm_cache is not None and key and content:
+        await llm_cache.set_async(key, content)
 
 
 def generate_image(prompt: str, transparent: bool = False):
-    response = client.responses.create(
-        model="gpt-5",
-        input=prompt,
-        tools=[
-            {
-                "type": "image_generation",
-                "background": "transparent" if transparent else "opaque",
-                "size": "1024x1024",
-            }
-        ],
-    )
-    image_data = [
-        output.result
-        for output in response.output
-        if output.type == "image_generation_call"
-    ]
-    return (response, image_data)
+    response = get_client().responses.create(
+        **image_generation_request(TEXT_MODEL, prompt, transparent)
+    )
+    return image_generation_result(response)
 
 
 def multimodal_generation(prompt: str, image_path: str, response_model):
-    completion = client.chat.completions.parse(
-        model="gpt-5",
-        messages=[
-            {
-                "role": "user",
-                "content": [
-                    {"type": "text", "text": prompt},
-                    {
-                        "type": "image_url",
-                        "image_url": {
-                            "url": f"data:image/jpeg;base64,{encode_image(image_path)}",
-                        },
-                    },
-                ],
-            }
-        ],
+    image = read_reference_image(image_path)
+    key = _cache_key(prompt, response_model, image.b64)
+    cached = _cache_get(key)
+    if cached is not None:
+        return cached
+
+    completion = get_client().chat.completions.parse(
+        model=TEXT_MODEL,
+        messages=_multimodal_messages(prompt, image),
         response_format=response_model,
     )
-    return completion.choices[0].message.content
+    content = completion.choices[0].message.content
+    _cache_set(key, content)
+    return content
+
+
+# ── Async equivalents ──────────────────────────────────────────────────────────
+# Used from the async pipeline so a generation call never blocks the event loop.
+# They go through the configured AIProvider (see ai_provider.get_provider).
+
+
+async def generate_image_async(
+    prompt: str,
+    transparent: bool = False,
+    previous_response_id: str | None = None,
+):
+    call = "generate_image_chained" if previous_response_id else "generate_image"
+
+    async def request():
+        PROVIDER_REQUEST_BYTES.labels(call).inc(len(prompt.encode("utf-8")))
+        return await image_scheduler.run(
+            TEXT_MODEL,
+            lambda: observe_call(
+                call,
+                TEXT_MODEL,
+                get_provider().generate_image(
+                    model=TEXT_MODEL,
+                    prompt=prompt,
+                    transparent=transparent,
+                    previous_response_id=previous_response_id,
+                ),
+            ),
+        )
+
+    # Identical concurrent requests (same rendered prompt) share one call
+    return await provider_flight.do(
+        (call, TEXT_MODEL, prompt, transparent, previous_response_id), request
+    )
+
+
+async def _parse_async(call: str, key: str, messages: list, response_model):
+    """Structured call through the text scheduler, cached and coalesced on `key`."""
+    cached = await _cache_get_async(key)
+    if cached is not None:
+        return cached
+
+    async def request():
+        content = await text_scheduler.run(
+            TEXT_MODEL,
+            lambda: observe_call(
+                call,
+                TEXT_MODEL,
+                get_provider().parse(
+                    model=TEXT_MODEL,
+                    messages=messages,
+                    response_format=response_model,
+                ),
+            ),
+        )
+        await _cache_set_async(key, content)
+        return content
+
+    return await provider_flight.do((call, key), request)
+
+
+async def multimodal_generation_async(
+    prompt: str, image: ReferenceImage, response_model
+):
+    key = _cache_key(prompt, response_model, image.b64)
+    return await _parse_async(
+        "parse_multimodal", key, _multimodal_messages(prompt, image), response_model
+    )
+
+
+async def text_generation_async(prompt: str, response_model):
+    key = _cache_key(prompt, response_model)
+    return await _parse_async(
+        "parse", key, [{"role": "user", "content": prompt}], response_model
+    )
+
+
+async def stream_list_generation_async(
+    prompt: str,
+    response_model,
+    list_field: str,
+    on_item: Callable[[Any], None],
+    image: Optional[ReferenceImage] = None,
+):
+    """
+    Structured call that reports each element of `list_field` as it completes.
+
+    With `settings.STREAM_STRUCTURED_OUTPUT` the response is streamed and
+    `on_item` is called with each element (a plain dict, not yet validated)
+    the moment its JSON closes, while the rest is still being generated.
+    Otherwise, and on a cache hit, the full response is fetched first and its
+    elements are reported in one go. Returns the complete JSON content either
+    way. A retried stream never reports an element twice.
+    """
+    messages = (
+        _multimodal_messages(prompt, image)
+        if image
+        else [{"role": "user", "content": prompt}]
+    )
+    call = "parse_multimodal" if image else "parse"
+    key = _cache_key(prompt, response_model, image.b64 if image else None)
+
+    content = await _cache_get_async(key)
+    if content is None and not settings.STREAM_STRUCTURED_OUTPUT:
+        content = await _parse_async(call, key, messages, response_model)
+    if content is not None:
+        for item in json.loads(content).get(list_field, []):
+            on_item(item)
+        return content
+
+    reported = 0
+
+    async def attempt():
+        nonlocal reported
+        parser = JsonListItems(list_field)
+        chunks = []
+        async for delta in get_provider().stream_parse(
+            model=TEXT_MODEL, messages=messages, response_format=response_model
+        ):
+            chunks.append(delta)
+            for index, item in parser.feed(delta):
+                if index >= reported:
+                    reported = index + 1
+                    on_item(item)
+        return "".join(chunks)
+
+    content = await text_scheduler.run(
+        TEXT_MODEL, lambda: observe_call(f"{call}_stream", TEXT_MODEL, attempt())
+    )
+    await _cache_set_async(key, content)
+    return content
@@ -0,0 +1,453 @@
+"""
+Record/replay of provider traffic.
+
+`RecordingProvider` wraps a real provider and appends every request it
+serves to a cassette on disk; `ReplayProvider` answers the same requests
+from that cassette without network access, sleeping for the recorded (or
+scaled) latency. Together they turn a production run into a reproducible
+offline fixture for profiling and benchmarking `pokemon_full`.
+
+A cassette is a directory:
+
+    calls.jsonl           one JSON object per provider call, in completion order
+    images/<sha256>.png   every returned image, stored once as raw bytes
+
+Select the mode with `settings.AI_PROVIDER` ("record" or "replay") and
+`settings.CASSETTE_DIR`. Turn the LLM cache off while recording, or cached
+calls never reach the cassette.
+"""
+
+# Standard library
+import asyncio
+import base64
+import hashlib
+import json
+import logging
+import time
+import types
+from collections import defaultdict, deque
+from pathlib import Path
+from typing import Any, AsyncIterator, Awaitable, Callable, Optional
+
+# Local application
+from src.services import usage
+from src.services.ai_provider import AIProvider, ImageResult
+from src.utils.image_utils import decode_base64
+
+logger = logging.getLogger("pokemon.cassette")
+
+
+class CassetteMiss(LookupError):
+    """No recorded call is left that can answer a request."""
+
+
+class ReplayedError(Exception):
+    """A provider error served from a cassette; carries the recorded status."""
+
+    def __init__(self, status_code: Optional[int], message: str, retry_after=None):
+        super().__init__(message)
+        self.status_code = status_code
+        headers = {"retry-after": str(retry_after)} if retry_after is not None else {}
+        self.response = types.SimpleNamespace(headers=headers)
+
+
+def _jsonable(value: Any) -> Any:
+    if isinstance(value, type):
+        return value.__name__  # response_format models
+    digest = getattr(value, "digest", None)
+    if isinstance(digest, str):
+        return {"image": digest}  # ReferenceImage
+    return repr(value)
+
+
+def request_key(kind: str, **request: Any) -> str:
+    """Stable fingerprint of one provider request."""
+    payload = json.dumps([kind, request], sort_keys=True, default=_jsonable)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+
+
+class Cassette:
+    """The on-disk calls log and image store described in the module docstring."""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.calls_path = self.path / "calls.jsonl"
+        self.images_dir = self.path / "images"
+
+    def load(self) -> list[dict]:
+        if not self.calls_path.exists():
+            raise FileNotFoundError(f"No cassette at {self.path}")
+        with open(self.calls_path, encoding="utf-8") as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    def last_seq(self) -> int:
+        """Highest `seq` recorded so far, so a new recording continues after it."""
+        if not self.calls_path.exists():
+            return 0
+        return max((entry.get("seq", 0) for entry in self.load()), default=0)
+
+    def append(self, entry: dict) -> None:
+        self.path.mkdir(parents=True, exist_ok=True)
+        with open(self.calls_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, separators=(",", ":")) + "\n")
+
+    def put_image(self, b64: str) -> str:
+        data = decode_base64(b64)
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.images_dir / f"{digest}.png"
+        if not path.exists():
+            self.images_dir.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(data)
+        return digest
+
+    def get_image(self, digest: str) -> str:
+        data = (self.images_dir / f"{digest}.png").read_bytes()
+        return base64.b64encode(data).decode("ascii")
+
+
+def _usage_snapshot() -> tuple[int, int, int]:
+    record = usage.current_call.get()
+    if record is None:
+        return (0, 0, 0)
+    return (record.input_tokens, record.output_tokens, record.images)
+
+
+class RecordingProvider:
+    """AIProvider that forwards to `inner` and records each call to `cassette`."""
+
+    def __init__(self, inner: AIProvider, cassette: Cassette):
+        self.inner = inner
+        self.cassette = cassette
+        self._seq = cassette.last_seq()  # recordings append to the same calls.jsonl
+        self._append_lock = asyncio.Lock()
+
+    async def _write(
+        self, kind: str, key: str, model: str, started: float, before, **fields
+    ):
+        after = _usage_snapshot()
+        self._seq += 1
+        entry = {
+            "seq": self._seq,
+            "kind": kind,
+            "key": key,
+            "model": model,
+            "seconds": round(time.perf_counter() - started, 4),
+            "usage": [a - b for a, b in zip(after, before)],
+            **fields,
+        }
+        # Off the event loop; the lock keeps whole lines in `seq` order
+        async with self._append_lock:
+            await asyncio.to_thread(self.cassette.append, entry)
+
+    async def _record(
+        self,
+        kind: str,
+        key: str,
+        model: str,
+        call: Callable[[], Awaitable[Any]],
+        encode: Callable[[Any], Awaitable[dict]],
+    ):
+        before = _usage_snapshot()
+        started = time.perf_counter()
+        try:
+            result = await call()
+        except Exception as e:
+            await self._write(kind, key, model, started, before, error=_encode_error(e))
+            raise
+        encoded = await encode(result)
+        await self._write(kind, key, model, started, before, result=encoded)
+        return result
+
+    async def _encode_images(self, result: ImageResult) -> dict:
+        response, images = result
+        digests = [await asyncio.to_thread(self.cassette.put_image, b64) for b64 in images]
+        return {"id": getattr(response, "id", None), "images": digests}
+
+    async def parse(self, *, model, messages, response_format):
+        key = request_key(
+            "parse", model=model, messages=messages, response_format=response_format
+        )
+
+        async def encode(content):
+            return {"content": content}
+
+        return await self._record(
+            "parse",
+            key,
+            model,
+            lambda: self.inner.parse(
+                model=model, messages=messages, response_format=response_format
+            ),
+            encode,
+        )
+
+    async def stream_parse(self, *, model, messages, response_format):
+        key = request_key(
+            "parse", model=model, messages=messages, response_format=response_format
+        )
+        before = _usage_snapshot()
+        started = time.perf_counter()
+        chunks: list[tuple[float, str]] = []
+        try:
+            async for delta in self.inner.stream_parse(
+                model=model, messages=messages, response_format=response_format
+            ):
+                chunks.append((round(time.perf_counter() - started, 4), delta))
+                yield delta
+        except Exception as e:
+            await self._write(
+                "stream_parse", key, model, started, before, error=_encode_error(e)
+            )
+            raise
+        await self._write(
+            "stream_parse", key, model, started, before, result={"chunks": chunks}
+        )
+
+    async def generate_image(
+        self,
+        *,
+        model,
+        prompt,
+        transparent=False,
+        previous_response_id=None,
+        quality=None,
+    ):
+        request = dict(
+            model=model,
+            prompt=prompt,
+            transparent=transparent,
+            previous_response_id=previous_response_id,
+            quality=quality,
+        )
+        return await self._record(
+            "generate_image",
+            request_key("generate_image", **request),
+            model,
+            lambda: self.inner.generate_image(**request),
+            self._encode_images,
+        )
+
+    async def edit_image(
+        self,
+        *,
+        model,
+        image,
+        prompt,
+        size="1024x1024",
+        quality="high",
+        background="opaque",
+    ):
+        request = dict(
+            model=model,
+            image=image,
+            prompt=prompt,
+            size=size,
+            quality=quality,
+            background=background,
+        )
+        return await self._record(
+            "edit_image",
+            request_key("edit_image", **request),
+            model,
+            lambda: self.inner.edit_image(**request),
+            self._encode_images,
+        )
+
+
+def _encode_error(error: Exception) -> dict:
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    return {
+        "status_code": getattr(error, "status_code", None),
+        "message": str(error),
+        "retry_after": headers.get("retry-after"),
+    }
+
+
+class ReplayProvider:
+    """
+    AIProvider that serves a recorded cassette.
+
+    A request is answered by the next unused call recorded with the same
+    fingerprint (an unstreamed `parse` also by a call recorded streaming). If
+    there is none (a prompt changed since recording, or a
+    benchmark runs more monsters than were recorded), the next unused call of
+    the same kind is served instead and counted in `misses`, starting over
+    once every call of that kind was served; with `strict` a `CassetteMiss`
+    is raised instead. Each call sleeps its recorded latency times
+    `latency_scale` (0 replays instantly), reports the recorded token usage
+    and re-raises recorded errors as `ReplayedError`. Served calls are kept
+    in `calls` as (kind, model, seconds), like `FakeProvider.calls`.
+    """
+
+    def __init__(self, cassette: Cassette, latency_scale: float = 1.0, strict: bool = False):
+        self.cassette = cassette
+        self.latency_scale = latency_scale
+        self.strict = strict
+        self.misses = 0
+        self.calls: list[tuple[str, str, float]] = []
+        self.entries = cassette.load()
+        self._by_key: defaultdict[tuple[str, str], deque[dict]] = defaultdict(deque)
+        self._by_kind: defaultdict[str, deque[dict]] = defaultdict(deque)
+        for entry in self.entries:
+            self._by_key[(entry["kind"], entry["key"])].append(entry)
+            self._by_kind[entry["kind"]].append(entry)
+        # Served entries, by line: `seq` repeats when several recordings share a file
+        self._used: set[int] = set()
+
+    @property
+    def remaining(self) -> int:
+        return len(self.entries) - len(self._used)
+
+    def _take(self, queue: deque[dict]) -> Optional[dict]:
+        while queue and id(queue[0]) in self._used:
+            queue.popleft()
+        if not queue:
+            return None
+        entry = queue.popleft()
+        self._used.add(id(entry))
+        return entry
+
+    def _next(self, key: str, *kinds: str) -> dict:
+        """The call answering `key`, looked up in `kinds` in order (see the class docstring)."""
+        entry = None
+        for kind in kinds:
+            entry = self._take(self._by_key[(kind, key)])
+            if entry is not None:
+                break
+        if entry is None:
+            if self.strict:
+                raise CassetteMiss(f"No recorded {kinds[0]} call for request {key}")
+            for kind in kinds:
+                entry = self._take(self._by_kind[kind])
+                if entry is None:
+                    self._rewind(kind)
+                    entry = self._take(self._by_kind[kind])
+                if entry is not None:
+                    break
+            if entry is None:
+                raise CassetteMiss(f"Cassette has no {kinds[0]} calls")
+            self.misses += 1
+            logger.debug("No exact match for %s %s; replaying seq=%s", kinds[0], key, entry["seq"])
+        self.calls.append((entry["kind"], entry["model"], entry["seconds"] * self.latency_scale))
+        return entry
+
+    def _rewind(self, kind: str) -> None:
+        """Make every recorded call of `kind` available again."""
+        for entry in self.entries:
+            if entry["kind"] == kind:
+                self._used.discard(id(entry))
+                self._by_key[(kind, entry["key"])].append(entry)
+                self._by_kind[kind].append(entry)
+
+    def _finish(self, entry: dict) -> None:
+        usage.report_usage(*entry.get("usage", (0, 0, 0)))
+        error = entry.get("error")
+        if error is not None:
+            raise ReplayedError(
+                error.get("status_code"), error.get("message", ""), error.get("retry_after")
+            )
+
+    async def _replay(self, entry: dict) -> dict:
+        delay = entry["seconds"] * self.latency_scale
+        if delay > 0:
+            await asyncio.sleep(delay)
+        self._finish(entry)
+        return entry["result"]
+
+    async def _images(self, kind: str, key: str) -> ImageResult:
+        result = await self._replay(self._next(key, kind))
+        images = [
+            await asyncio.to_thread(self.cassette.get_image, digest)
+            for digest in result["images"]
+        ]
+        return (types.SimpleNamespace(id=result["id"]), images)
+
+    async def parse(self, *, model, messages, response_format):
+        key = request_key(
+            "parse", model=model, messages=messages, response_format=response_format
+        )
+        entry = self._next(key, "parse", "stream_parse")
+        if entry["kind"] == "parse":
+            return (await self._replay(entry))["content"]
+        return (await self._replay_stream_as_parse(entry))["content"]
+
+    async def _replay_stream_as_parse(self, entry: dict) -> dict:
+        delay = (entry["result"]["chunks"][-1][0] if entry.get("result") else entry["seconds"])
+        if delay * self.latency_scale > 0:
+            await asyncio.sleep(delay * self.latency_scale)
+        self._finish(entry)
+        return {"content": "".join(delta for _, delta in entry["result"]["chunks"])}
+
+    async def stream_parse(self, *, model, messages, response_format) -> AsyncIterator[str]:
+        key = request_key(
+            "parse", model=model, messages=messages, response_format=response_format
+        )
+        entry = self._next(key, "stream_parse")
+        if entry.get("error") is not None:
+            await asyncio.sleep(entry["seconds"] * self.latency_scale)
+            self._finish(entry)
+        elapsed = 0.0
+        for offset, delta in entry["result"]["chunks"]:
+            wait = (offset - elapsed) * self.latency_scale
+            if wait > 0:
+                await asyncio.sleep(wait)
+            elapsed = offset
+            yield delta
+        self._finish(entry)
+
+    async def generate_image(
+        self,
+        *,
+        model,
+        prompt,
+        transparent=False,
+        previous_response_id=None,
+        quality=None,
+    ):
+        key = request_key(
+            "generate_image",
+            model=model,
+            prompt=prompt,
+            transparent=transparent,
+            previous_response_id=previous_response_id,
+            quality=quality,
+        )
+        return await self._images("generate_image", key)
+
+    async def edit_image(
+        self,
+        *,
+        model,
+        image,
+        prompt,
+        size="1024x1024",
+        quality="high",
+        background="opaque",
+    ):
+        key = request_key(
+            "edit_image",
+            model=model,
+            image=image,
+            prompt=prompt,
+            size=size,
+            quality=quality,
+            background=background,
+        )
+        return await self._images("edit_image", key)
+
+
+def cassette_provider(mode: str) -> AIProvider:
+    """The provider for `settings.AI_PROVIDER` "record" or "replay"."""
+    from src.core import settings
+    from src.services.ai_provider import OpenAIProvider
+
+    if not settings.CASSETTE_DIR:
+        raise RuntimeError(f'AI_PROVIDER="{mode}" needs CASSETTE_DIR to be set')
+    cassette = Cassette(settings.CASSETTE_DIR)
+    if mode == "record":
+        return RecordingProvider(OpenAIProvider(), cassette)
+    return ReplayProvider(
+        cassette,
+        latency_scale=settings.CASSETTE_LATENCY_SCALE,
+        strict=settings.CASSETTE_STRICT,
+    )
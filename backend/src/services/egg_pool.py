@@ -0,0 +1,262 @@
+# Standard library
+import asyncio
+import contextlib
+import logging
+import random
+from typing import Optional
+
+# Third-party
+from fastapi import HTTPException
+from sqlalchemy.engine import Engine
+from sqlmodel import Session
+from starlette import status
+
+# Local application
+from src.core import settings
+from src.database import pokemon as pokemon_db
+from src.database.db import SessionType, engine
+from src.models import Pokemon, PokemonData, PokemonState
+from src.response_models import PokemonResponse
+from src.services import pokemon_full
+from src.services.lease import heartbeat, lease_expiry
+from src.services.metrics import EGG_POOL_READY, EGGS_TOTAL
+from src.services.singleflight import creation_flight
+from src.utils import blob_store
+
+logger = logging.getLogger("pokemon.eggs")
+
+EGG_TYPES = [
+    "Fire", "Water", "Grass", "Electric", "Ice", "Fighting", "Poison", "Ground",
+    "Flying", "Psychic", "Bug", "Rock", "Ghost", "Dragon", "Dark", "Steel", "Fairy",
+]
+EGG_TRAITS = [
+    "tiny and round", "long-tailed", "armored", "fluffy", "crystalline",
+    "winged", "horned", "spotted", "glowing", "many-eyed", "leafy", "striped",
+]
+EGG_SYLLABLES = ["ba", "zu", "ki", "mo", "ra", "pi", "to", "lu", "ne", "so", "ga", "vy"]
+
+
+def egg_input(rng: random.Random) -> PokemonData:
+    """A random creation input; names vary so eggs are not cached or coalesced."""
+    name = "".join(rng.choice(EGG_SYLLABLES) for _ in range(3)).capitalize()
+    ptype = rng.choice(EGG_TYPES)
+    trait = rng.choice(EGG_TRAITS)
+    return PokemonData(
+        name=name,
+        description=f"{name} is a {trait} {ptype}-type monster that just hatched from an egg.",
+        physical_attr=trait,
+        ptype=ptype,
+    )
+
+
+class EggPool:
+    """
+    Keeps `size` complete monsters in the `reserved` state, ready to hatch.
+
+    Eggs are created with the regular pipeline in the `incubating` state and
+    flipped to `reserved` once every stage has finished. The refill worker
+    only incubates while no user creation of this process is in flight, and
+    wakes early after each hatch. Hatching is
+    `pokemon_db.claim_reserved_pokemon`: one UPDATE, no generation.
+
+    Every worker process runs its own pool against the same table. An
+    incubating egg holds a lease its worker renews, and the pool counts the
+    reserved eggs plus the leased incubating ones of every worker, so the
+    workers fill one pool of `size` between them instead of one each.
+    """
+
+    def __init__(
+        self,
+        size: int,
+        bind: Engine = engine,
+        concurrency: int = 1,
+        poll_seconds: float = 30.0,
+        seed: Optional[int] = None,
+    ):
+        self.size = size
+        self.bind = bind
+        self.concurrency = max(1, concurrency)
+        self.poll_seconds = poll_seconds
+        self.incubating = 0
+        self._rng = random.Random(seed)
+        self._wake = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def busy(self) -> bool:
+        """True while user creations (anything but our eggs) are running."""
+        return len(creation_flight) > self.incubating
+
+    def ready(self, session: SessionType) -> int:
+        count = pokemon_db.count_pokemon_by_state(PokemonState.reserved, session)
+        EGG_POOL_READY.set(count)
+        return count
+
+    async def incubate(self) -> Optional[int]:
+        """Create one egg; returns its id, or None when the pipeline failed."""
+        data = egg_input(self._rng)
+        egg_id: Optional[int] = None
+        missing_sprites = 0
+
+        async def on_progress(stage: str, info: dict):
+            nonlocal egg_id, missing_sprites
+            if stage == "setup":
+                egg_id = info.get("pokemon_id")
+            elif stage == "sprites":
+                missing_sprites = info.get("errors", 0) + info.get("dropped", 0)
+
+        egg = Pokemon(
+            name=data.name,
+            state=PokemonState.incubating,
+            lease_expires_at=lease_expiry(settings.EGG_LEASE_SECONDS),
+        )
+
+        def renew_lease():
+            if egg_id is None:  # not saved yet; the initial lease still holds
+                return
+            with Session(self.bind) as lease_session:
+                pokemon_db.renew_egg_lease(
+                    egg_id, lease_expiry(settings.EGG_LEASE_SECONDS), lease_session
+                )
+
+        self.incubating += 1
+        try:
+            with Session(self.bind) as session:
+                try:
+                    async with heartbeat(renew_lease, settings.EGG_LEASE_SECONDS):
+                        result = await pokemon_full.create_pokemon_complete(
+                            egg,
+                            data,
+                            session,
+                            on_progress,
+                        )
+                    if missing_sprites:
+                        # Only complete monsters go in the pool
+                        raise RuntimeError(f"{missing_sprites} sprites missing")
+                    pokemon_db.set_pokemon_state(
+                        result.pokemon.id, PokemonState.reserved, session
+                    )
+                except Exception as e:
+                    logger.warning("Egg incubation failed: %s", e)
+                    EGGS_TOTAL.labels("failed").inc()
+                    if egg_id is not None:
+                        session.rollback()
+                        discard_egg(egg_id, session)
+                    return None
+                except BaseException:
+                    # Cancelled, e.g. by `stop` at shutdown: let the creation
+                    # unwind (it may be past setup without having reported
+                    # it), then leave nothing half-made behind
+                    await creation_flight.settle(pokemon_full.creation_key(data))
+                    session.rollback()
+                    egg_id = egg_id or egg.id
+                    if egg_id is not None:
+                        discard_egg(egg_id, session)
+                    raise
+            EGGS_TOTAL.labels("incubated").inc()
+            logger.info("Egg id=%s is ready", result.pokemon.id)
+            return result.pokemon.id
+        finally:
+            self.incubating -= 1
+
+    async def refill(self) -> int:
+        """Incubate eggs until the pool is full or a user creation starts."""
+        added = 0
+        while not self.busy():
+            with Session(self.bind) as session:
+                self.ready(session)
+                missing = self.size - pokemon_db.count_unclaimed_eggs(session)
+            if missing <= 0:
+                break
+            batch = min(missing, self.concurrency)
+            ids = await asyncio.gather(*(self.incubate() for _ in range(batch)))
+            hatched = sum(1 for egg_id in ids if egg_id is not None)
+            if not hatched:
+                break  # provider trouble; wait for the next poll
+            added += hatched
+        with Session(self.bind) as session:
+            self.ready(session)
+        return added
+
+    def wake(self) -> None:
+        self._wake.set()
+
+    async def run(self) -> None:
+        logger.info("Egg pool worker started (size=%d)", self.size)
+        while True:
+            if not self.busy():
+                try:
+                    await self.refill()
+                except Exception:
+                    logger.exception("Egg pool refill failed")
+            self._wake.clear()
+            with contextlib.suppress(TimeoutError):
+                async with asyncio.timeout(self.poll_seconds):
+                    await self._wake.wait()
+
+    def start(self) -> asyncio.Task:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run())
+        return self._task
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+    def hatch(self, session: SessionType) -> PokemonResponse:
+        """
+        Claim a reserved egg for the caller.
+
+        Raises:
+            HTTPException 503: If no egg is ready yet.
+        """
+        pokemon = pokemon_db.claim_reserved_pokemon(session)
+        self.wake()
+        if pokemon is None:
+            EGGS_TOTAL.labels("empty").inc()
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="No eggs are ready yet; try again shortly.",
+            )
+        EGGS_TOTAL.labels("hatched").inc()
+        logger.info("Hatched egg id=%s", pokemon.id)
+        return PokemonResponse(
+            status=status.HTTP_200_OK,
+            detail="Pokemon Hatched Successfully",
+            pokemon=pokemon,
+        )
+
+
+def discard_egg(pokemon_id: int, session: SessionType) -> None:
+    """Delete a failed or incomplete egg's row and folder."""
+    pokemon = session.get(Pokemon, pokemon_id)
+    if pokemon is None:
+        return
+    image_directory = pokemon.image_directory
+    pokemon_db.delete_pokemon(pokemon, session)  # before the folder; see delete route
+    if image_directory:
+        blob_store.remove_monster(image_directory)
+
+
+def discard_stale_eggs(session: SessionType) -> int:
+    """
+    Delete eggs left `incubating` by a process that stopped mid-incubation;
+    returns how many. Only eggs whose lease has lapsed are touched, so it is
+    safe while other workers incubate. Called at startup.
+    """
+    stale = pokemon_db.get_lapsed_eggs(session)
+    for pokemon in stale:
+        discard_egg(int(pokemon.id), session)  # type: ignore[arg-type]
+    if stale:
+        logger.info("Discarded %d stale incubating eggs", len(stale))
+    return len(stale)
+
+
+# Shared by the app's refill worker and the hatch route
+egg_pool = EggPool(
+    size=settings.EGG_POOL_SIZE,
+    concurrency=settings.EGG_POOL_CONCURRENCY,
+    poll_seconds=settings.EGG_POOL_POLL_SECONDS,
+)
@@ -0,0 +1,203 @@
+# Standard library
+import asyncio
+import base64
+import json
+import random
+import struct
+import types
+import zlib
+from dataclasses import dataclass, field
+from typing import Any, Literal, Optional, Union, get_args, get_origin
+
+# Third-party
+from pydantic import BaseModel
+
+# Local application
+from src.services.usage import report_usage
+
+# Output tokens of one 1024x1024 gpt-image-1 image, by quality, and the
+# input tokens of one reference image
+IMAGE_OUTPUT_TOKENS = {"low": 272, "medium": 1056, "high": 4160}
+IMAGE_INPUT_TOKENS = 323
+
+
+def message_tokens(messages: list) -> int:
+    """Rough prompt size: ~4 characters per text token, fixed cost per image."""
+    tokens = 0
+    for message in messages:
+        content = message.get("content", "")
+        parts = content if isinstance(content, list) else [{"text": content}]
+        for part in parts:
+            text = part.get("text")
+            tokens += len(text) // 4 if text is not None else IMAGE_INPUT_TOKENS
+    return tokens
+
+
+@dataclass
+class LatencyModel:
+    """Log-normal latency: `median` seconds with spread `sigma` (0 = fixed)."""
+
+    median: float = 0.0
+    sigma: float = 0.0
+
+    def sample(self, rng: random.Random) -> float:
+        if self.median <= 0:
+            return 0.0
+        if self.sigma <= 0:
+            return self.median
+        return rng.lognormvariate(0, self.sigma) * self.median
+
+
+class FakeProviderError(Exception):
+    """Injected failure; carries `status_code` like the OpenAI SDK's errors."""
+
+    def __init__(self, status_code: int):
+        super().__init__(f"Injected fake provider error ({status_code})")
+        self.status_code = status_code
+        self.response = types.SimpleNamespace(headers={"retry-after": "0"})
+
+
+def fake_png(width: int = 8, height: int = 8, seed: int = 0) -> bytes:
+    """A valid RGB PNG filled with a single seed-derived colour."""
+    color = bytes(((seed * 53) % 256, (seed * 97) % 256, (seed * 193) % 256))
+    raw = b"".join(b"\x00" + color * width for _ in range(height))
+
+    def chunk(tag: bytes, data: bytes) -> bytes:
+        body = tag + data
+        return struct.pack(">I", len(data)) + body + struct.pack(">I", zlib.crc32(body))
+
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", header)
+        + chunk(b"IDAT", zlib.compress(raw))
+        + chunk(b"IEND", b"")
+    )
+
+
+def fake_value(annotation: Any, name: str, rng: random.Random, list_length: int) -> Any:
+    """Build a value that validates against `annotation`."""
+    origin = get_origin(annotation)
+    if origin is Literal:
+        return rng.choice(get_args(annotation))
+    if origin in (Union, types.UnionType):
+        options = [a for a in get_args(annotation) if a is not type(None)]
+        return fake_value(options[0], name, rng, list_length)
+    if origin in (list, tuple, set):
+        (item,) = get_args(annotation)[:1] or (str,)
+        return [fake_value(item, name, rng, list_length) for _ in range(list_length)]
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return fake_instance(annotation, rng, list_length)
+    if annotation is int:
+        return rng.randint(1, 100)
+    if annotation is float:
+        return round(rng.uniform(0, 1), 3)
+    if annotation is bool:
+        return rng.random() < 0.5
+    return f"Fake {name.replace('_', ' ')} {rng.randint(1000, 9999)}"
+
+
+def fake_instance(
+    model: type[BaseModel], rng: random.Random, list_length: int = 4
+) -> dict[str, Any]:
+    return {
+        name: fake_value(f.annotation, name, rng, list_length)
+        for name, f in model.model_fields.items()
+    }
+
+
+@dataclass
+class FakeProvider:
+    """
+    Offline AIProvider with configurable latency and failure rates.
+
+    Structured calls return schema-valid JSON; image calls return real PNG bytes
+    and a response object with an `id` that later calls may chain onto.
+    Each call kind ("parse", "image", "chain", "edit") has its own latency model and
+    error rate; a "<kind>:<quality>" latency entry (e.g. "edit:low") applies to
+    image calls at that quality. Injected errors are 429s (retried by the
+    schedulers) unless `error_status` says otherwise. Every call is recorded in `calls` as
+    (kind, model, seconds slept), and reports plausible token counts (about
+    four characters per token; images priced like gpt-image-1).
+    """
+
+    latency: dict[str, LatencyModel] = field(default_factory=dict)
+    error_rate: dict[str, float] = field(default_factory=dict)
+    error_status: int = 429
+    list_length: int = 4
+    stream_chunks: int = 16
+    image_size: int = 8
+    seed: Optional[int] = None
+    calls: list[tuple[str, str, float]] = field(default_factory=list)
+
+    def __post_init__(self):
+        self._rng = random.Random(self.seed)
+        self._images = 0
+
+    async def _simulate(
+        self, kind: str, model: str, sleep: bool = True, quality: Optional[str] = None
+    ) -> float:
+        latency = self.latency.get(f"{kind}:{quality}") or self.latency.get(kind)
+        delay = (latency or LatencyModel()).sample(self._rng)
+        self.calls.append((kind, model, delay))
+        if delay and sleep:
+            await asyncio.sleep(delay)
+        if self._rng.random() < self.error_rate.get(kind, 0.0):
+            raise FakeProviderError(self.error_status)
+        return delay
+
+    def _image(
+        self, prompt: str, quality: Optional[str], image_tokens: int = 0
+    ) -> tuple[Any, list[str]]:
+        report_usage(
+            input_tokens=len(prompt) // 4 + image_tokens,
+            output_tokens=IMAGE_OUTPUT_TOKENS.get(quality or "high", 4160),
+            images=1,
+        )
+        self._images += 1
+        png = fake_png(self.image_size, self.image_size, seed=self._images)
+        response = types.SimpleNamespace(id=f"resp_fake_{self._images}")
+        return (response, [base64.b64encode(png).decode("ascii")])
+
+    async def parse(self, *, model, messages, response_format):
+        await self._simulate("parse", model)
+        content = json.dumps(fake_instance(response_format, self._rng, self.list_length))
+        report_usage(message_tokens(messages), len(content) // 4)
+        return content
+
+    async def stream_parse(self, *, model, messages, response_format):
+        """`parse` split into `stream_chunks` pieces spread over the call's latency."""
+        delay = await self._simulate("parse", model, sleep=False)
+        content = json.dumps(fake_instance(response_format, self._rng, self.list_length))
+        step = max(1, -(-len(content) // self.stream_chunks))
+        for start in range(0, len(content), step):
+            if delay:
+                await asyncio.sleep(delay * step / len(content))
+            yield content[start : start + step]
+        report_usage(message_tokens(messages), len(content) // 4)
+
+    async def generate_image(
+        self,
+        *,
+        model,
+        prompt,
+        transparent=False,
+        previous_response_id=None,
+        quality=None,
+    ):
+        kind = "chain" if previous_response_id else "image"
+        await self._simulate(kind, model, quality=quality)
+        return self._image(prompt, quality)
+
+    async def edit_image(
+        self,
+        *,
+        model,
+        image,
+        prompt,
+        size="1024x1024",
+        quality="high",
+        background="opaque",
+    ):
+        await self._simulate("edit", model, quality=quality)
+        return self._image(prompt, quality, image_tokens=IMAGE_INPUT_TOKENS)
@@ -0,0 +1,100 @@
+# Standard library
+import asyncio
+from collections import deque
+from contextlib import AbstractAsyncContextManager, nullcontext
+from typing import Any, Awaitable, Callable, Optional, TypeVar
+
+# Local application
+from src.core import settings
+from src.services.metrics import HEDGED_REQUESTS_TOTAL
+
+T = TypeVar("T")
+
+
+class LatencyTracker:
+    """
+    Rolling window of recent successful call latencies.
+
+    `percentile` stays None until `min_samples` calls have been seen, so a cold
+    process never hedges on a guess.
+    """
+
+    def __init__(self, window: int = 256, min_samples: int | None = None):
+        self.samples: deque[float] = deque(maxlen=window)
+        self.min_samples = (
+            min_samples if min_samples is not None else settings.SPRITE_HEDGE_MIN_SAMPLES
+        )
+
+    def observe(self, seconds: float) -> None:
+        self.samples.append(seconds)
+
+    def percentile(self, pct: float) -> Optional[float]:
+        if len(self.samples) < max(1, self.min_samples):
+            return None
+        ordered = sorted(self.samples)
+        rank = min(len(ordered) - 1, int(round((len(ordered) - 1) * pct / 100)))
+        return ordered[rank]
+
+
+async def hedged(
+    call: Callable[[], Awaitable[T]],
+    hedge_after: Optional[float],
+    *,
+    hedge_slot: Optional[Callable[[], AbstractAsyncContextManager[Any]]] = None,
+    tracker: Optional[LatencyTracker] = None,
+) -> T:
+    """
+    Await `call()`, firing one duplicate if it is still running after `hedge_after`s.
+
+    Whichever attempt succeeds first wins and the other is cancelled. If the
+    first attempt to finish fails, the other is still awaited; only when both
+    fail is the last error raised. An error before the hedge fires propagates
+    immediately, so callers such as `ProviderScheduler.run` retry as usual.
+    The duplicate is issued inside `hedge_slot()` (e.g. its own scheduler
+    slot and rate-limit token); if the primary wins while the duplicate still
+    waits there, it is never sent. Successful latencies are fed to `tracker`.
+    """
+    loop = asyncio.get_running_loop()
+
+    async def attempt() -> T:
+        started = loop.time()
+        result = await call()
+        if tracker is not None:
+            tracker.observe(loop.time() - started)
+        return result
+
+    async def duplicate() -> T:
+        async with hedge_slot() if hedge_slot is not None else nullcontext():
+            HEDGED_REQUESTS_TOTAL.labels("fired").inc()
+            return await attempt()
+
+    primary = asyncio.ensure_future(attempt())
+    backup: Optional[asyncio.Future] = None
+    try:
+        if hedge_after is None:
+            return await primary
+        done, _ = await asyncio.wait({primary}, timeout=hedge_after)
+        if done:
+            return primary.result()
+
+        backup = asyncio.ensure_future(duplicate())
+        pending: set[asyncio.Future] = {primary, backup}
+        error: BaseException | None = None
+        while pending:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                if task.cancelled():
+                    continue
+                if task.exception() is None:
+                    if task is backup:
+                        HEDGED_REQUESTS_TOTAL.labels("won").inc()
+                    return task.result()
+                error = task.exception()
+        assert error is not None
+        raise error
+    finally:
+        for task in (primary, backup):
+            if task is not None and not task.done():
+                task.cancel()
@@ -0,0 +1,210 @@
+# Standard library
+import asyncio
+import logging
+import uuid
+
+# Third-party
+from fastapi import HTTPException
+from sqlalchemy.engine import Engine
+from sqlmodel import Session
+from starlette import status
+
+# Local application
+from src.core import settings
+from src.database import jobs as jobs_db
+from src.database.db import SessionType, engine
+from src.models import JobStatus, Pokemon, PokemonData, PokemonInput, PokemonJob
+from src.services import pokemon_full
+from src.services.pokemon_crud import get_pokemon_by_id
+from src.services.lease import heartbeat, lease_expired, lease_expiry
+from src.services.pokemon_full import PIPELINE_STAGES
+from src.services.metrics import JOBS_IN_FLIGHT
+from src.utils import normalize_input
+
+logger = logging.getLogger("pokemon.jobs")
+
+# Strong references so running jobs are not garbage collected mid-flight
+_background_tasks: set[asyncio.Task] = set()
+
+
+def submit_pokemon_job(
+    pokemon_name: str,
+    pokemon_data: PokemonInput,
+    session: SessionType,
+    bind: Engine | None = None,
+) -> PokemonJob:
+    """
+    Record a creation job and start the pipeline in the background.
+
+    The job row is committed before the task starts, so the returned id can be
+    polled from any worker through `get_job_status`. It is created holding a
+    lease that `run_pokemon_job` keeps renewing (see `fail_interrupted_jobs`).
+
+    Args:
+        pokemon_name (str): Name for the new Pokémon row.
+        pokemon_data (PokemonInput): User-provided input data describing the Pokémon.
+        session (SessionType): Request-scoped session used to create the job row.
+        bind (Engine | None): Engine the background task opens its own session on.
+            Defaults to the application engine.
+
+    Returns:
+        PokemonJob: The queued job.
+
+    Raises:
+        HTTPException 422: If the input data cannot be normalized.
+    """
+    try:
+        data = normalize_input(pokemon_data)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e)
+        )
+
+    job = jobs_db.create_job(
+        PokemonJob(
+            id=uuid.uuid4().hex,
+            pokemon_name=pokemon_name,
+            input_data=data.model_dump(),
+            stages_total=len(PIPELINE_STAGES),
+            lease_expires_at=lease_expiry(settings.JOB_LEASE_SECONDS),
+        ),
+        session,
+    )
+    task = asyncio.create_task(run_pokemon_job(job.id, bind=bind or engine))
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    logger.info("Queued job id=%s for name=%s", job.id, pokemon_name)
+    return job
+
+
+def submit_resume_job(
+    pokemon_id: int, session: SessionType, bind: Engine | None = None
+) -> PokemonJob:
+    """Queue `resume_pokemon_creation` for an existing Pokémon as a background job."""
+    pokemon = get_pokemon_by_id(pokemon_id, session)
+    job = jobs_db.create_job(
+        PokemonJob(
+            id=uuid.uuid4().hex,
+            pokemon_name=pokemon.name,
+            pokemon_id=pokemon_id,
+            stages_total=len(PIPELINE_STAGES),
+            lease_expires_at=lease_expiry(settings.JOB_LEASE_SECONDS),
+        ),
+        session,
+    )
+    task = asyncio.create_task(run_pokemon_job(job.id, bind=bind or engine))
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    logger.info("Queued resume job id=%s for pokemon_id=%s", job.id, pokemon_id)
+    return job
+
+
+async def run_pokemon_job(job_id: str, bind: Engine = engine) -> None:
+    """
+    Run a queued job, recording each stage.
+
+    Jobs queued for an existing Pokémon (`pokemon_id` already set) resume it
+    with `resume_pokemon_creation`; all others run `create_pokemon_complete`.
+    The job's lease is renewed (on a session of its own) until it finishes.
+    """
+
+    def renew_lease():
+        with Session(bind) as lease_session:
+            jobs_db.update_job(
+                job_id,
+                lease_session,
+                lease_expires_at=lease_expiry(settings.JOB_LEASE_SECONDS),
+            )
+
+    with Session(bind) as session, JOBS_IN_FLIGHT.track_inprogress():
+        job = jobs_db.get_job(job_id, session)
+        if job is None:
+            logger.error("Job id=%s vanished before it could start", job_id)
+            return
+
+        jobs_db.update_job(
+            job_id,
+            session,
+            status=JobStatus.running,
+            stage=PIPELINE_STAGES[0],
+            lease_expires_at=lease_expiry(settings.JOB_LEASE_SECONDS),
+        )
+
+        async def on_progress(stage: str, info: dict):
+            if stage not in PIPELINE_STAGES:
+                return
+            done = PIPELINE_STAGES.index(stage) + 1
+            fields = {
+                "stage": PIPELINE_STAGES[min(done, len(PIPELINE_STAGES) - 1)],
+                "stages_completed": done,
+            }
+            if info.get("pokemon_id") is not None:
+                fields["pokemon_id"] = info["pokemon_id"]
+            jobs_db.update_job(job_id, session, **fields)
+
+        async with heartbeat(renew_lease, settings.JOB_LEASE_SECONDS):
+            try:
+                if job.pokemon_id is not None:
+                    response = await pokemon_full.resume_pokemon_creation(
+                        job.pokemon_id, session=session, on_progress=on_progress
+                    )
+                else:
+                    response = await pokemon_full.create_pokemon_complete(
+                        pokemon=Pokemon(name=job.pokemon_name),
+                        pokemon_data=PokemonData(**job.input_data),
+                        session=session,
+                        on_progress=on_progress,
+                    )
+                jobs_db.update_job(
+                    job_id,
+                    session,
+                    status=JobStatus.succeeded,
+                    pokemon_id=response.pokemon.id,
+                    result=response.model_dump(mode="json"),
+                )
+                logger.info("Job id=%s succeeded", job_id)
+            except HTTPException as e:
+                logger.exception("Job id=%s failed", job_id)
+                jobs_db.update_job(
+                    job_id, session, status=JobStatus.failed, error=str(e.detail)
+                )
+            except Exception as e:
+                logger.exception("Job id=%s failed", job_id)
+                jobs_db.update_job(
+                    job_id, session, status=JobStatus.failed, error=str(e)
+                )
+
+
+def fail_interrupted_jobs(session: SessionType) -> int:
+    """
+    Mark queued or running jobs whose lease has lapsed as failed; returns how
+    many. A lapsed lease means the worker running the job stopped before it
+    finished, so this is safe to call while other workers run jobs of their
+    own. Called at startup; `get_job_status` also fails a lapsed job it reports.
+    """
+    stale = jobs_db.get_expired_jobs(session)
+    for job in stale:
+        _fail_interrupted(job.id, session)
+    if stale:
+        logger.info("Marked %d interrupted jobs as failed", len(stale))
+    return len(stale)
+
+
+def _fail_interrupted(job_id: str, session: SessionType) -> PokemonJob | None:
+    return jobs_db.update_job(
+        job_id,
+        session,
+        status=JobStatus.failed,
+        error="Interrupted: its worker stopped before it finished",
+    )
+
+
+def get_job_status(job_id: str, session: SessionType) -> PokemonJob:
+    job = jobs_db.get_job(job_id, session)
+    if not job:
+        raise HTTPException(detail="Job Not Found", status_code=404)
+    if job.status in (JobStatus.queued, JobStatus.running) and lease_expired(
+        job.lease_expires_at
+    ):
+        job = _fail_interrupted(job_id, session)
+    return job
@@ -0,0 +1,43 @@
+# Standard library
+import asyncio
+import contextlib
+import logging
+from datetime import datetime, timedelta
+from typing import AsyncIterator, Callable
+
+logger = logging.getLogger("pokemon.lease")
+
+
+def lease_expiry(seconds: float) -> datetime:
+    """When a lease taken (or renewed) now for `seconds` runs out."""
+    return datetime.now() + timedelta(seconds=seconds)
+
+
+def lease_expired(expires_at: datetime | None) -> bool:
+    """True once nobody holds the lease; rows from before leases never had one."""
+    return expires_at is None or expires_at <= datetime.now()
+
+
+@contextlib.asynccontextmanager
+async def heartbeat(renew: Callable[[], None], seconds: float) -> AsyncIterator[None]:
+    """
+    Call `renew` every third of `seconds` while the block runs, so a lease of
+    `seconds` outlives a missed beat or two but lapses soon after the process
+    holding it stops. A failed renewal is logged and retried on the next beat.
+    """
+
+    async def beat():
+        while True:
+            await asyncio.sleep(seconds / 3)
+            try:
+                renew()
+            except Exception:
+                logger.exception("Lease renewal failed")
+
+    task = asyncio.create_task(beat())
+    try:
+        yield
+    finally:
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
@@ -0,0 +1,158 @@
+# Standard library
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Optional
+
+# Third-party
+from pydantic import BaseModel
+
+# Local application
+from src.core import settings
+from src.core.pokemon_config import MonsterConfig
+
+logger = logging.getLogger("pokemon.llm_cache")
+
+
+class LLMCache:
+    """
+    Content-addressed, disk-backed LRU cache for structured model outputs.
+
+    Entries are JSON files named by the request hash. Recency is tracked through
+    file mtimes so the LRU order survives restarts; once the directory grows past
+    `max_bytes` the least recently used entries are deleted. With `ttl` set,
+    entries older than `ttl` seconds count as misses and are removed.
+
+    `get`/`set` do file IO and block; async code uses `get_async`/`set_async`,
+    which run them on a worker thread.
+    """
+
+    def __init__(self, directory: str | Path, max_bytes: int, ttl: Optional[float] = None):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._index: Optional[OrderedDict[str, int]] = None  # key -> size, LRU first
+        self._total = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(
+        *,
+        prompt: str,
+        model: str,
+        response_model: type[BaseModel],
+        image_b64: Optional[str] = None,
+    ) -> str:
+        """Hash everything that determines the model's answer."""
+        material = {
+            "prompt": prompt,
+            "model": model,
+            "schema": response_model.model_json_schema(),
+            "image": (
+                hashlib.sha256(image_b64.encode("ascii")).hexdigest()
+                if image_b64
+                else None
+            ),
+        }
+        blob = json.dumps(material, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def _ensure_index(self) -> OrderedDict[str, int]:
+        if self._index is None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            entries = sorted(
+                (p.stat().st_mtime, p.stem, p.stat().st_size)
+                for p in self.directory.glob("*.json")
+            )
+            self._index = OrderedDict((key, size) for _, key, size in entries)
+            self._total = sum(self._index.values())
+        return self._index
+
+    def _drop(self, key: str) -> None:
+        index = self._ensure_index()
+        self._total -= index.pop(key, 0)
+        self._path(key).unlink(missing_ok=True)
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            index = self._ensure_index()
+            if key not in index:
+                self.misses += 1
+                return None
+            path = self._path(key)
+            try:
+                entry = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                self._drop(key)
+                self.misses += 1
+                return None
+            if self.ttl is not None and time.time() - entry["created_at"] > self.ttl:
+                self._drop(key)
+                self.misses += 1
+                return None
+            os.utime(path)
+            index.move_to_end(key)
+            self.hits += 1
+            return entry["value"]
+
+    def set(self, key: str, value: str) -> None:
+        text = json.dumps({"created_at": time.time(), "value": value}, ensure_ascii=False)
+        with self._lock:
+            index = self._ensure_index()
+            path = self._path(key)
+            tmp = path.with_suffix(".json.tmp")
+            tmp.write_text(text, encoding="utf-8")
+            tmp.replace(path)
+            self._total -= index.pop(key, 0)
+            index[key] = path.stat().st_size
+            self._total += index[key]
+            while self._total > self.max_bytes and len(index) > 1:
+                oldest = next(iter(index))
+                self._drop(oldest)
+                self.evictions += 1
+
+    async def get_async(self, key: str) -> Optional[str]:
+        return await asyncio.to_thread(self.get, key)
+
+    async def set_async(self, key: str, value: str) -> None:
+        await asyncio.to_thread(self.set, key, value)
+
+    def clear(self) -> None:
+        with self._lock:
+            for key in list(self._ensure_index()):
+                self._drop(key)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            index = self._ensure_index()
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(index),
+                "bytes": self._total,
+                "max_bytes": self.max_bytes,
+            }
+
+
+llm_cache: Optional[LLMCache] = (
+    LLMCache(
+        settings.LLM_CACHE_DIR or MonsterConfig.CACHE_DIR / "llm",
+        max_bytes=settings.LLM_CACHE_MAX_BYTES,
+        ttl=settings.LLM_CACHE_TTL_SECONDS,
+    )
+    if settings.LLM_CACHE_ENABLED
+    else None
+)
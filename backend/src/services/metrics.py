@@ -0,0 +1,152 @@
+# Standard library
+import asyncio
+import time
+from contextlib import contextmanager
+from typing import Any, Awaitable, Iterator, Mapping, TypeVar
+
+# Third-party
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+
+# Local application
+from src.services import usage
+
+T = TypeVar("T")
+
+# Generation stages run from sub-second (disk) to minutes (sprite fan-out)
+STAGE_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120, 300, 600)
+
+STAGE_SECONDS = Histogram(
+    "pokemon_pipeline_stage_seconds",
+    "Duration of each creation pipeline stage",
+    ["stage", "outcome"],
+    buckets=STAGE_BUCKETS,
+)
+CRITICAL_PATH_SECONDS = Histogram(
+    "pokemon_pipeline_critical_path_seconds",
+    "Time each stage spent on a creation's critical path",
+    ["stage"],
+    buckets=STAGE_BUCKETS,
+)
+PROVIDER_CALL_SECONDS = Histogram(
+    "pokemon_provider_call_seconds",
+    "Duration of individual provider calls (one observation per attempt)",
+    ["call", "model", "outcome"],
+    buckets=STAGE_BUCKETS,
+)
+SCHEDULER_WAIT_SECONDS = Histogram(
+    "pokemon_scheduler_wait_seconds",
+    "Time a provider call waited for a concurrency slot",
+    ["scheduler", "model"],
+    buckets=STAGE_BUCKETS,
+)
+PIPELINES_IN_FLIGHT = Gauge(
+    "pokemon_pipelines_in_flight", "Creation pipelines currently running"
+)
+JOBS_IN_FLIGHT = Gauge("pokemon_jobs_in_flight", "Background creation jobs running")
+SCHEDULER_QUEUE_DEPTH = Gauge(
+    "pokemon_scheduler_queue_depth", "Calls waiting for a slot", ["scheduler"]
+)
+SCHEDULER_IN_FLIGHT = Gauge(
+    "pokemon_scheduler_in_flight", "Calls holding a slot", ["scheduler"]
+)
+PROVIDER_REQUEST_BYTES = Counter(
+    "pokemon_provider_request_bytes",
+    "Prompt and image payload bytes sent to the provider",
+    ["call"],
+)
+HEDGED_REQUESTS_TOTAL = Counter(
+    "pokemon_hedged_requests_total",
+    "Duplicate requests fired for slow calls, and how many of them won",
+    ["outcome"],
+)
+SINGLEFLIGHT_COALESCED_TOTAL = Counter(
+    "pokemon_singleflight_coalesced_total",
+    "Calls that joined an identical in-flight computation instead of starting one",
+    ["group"],
+)
+SPRITES_TOTAL = Counter(
+    "pokemon_sprites_total", "Sprites generated, by outcome", ["outcome"]
+)
+EGG_POOL_READY = Gauge(
+    "pokemon_egg_pool_ready", "Pre-generated monsters waiting to be hatched"
+)
+EGGS_TOTAL = Counter(
+    "pokemon_eggs_total", "Egg pool events, by outcome", ["outcome"]
+)
+SPRITE_UPGRADES_TOTAL = Counter(
+    "pokemon_sprite_upgrades_total",
+    "Draft sprites re-rendered at full quality, by outcome",
+    ["outcome"],
+)
+
+
+def _outcome(error: BaseException) -> str:
+    return "rate_limited" if getattr(error, "status_code", None) == 429 else "error"
+
+
+@contextmanager
+def stage_timer(stage: str) -> Iterator[None]:
+    """
+    Record how long the wrapped pipeline stage took and whether it failed.
+
+    Provider calls made inside are attributed to `stage` in the creation's
+    usage ledger, which also receives the stage's wall time.
+    """
+    started = time.perf_counter()
+    outcome = "ok"
+    token = usage.current_stage.set(stage)
+    try:
+        yield
+    except BaseException as e:
+        outcome = _outcome(e)
+        raise
+    finally:
+        usage.current_stage.reset(token)
+        elapsed = time.perf_counter() - started
+        STAGE_SECONDS.labels(stage, outcome).observe(elapsed)
+        ledger = usage.current_ledger.get()
+        if ledger is not None:
+            ledger.stage_seconds[stage] += elapsed
+
+
+async def observe_call(call: str, model: str, awaitable: Awaitable[T]) -> T:
+    """
+    Await one provider call, recording its duration by call, model and outcome.
+
+    Inside a creation the attempt is also added to its usage ledger, together
+    with the token counts the provider reports while it runs.
+    """
+    started = time.perf_counter()
+    outcome = "ok"
+    record = usage.CallRecord(usage.current_stage.get(), call, model)
+    token = usage.current_call.set(record)
+    try:
+        return await awaitable
+    except BaseException as e:
+        outcome = (
+            "cancelled" if isinstance(e, asyncio.CancelledError) else _outcome(e)
+        )
+        raise
+    finally:
+        usage.current_call.reset(token)
+        elapsed = time.perf_counter() - started
+        PROVIDER_CALL_SECONDS.labels(call, model, outcome).observe(elapsed)
+        ledger = usage.current_ledger.get()
+        if ledger is not None:
+            record.seconds, record.outcome = elapsed, outcome
+            ledger.calls.append(record)
+
+
+def render_metrics(schedulers: Mapping[str, Any]) -> tuple[bytes, str]:
+    """Prometheus exposition of every metric, with scheduler gauges refreshed."""
+    for name, scheduler in schedulers.items():
+        SCHEDULER_QUEUE_DEPTH.labels(name).set(scheduler.queued)
+        SCHEDULER_IN_FLIGHT.labels(name).set(scheduler.in_flight)
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
@@ -0,0 +1,169 @@
+# Standard library
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Optional
+
+# Third-party
+from fastapi import HTTPException
+
+# Local application
+from src.services.metrics import CRITICAL_PATH_SECONDS
+
+logger = logging.getLogger("pokemon.dag")
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Client errors (4xx HTTPExceptions) are final; anything else may be transient."""
+    if isinstance(error, HTTPException):
+        return error.status_code >= 500
+    return isinstance(error, Exception)
+
+
+@dataclass
+class Node:
+    """
+    One stage of a `Dag`.
+
+    `fn` is called with the outputs of `deps` as keyword arguments (named after
+    the dependency) once all of them have finished. A failing attempt is
+    retried up to `retries` times with exponential `backoff` when
+    `retry_if(error)` holds.
+    """
+
+    name: str
+    fn: Callable[..., Awaitable[Any]]
+    deps: tuple[str, ...] = ()
+    retries: int = 0
+    backoff: float = 0.5
+    retry_if: Callable[[BaseException], bool] = is_retryable
+
+
+@dataclass
+class NodeTiming:
+    started: float
+    finished: float
+    attempts: int
+
+    @property
+    def seconds(self) -> float:
+        return self.finished - self.started
+
+
+@dataclass
+class DagRun:
+    """Outputs and timings of one `Dag.run`."""
+
+    outputs: dict[str, Any] = field(default_factory=dict)
+    timings: dict[str, NodeTiming] = field(default_factory=dict)
+
+    def critical_path(self, dag: "Dag") -> list[dict[str, Any]]:
+        """
+        The chain of nodes that determined the run's total duration.
+
+        Starting from the node that finished last, repeatedly step to the
+        dependency that finished last; shortening any node on this path
+        shortens the run.
+        """
+        if not self.timings:
+            return []
+        name: Optional[str] = max(self.timings, key=lambda n: self.timings[n].finished)
+        path = []
+        while name is not None:
+            timing = self.timings[name]
+            path.append(
+                {
+                    "stage": name,
+                    "seconds": round(timing.seconds, 3),
+                    "attempts": timing.attempts,
+                }
+            )
+            deps = [d for d in dag.nodes[name].deps if d in self.timings]
+            name = max(deps, key=lambda d: self.timings[d].finished) if deps else None
+        path.reverse()
+        return path
+
+
+class Dag:
+    """
+    A set of `Node`s run as soon as their dependencies allow.
+
+    Independent nodes run concurrently; a node's provider calls still go
+    through the shared schedulers, which bound the real parallelism. If a node
+    fails after its retries, every other running node is cancelled and the
+    error is raised.
+    """
+
+    def __init__(self, nodes: list[Node]):
+        self.nodes = {node.name: node for node in nodes}
+        if len(self.nodes) != len(nodes):
+            raise ValueError("Duplicate node names in DAG")
+        for node in nodes:
+            missing = [d for d in node.deps if d not in self.nodes]
+            if missing:
+                raise ValueError(f"Node {node.name!r} depends on unknown {missing}")
+        self.order = self._topological_order()
+
+    def _topological_order(self) -> list[str]:
+        order: list[str] = []
+        state: dict[str, str] = {}
+
+        def visit(name: str, trail: tuple[str, ...]):
+            if state.get(name) == "done":
+                return
+            if state.get(name) == "visiting":
+                raise ValueError(f"Cycle in DAG: {' -> '.join(trail + (name,))}")
+            state[name] = "visiting"
+            for dep in self.nodes[name].deps:
+                visit(dep, trail + (name,))
+            state[name] = "done"
+            order.append(name)
+
+        for name in self.nodes:
+            visit(name, ())
+        return order
+
+    async def _run_node(self, node: Node, run: DagRun, tasks: dict[str, asyncio.Task]):
+        inputs = {dep: await tasks[dep] for dep in node.deps}
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                output = await node.fn(**inputs)
+                break
+            except Exception as e:
+                if attempt > node.retries or not node.retry_if(e):
+                    raise
+                delay = node.backoff * (2 ** (attempt - 1))
+                logger.warning(
+                    "Stage %s failed (attempt %d/%d): %s; retrying in %.1fs",
+                    node.name,
+                    attempt,
+                    node.retries + 1,
+                    e,
+                    delay,
+                )
+                await asyncio.sleep(delay)
+        run.timings[node.name] = NodeTiming(started, loop.time(), attempt)
+        run.outputs[node.name] = output
+        return output
+
+    async def run(self) -> DagRun:
+        run = DagRun()
+        tasks: dict[str, asyncio.Task] = {}
+        for name in self.order:  # dependencies first, so their tasks exist
+            tasks[name] = asyncio.ensure_future(
+                self._run_node(self.nodes[name], run, tasks)
+            )
+        try:
+            await asyncio.gather(*tasks.values())
+        except BaseException:
+            for task in tasks.values():
+                task.cancel()
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
+            raise
+        for step in run.critical_path(self):
+            CRITICAL_PATH_SECONDS.labels(step["stage"]).observe(step["seconds"])
+        return run
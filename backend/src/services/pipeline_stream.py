@@ -0,0 +1,97 @@
+# Standard library
+import asyncio
+import json
+import logging
+from typing import Any, AsyncIterator
+
+# Third-party
+from fastapi import HTTPException
+from sqlalchemy.engine import Engine
+from sqlmodel import Session
+from starlette import status
+
+# Local application
+from src.database.db import engine
+from src.models import Pokemon, PokemonInput
+from src.services import pokemon_full
+from src.utils import normalize_input
+
+logger = logging.getLogger("pokemon.stream")
+
+# Seconds of silence before a keep-alive comment is sent to hold proxies open
+HEARTBEAT_SECONDS = 15.0
+
+# Pipelines keep running if the client disconnects; hold references to them
+_running: set[asyncio.Task] = set()
+
+
+def format_sse(event: str, data: Any) -> str:
+    """Encode one server-sent event."""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+async def stream_pokemon_creation(
+    pokemon_name: str,
+    pokemon_data: PokemonInput,
+    bind: Engine = engine,
+    heartbeat: float = HEARTBEAT_SECONDS,
+) -> AsyncIterator[str]:
+    """
+    Start `create_pokemon_complete` and return its progress as server-sent events.
+
+    Emits one event per pipeline stage (see `PIPELINE_STAGES`), a `sprite` event
+    for every sprite as soon as it is written, then `complete` with the final
+    response or `error` with the HTTP status and detail.
+
+    Raises:
+        HTTPException 422: If the input data cannot be normalized. This happens
+        before the first event so the route can still answer with an error code.
+    """
+    try:
+        data = normalize_input(pokemon_data)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e)
+        )
+
+    queue: asyncio.Queue = asyncio.Queue()
+
+    async def on_progress(stage: str, info: dict):
+        await queue.put((stage, info))
+
+    async def run():
+        with Session(bind) as session:
+            try:
+                response = await pokemon_full.create_pokemon_complete(
+                    pokemon=Pokemon(name=pokemon_name),
+                    pokemon_data=data,
+                    session=session,
+                    on_progress=on_progress,
+                )
+                await queue.put(("complete", response.model_dump(mode="json")))
+            except HTTPException as e:
+                await queue.put(
+                    ("error", {"status_code": e.status_code, "detail": e.detail})
+                )
+            except Exception as e:
+                logger.exception("Streamed creation failed for name=%s", pokemon_name)
+                await queue.put(("error", {"status_code": 500, "detail": str(e)}))
+            finally:
+                await queue.put(None)
+
+    task = asyncio.create_task(run())
+    _running.add(task)
+    task.add_done_callback(_running.discard)
+
+    async def events() -> AsyncIterator[str]:
+        while True:
+            try:
+                item = await asyncio.wait_for(queue.get(), timeout=heartbeat)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            if item is None:
+                return
+            yield format_sse(*item)
+
+    return events()
@@ -0,0 +1,124 @@
+# Standard library
+import asyncio
+import logging
+import time
+from typing import Sequence
+
+# Third-party
+from fastapi import HTTPException
+from sqlalchemy.engine import Engine
+from sqlmodel import Session
+from starlette import status
+
+# Local application
+from src.core import settings
+from src.database.db import SessionType, engine
+from src.models import Pokemon, PokemonData, PokemonInput
+from src.response_models import BatchCreateResponse, BatchItemResult
+from src.services import pokemon_folder_service as svc, pokemon_full
+from src.utils import format_pokemon_folder_name, normalize_input
+
+logger = logging.getLogger("pokemon.batch")
+
+
+async def batch_pokemon_setup(
+    items: Sequence[PokemonInput], session: SessionType
+) -> list[tuple[int, PokemonData]]:
+    """
+    Run the setup stage for a whole batch with a single database transaction.
+
+    Every input is validated before anything is written. All rows and their
+    `image_directory` paths are committed together (rolled back together on
+    failure); folders and `data_user.json` files are then created concurrently.
+
+    Returns:
+        list[tuple[int, PokemonData]]: Pokémon id and normalized input, in input order.
+
+    Raises:
+        HTTPException 422: If any input cannot be normalized.
+    """
+    try:
+        datas = [normalize_input(item) for item in items]
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e)
+        )
+
+    pokemons = [Pokemon(name=d.name) for d in datas]
+    try:
+        session.add_all(pokemons)
+        session.flush()  # assigns ids inside the open transaction
+        for pokemon in pokemons:
+            folder = await svc.add_directory(name=format_pokemon_folder_name(pokemon))
+            pokemon.image_directory = folder["path"]
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+
+    ids = [int(p.id) for p in pokemons]  # type: ignore[arg-type]
+
+    async def write_files(pokemon_id: int, data: PokemonData):
+        await svc.add_required_folders_pokemon(pokemon_id, session)
+        await svc.write_pokemon_data(pokemon_id, data, session, data_type="base_data")
+
+    await asyncio.gather(*(write_files(i, d) for i, d in zip(ids, datas)))
+    logger.info("Batch setup complete for %d Pokémon", len(ids))
+    return list(zip(ids, datas))
+
+
+async def create_pokemon_batch(
+    items: Sequence[PokemonInput],
+    session: SessionType,
+    bind: Engine = engine,
+    max_parallel: int = settings.BATCH_MAX_MONSTERS,
+) -> BatchCreateResponse:
+    """
+    Create many Pokémon at once, pipelining their stages across monsters.
+
+    After `batch_pokemon_setup`, each Pokémon runs `create_pokemon_from_setup`
+    with its own session, up to `max_parallel` at a time. Provider calls from
+    all of them share the process-wide schedulers, so one monster's
+    description runs while another's sprites render. A failure only marks its
+    own entry as failed.
+    """
+    started = time.perf_counter()
+    rows = await batch_pokemon_setup(items, session)
+    gate = asyncio.Semaphore(max_parallel)
+
+    async def run_one(index: int, pokemon_id: int, data: PokemonData):
+        item_started = time.perf_counter()
+        async with gate:
+            try:
+                with Session(bind) as item_session:
+                    result = await pokemon_full.create_pokemon_from_setup(
+                        pokemon_id, data, item_session
+                    )
+                outcome, detail = "succeeded", result.detail
+            except HTTPException as e:
+                outcome, detail = "failed", str(e.detail)
+            except Exception as e:
+                logger.exception("Batch item %d (id=%s) failed", index, pokemon_id)
+                outcome, detail = "failed", str(e)
+        return BatchItemResult(
+            index=index,
+            name=data.name,
+            pokemon_id=pokemon_id,
+            status=outcome,
+            detail=detail,
+            seconds=round(time.perf_counter() - item_started, 3),
+        )
+
+    results = await asyncio.gather(
+        *(run_one(i, pid, data) for i, (pid, data) in enumerate(rows))
+    )
+    succeeded = sum(1 for r in results if r.status == "succeeded")
+    return BatchCreateResponse(
+        status=status.HTTP_200_OK,
+        detail=f"Created {succeeded} of {len(results)} Pokémon",
+        total=len(results),
+        succeeded=succeeded,
+        failed=len(results) - succeeded,
+        seconds=round(time.perf_counter() - started, 3),
+        results=list(results),
+    )
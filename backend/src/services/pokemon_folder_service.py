@@ -14,10 +14,13 @@ from src.database.db import SessionType
 from src.models import PokemonInput
 from src.response_models import PokemonResponse, PokemonResponsePaths
 from src.services.pokemon_crud import get_pokemon_by_id
+from src.utils import blob_store
 from src.utils.pokemon_utils import format_pokemon_folder_name
 from typing import Union
 from typing import Optional
 
+UPLOAD_CHUNK = 1 << 20
+
 
 async def set_pokemon_directory(pokemon_id: int, session: SessionType):
     """
@@ -184,7 +187,9 @@ async def write_pokemon_data(
     pokemon_id: int,
     pokemon_data: BaseModel | dict[str, Any] | Mapping[str, Any],
     session: SessionType,
-    data_type: Literal["base_data", "description", "animation"] = "base_data",
+    data_type: Literal[
+        "base_data", "description", "moveset", "expressions", "animation"
+    ] = "base_data",
     animation_dir: Optional[str] = None,
 ):
     """
@@ -243,13 +248,10 @@ async def write_pokemon_data(
                 detail=f"Data is not JSON serializable: {e}",
             )
 
-        # Atomic write to avoid partial files on crash
-        def _atomic_write(target: Path, text: str):
-            tmp = target.with_suffix(target.suffix + ".tmp")
-            tmp.write_text(text, encoding="utf-8", newline="\n")
-            tmp.replace(target)
-
-        await to_thread.run_sync(_atomic_write, file_path, json_text)
+        # Atomic, deduplicated write to avoid partial files on crash
+        await to_thread.run_sync(
+            blob_store.put_bytes, json_text.encode("utf-8"), file_path
+        )
 
         return PokemonResponsePaths(
             status=status.HTTP_200_OK,
@@ -325,8 +327,11 @@ async def add_pokemon_image(
         base_dir = response.paths[0]
         image_path = Path(base_dir) / option / file.filename  # type: ignore
         if file:
-            with image_path.open("wb") as buffer:
-                buffer.write(file.file.read())
+            await to_thread.run_sync(
+                blob_store.put_chunks,
+                iter(lambda: file.file.read(UPLOAD_CHUNK), b""),
+                image_path,
+            )
         else:
             # Just touch the file if no content passed
             image_path.touch()
@@ -367,3 +372,27 @@ async def get_all_pokemon_images(
         return files
     except HTTPException as e:
         raise e
+
+
+async def verify_pokemon_files(pokemon_id: int, session: SessionType, deep: bool = False):
+    """
+    Check a Pokémon's files against its blob store manifest.
+
+    Linked files are checked by inode and size alone; `deep` rehashes every
+    blob too. Returns the number of tracked files and any problems found.
+    """
+    try:
+        response = await get_pokemon_directory(pokemon_id, session=session)
+        base_dir = Path(response.paths[0])
+        problems = await to_thread.run_sync(blob_store.verify_monster, base_dir, deep)
+        return {
+            "ok": not problems,
+            "files": len(blob_store.read_manifest(base_dir)),
+            "problems": problems,
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e)
+        )
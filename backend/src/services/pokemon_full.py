@@ -1,70 +1,256 @@
 # Standard library
+import hashlib
 import inspect
 import json
 import logging
 from pathlib import Path
 
 # Third-party
+from anyio import to_thread
 from fastapi import HTTPException
-from openai import OpenAI
 from starlette import status
 import asyncio
-from typing import cast
+from typing import Any, Awaitable, Callable, Optional, TypeVar, cast
+
+from pydantic import BaseModel, ValidationError
 
 # Local application
+from src.core import settings
+from src.core.pokemon_config import MonsterConfig
 from src.database.db import SessionType
 from src.models import Pokemon, PokemonData, PokemonInput
 from src.response_models import PokemonResponse
 from src.services import pokemon_crud, pokemon_folder_service as svc, pokemon_generation
 from src.services.pokemon_generation import (
     PokemonDescription,
+    PokemonExpression,
     PokemonExpressionSet,
+    PokemonMove,
     PokemonMoveList,
 )
+from src.services.metrics import (
+    PIPELINES_IN_FLIGHT,
+    SPRITES_TOTAL,
+    stage_timer,
+)
+from src.services.pipeline_dag import Dag, Node
+from src.services import sprite_atlas, usage
+from src.services.singleflight import creation_flight
+from src.services.sprite_upgrade import draft_quality, schedule_sprite_upgrade
+from src.services.usage import UsageLedger, save_usage, track_usage
 from src.services.prompts import (
     pokemon_cute_animations,
     pokemon_description_prompt,
     pokemon_moveset_prompt,
 )
-from src.utils import write_image_data, normalize_input, normalize_name
+from src.utils import (
+    ReferenceImage,
+    blob_store,
+    image_variants,
+    format_image_url,
+    load_reference_image,
+    write_image_data,
+    normalize_input,
+    normalize_name,
+)
 
 logging.basicConfig(
     level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s :: %(message)s"
 )
 logger = logging.getLogger("pokemon.pipeline")  # configure handlers/level elsewhere
 
-client = OpenAI()
+# Stages of create_pokemon_complete, in order. Progress callbacks receive one of
+# these names once the stage has finished, plus "sprite" for every sprite written
+# (sprites start while the movesets are still streaming, so these can come early).
+PIPELINE_STAGES = ("setup", "description", "base_image", "movesets", "sprites", "persist")
 
+ProgressCallback = Callable[[str, dict[str, Any]], Awaitable[None]]
 
-async def run_sprite_tasks(sprite_tasks):
-    import asyncio
+CheckpointModel = TypeVar("CheckpointModel", bound=BaseModel)
 
-    coros = [t["task"] for t in sprite_tasks]
-    # return_exceptions=True so one failure doesn't cancel all
-    results = await asyncio.gather(*coros, return_exceptions=True)
 
-    completed = []
-    for meta, res in zip(sprite_tasks, results):
-        if isinstance(res, Exception):
-            completed.append(
-                {
-                    "id": meta["id"],
-                    "name": meta["name"],
-                    "error": res,
-                    "result": None,
-                    "data": meta.get("data", {}),
-                }
-            )
-        else:
-            completed.append(
-                {
-                    "id": meta["id"],
-                    "name": meta["name"],
-                    "result": res,
-                    "data": meta.get("data", {}),
-                }
-            )
-    return completed
+async def report_progress(
+    on_progress: Optional[ProgressCallback], stage: str, **info: Any
+) -> None:
+    """Forward a progress event; listener failures never break the pipeline."""
+    if on_progress is None:
+        return
+    try:
+        await on_progress(stage, info)
+    except Exception:
+        logger.exception("Progress callback failed for stage=%s", stage)
+
+
+class ProgressFanout:
+    """
+    Forwards the progress of one shared creation to every caller awaiting it.
+
+    Each subscriber gets its own queue, pre-filled with the events it missed,
+    so a caller that joins late still sees every stage in order.
+    """
+
+    def __init__(self):
+        self.history: list[tuple[str, dict[str, Any]]] = []
+        self._queues: list[asyncio.Queue] = []
+
+    async def __call__(self, stage: str, info: dict[str, Any]) -> None:
+        self.history.append((stage, info))
+        for queue in self._queues:
+            queue.put_nowait((stage, info))
+
+    def subscribe(self, listener: ProgressCallback) -> Callable[[], Awaitable[None]]:
+        """Start forwarding to `listener`; await the returned function to stop."""
+        queue: asyncio.Queue = asyncio.Queue()
+        for event in self.history:
+            queue.put_nowait(event)
+        self._queues.append(queue)
+
+        async def pump():
+            while (event := await queue.get()) is not None:
+                await report_progress(listener, event[0], **event[1])
+
+        task = asyncio.create_task(pump())
+
+        async def unsubscribe():
+            self._queues.remove(queue)
+            queue.put_nowait(None)  # deliver what is queued, then stop
+            try:
+                await task
+            except asyncio.CancelledError:
+                task.cancel()
+                raise
+
+        return unsubscribe
+
+
+# Progress of in-flight creations, keyed like `creation_flight`
+_creation_progress: dict[str, ProgressFanout] = {}
+
+
+def creation_key(pokemon_data: PokemonInput) -> Optional[str]:
+    """Hash of the normalized input; None when the input does not validate."""
+    try:
+        data = normalize_input(pokemon_data)
+    except ValueError:
+        return None
+    return hashlib.sha256(data.model_dump_json().encode("utf-8")).hexdigest()
+
+
+SpriteCallback = Callable[[dict[str, Any]], Awaitable[Any]]
+
+
+def pipeline_deadline() -> Optional[float]:
+    """Event-loop time by which a creation starting now should finish, if bounded."""
+    budget = settings.PIPELINE_DEADLINE_SECONDS
+    if budget is None:
+        return None
+    return asyncio.get_running_loop().time() + budget
+
+
+class SpriteRunner:
+    """
+    Starts sprite tasks as they are planned and collects them as they finish.
+
+    `add` schedules a sprite immediately, so rendering can begin while later
+    sprites are still being planned; `results` then awaits everything in
+    completion order. Each finished sprite is handed to `on_complete` at once,
+    so the fastest ones are persisted while the slow ones are still rendering.
+    Once a sprite has been handed off its image payload is released, keeping
+    at most the in-flight payloads in memory. Failures are recorded per sprite
+    under "error" (generation) or "persist_error" (`on_complete`) and never
+    cancel the remaining tasks.
+
+    Sprites marked "optional" that are still running at `deadline` (event-loop
+    time) are cancelled and recorded with "dropped"; a later resume renders them.
+    `discard` withdraws sprites that turned out not to be wanted.
+    """
+
+    def __init__(
+        self,
+        on_complete: Optional[SpriteCallback] = None,
+        deadline: Optional[float] = None,
+    ):
+        self.on_complete = on_complete
+        self.deadline = deadline
+        self._running: list[asyncio.Task] = []
+        self._names: dict[asyncio.Task, str] = {}
+        self._discarded: set[str] = set()
+        self._persisting: set[str] = set()
+
+    def __len__(self) -> int:
+        return len(self._running)
+
+    async def _run_one(self, meta):
+        entry = {
+            "id": meta["id"],
+            "name": meta["name"],
+            "result": None,
+            "data": meta.get("data", {}),
+        }
+        budget = asyncio.timeout_at(self.deadline if meta.get("optional") else None)
+        usage.current_stage.set("sprites")  # this task's own context
+        try:
+            async with budget:
+                entry["result"] = await meta["task"]
+        except Exception as e:
+            entry["error"] = e
+            if budget.expired():
+                entry["dropped"] = True
+        if meta["name"] in self._discarded:
+            return entry
+        if self.on_complete is not None:
+            self._persisting.add(meta["name"])
+            try:
+                entry["persisted"] = await self.on_complete(entry)
+            except Exception as e:
+                logger.exception("Sprite persist error for %s: %s", meta["name"], e)
+                entry["persist_error"] = e
+            entry["result"] = None
+        return entry
+
+    def add(self, meta) -> None:
+        task = asyncio.create_task(self._run_one(meta))
+        self._names[task] = meta["name"]
+        self._running.append(task)
+
+    async def discard(self, names: set[str]) -> None:
+        """
+        Withdraw the sprites in `names`: those still rendering are cancelled and
+        those already being persisted are awaited, so once this returns none of
+        them writes again and their files can be deleted. They are left out of
+        `results`.
+        """
+        self._discarded.update(names)
+        dropped = [task for task in self._running if self._names[task] in names]
+        for task in dropped:
+            if self._names[task] not in self._persisting:
+                task.cancel()
+        await asyncio.gather(*dropped, return_exceptions=True)
+        self._running = [task for task in self._running if task not in dropped]
+
+    async def cancel(self) -> None:
+        """Cancel every sprite and wait until none can still write to disk."""
+        for task in self._running:
+            task.cancel()
+        await asyncio.gather(*self._running, return_exceptions=True)
+
+    async def results(self) -> list:
+        completed = []
+        for next_done in asyncio.as_completed(self._running):
+            completed.append(await next_done)
+        return completed
+
+
+async def run_sprite_tasks(
+    sprite_tasks,
+    on_complete: Optional[SpriteCallback] = None,
+    deadline: Optional[float] = None,
+):
+    """Run an already planned list of sprite tasks; see `SpriteRunner`."""
+    runner = SpriteRunner(on_complete=on_complete, deadline=deadline)
+    for meta in sprite_tasks:
+        runner.add(meta)
+    return await runner.results()
 
 
 async def basic_pokemon_setup(
@@ -124,7 +310,7 @@ async def generate_enhance_description(
     pokemon_id, pokemon_data: PokemonData, session: SessionType
 ):
     logger.debug("Generating enhanced description for pokemon_id=%s", pokemon_id)
-    desc_json = pokemon_generation.generate_pokemon_description(
+    desc_json = await pokemon_generation.generate_pokemon_description_async(
         pokemon_data, description_prompt_template=pokemon_description_prompt
     )
     if not desc_json:
@@ -163,10 +349,12 @@ async def generate_base_image(
 ):
     # 4) Base image
     logger.debug("Generating base image for pokemon_id=%s", pokemon_id)
-    base_img_resp, base_image_bytes = pokemon_generation.generate_pokemon_base_image(
-        image_description=str(desc.image_description),
-        better_description=desc.description,
-        user_input=user_data,
+    base_img_resp, base_image_bytes = (
+        await pokemon_generation.generate_pokemon_base_image_async(
+            image_description=str(desc.image_description),
+            better_description=desc.description,
+            user_input=user_data,
+        )
     )
     logger.debug(
         "Base image generated: resp_type=%s, image_bytes=%s",
@@ -176,20 +364,53 @@ async def generate_base_image(
 
     save_path = Path(base_dir) / "base"
     logger.debug("Saving base image to %s (filename=base)", save_path)
-    save_r = write_image_data(base_image_bytes, save_path, filename="base")
+    save_r = await write_image_data(base_image_bytes, save_path, filename="base")
     base_filepath = save_r["filepath"]
     logger.info("Base image saved: %s", base_filepath)
     return base_img_resp, base_filepath
 
 
+def validated_items(
+    model: type[CheckpointModel], on_valid: Callable[[int, Any], None]
+) -> Callable[[Any], None]:
+    """
+    Adapt `on_valid(index, item)` into a callback for raw streamed list items.
+
+    Items are numbered from 1 in stream order, matching the list positions of
+    the final response. An item that fails validation is logged and skipped
+    here; the full response is validated again once it is complete.
+    """
+    count = 0
+
+    def on_item(raw):
+        nonlocal count
+        count += 1
+        try:
+            item = model.model_validate(raw)
+        except ValidationError as e:
+            logger.warning("Skipping invalid streamed %s: %s", model.__name__, e)
+            return
+        on_valid(count, item)
+
+    return on_item
+
+
 async def generate_expressive_moveset(
-    pokemon_id: int, description, reference_image_path: str | Path
+    pokemon_id: int,
+    description,
+    reference: Optional[ReferenceImage],
+    on_expression: Optional[Callable[[int, PokemonExpression], None]] = None,
 ) -> PokemonExpressionSet:
     logger.debug("Generating cute moveset for pokemon_id=%s", pokemon_id)
-    cute_moves_json = pokemon_generation.generate_cute_moveset(
+    cute_moves_json = await pokemon_generation.generate_cute_moveset_async(
         data=description,
         cute_prompt_template=pokemon_cute_animations,
-        image_path=str(reference_image_path),
+        image=reference,
+        on_expression=(
+            validated_items(PokemonExpression, on_expression)
+            if on_expression
+            else None
+        ),
     )
     if not cute_moves_json:
         logger.error(
@@ -201,9 +422,10 @@ async def generate_expressive_moveset(
         len(cute_moves_json) if isinstance(cute_moves_json, str) else -1,
     )
 
-    cute_moves_data: PokemonExpressionSet = PokemonExpressionSet.model_validate(
-        json.loads(cute_moves_json)
-    )
+    with stage_timer("expressions_parse"):
+        cute_moves_data: PokemonExpressionSet = PokemonExpressionSet.model_validate(
+            json.loads(cute_moves_json)
+        )
     logger.info(
         " Parsed moveset: %d moves", len(getattr(cute_moves_data, "move_list", []))
     )
@@ -211,13 +433,21 @@ async def generate_expressive_moveset(
 
 
 async def generate_moveset(
-    pokemon_id: int, description, reference_image_path: str | Path
+    pokemon_id: int,
+    description,
+    reference: Optional[ReferenceImage],
+    on_move: Optional[Callable[[int, PokemonMove], None]] = None,
 ) -> PokemonMoveList:
+    """
+    Generate the battle moveset. With `on_move`, each move is passed on
+    (with its 1-based position) as soon as it has streamed in and validated.
+    """
     logger.debug("Generating  moveset for pokemon_id=%s", pokemon_id)
-    moves_json = pokemon_generation.generate_moveset(
+    moves_json = await pokemon_generation.generate_moveset_async(
         data=description,
         moveset_prompt_template=pokemon_moveset_prompt,
-        image_path=str(reference_image_path),
+        image=reference,
+        on_move=validated_items(PokemonMove, on_move) if on_move else None,
     )
     if not moves_json:
         logger.error(
@@ -229,75 +459,70 @@ async def generate_moveset(
         len(moves_json) if isinstance(moves_json, str) else -1,
     )
 
-    moves_data: PokemonMoveList = PokemonMoveList.model_validate(json.loads(moves_json))
+    with stage_timer("moveset_parse"):
+        moves_data: PokemonMoveList = PokemonMoveList.model_validate(
+            json.loads(moves_json)
+        )
     logger.info(" Parsed moveset: %d moves", len(getattr(moves_data, "move_list", [])))
     return moves_data
 
 
-async def parse_moveset(moveset: PokemonMoveList, prev_response):
-    sprite_tasks = []
-    for i, move in enumerate(moveset.move_list, start=1):
-        sprite_description = move.to_string  # property
-        logger.debug("Queueing sprite task %d: name=%s", i, getattr(move, "name", None))
-        # NOTE: pass the base_img_resp as you intended
-        task = pokemon_generation.fwp_image_generation_sprite(
+def sprite_task(
+    sprite_id: str,
+    move: PokemonMove | PokemonExpression,
+    prev_response,
+    quality: Optional[str] = None,
+) -> dict:
+    """Sprite task for one move or expression (optional under a deadline)."""
+    sprite_description = move.to_string  # property
+    logger.debug("Queueing sprite task %s: name=%s", sprite_id, move.name)
+    meta = {
+        "id": sprite_id,
+        "name": normalize_name(move.name),
+        "task": pokemon_generation.fwp_image_generation_sprite(
             prev_response,
             sprite_description,
-        )
-        sprite_tasks.append(
-            {
-                "id": f"move_{i}",
-                "name": normalize_name(move.name),
-                "task": task,
-                "data": move.model_dump(),  # keep original move meta
-            }
-        )
-        last = sprite_tasks[-1]
-        logger.debug(
-            "Queued sprite task: id=%s name=%s task_type=%s awaitable=%s "
-            "base_img_resp_type=%s sprite_desc_len=%s",
-            last["id"],
-            last["name"],
-            type(last["task"]).__name__,
-            inspect.isawaitable(last["task"]),
-            type(prev_response).__name__,
-            (len(sprite_description) if isinstance(sprite_description, str) else "n/a"),
-        )
-    return sprite_tasks
+            quality=quality,
+        ),
+        "animation": sprite_description,
+        "data": move.model_dump(),  # keep original move/expression meta
+        "optional": True,
+    }
+    logger.debug(
+        "Queued sprite task: id=%s name=%s task_type=%s awaitable=%s "
+        "base_img_resp_type=%s sprite_desc_len=%s",
+        meta["id"],
+        meta["name"],
+        type(meta["task"]).__name__,
+        inspect.isawaitable(meta["task"]),
+        type(prev_response).__name__,
+        len(sprite_description),
+    )
+    return meta
+
+
+async def parse_moveset(moveset: PokemonMoveList, prev_response):
+    return [
+        sprite_task(f"move_{i}", move, prev_response)
+        for i, move in enumerate(moveset.move_list, start=1)
+    ]
 
 
 async def parse_expression(expressive: PokemonExpressionSet, prev_response):
-    sprite_tasks = []
-    for i, move in enumerate(expressive.expressions, start=1):
-        logger.debug("Queueing sprite task %d: name=%s", i, getattr(move, "name", None))
-        sprite_description = move.to_string
-        task = pokemon_generation.fwp_image_generation_sprite(
-            prev_response,
-            sprite_description,
-        )
-        sprite_tasks.append(
-            {
-                "id": f"expression_{i}",
-                "name": normalize_name(move.name),
-                "task": task,
-                "data": move.model_dump(),  # keep original expression meta
-            }
-        )
-        last = sprite_tasks[-1]
-        logger.debug(
-            "Queued sprite task: id=%s name=%s task_type=%s awaitable=%s "
-            "base_img_resp_type=%s sprite_desc_len=%s",
-            last["id"],
-            last["name"],
-            type(last["task"]).__name__,
-            inspect.isawaitable(last["task"]),
-            type(prev_response).__name__,
-            (len(sprite_description) if isinstance(sprite_description, str) else "n/a"),
-        )
-    return sprite_tasks
+    return [
+        sprite_task(f"expression_{i}", expression, prev_response)
+        for i, expression in enumerate(expressive.expressions, start=1)
+    ]
+
+
+GENERIC_SPRITE_ANIMATION = (
+    "Generate a default 3/4-view walking animation sprite of the character in GBA pixel art style. "
+    "Keep proportions simple, use a clear silhouette, strong outlines, and high-contrast shading. "
+    "This sprite should serve as a neutral fallback animation usable for any case."
+)
 
 
-async def parse_generic(prev_response):
+async def parse_generic(prev_response, quality: Optional[str] = None):
     logger.debug("Queueing generic fallback sprite task")
     sprite_tasks = []
     sprite_tasks.append(
@@ -305,14 +530,11 @@ async def parse_generic(prev_response):
             "id": "generic",
             "name": normalize_name("generic"),
             "task": pokemon_generation.fwp_image_generation_sprite(
-                prev_response,
-                (
-                    "Generate a default 3/4-view walking animation sprite of the character in GBA pixel art style. "
-                    "Keep proportions simple, use a clear silhouette, strong outlines, and high-contrast shading. "
-                    "This sprite should serve as a neutral fallback animation usable for any case."
-                ),
+                prev_response, GENERIC_SPRITE_ANIMATION, quality=quality
             ),
+            "animation": GENERIC_SPRITE_ANIMATION,
             "data": {},  # so downstream access is safe
+            "optional": False,  # the fallback sprite is always rendered
         }
     )
     last = sprite_tasks[-1]
@@ -380,108 +602,451 @@ async def write_sprite_to_data(
     # Save the sprite image
     anim_dir = Path(base_dir) / "animations"
     logger.debug("Saving sprite image to %s (filename=%s)", anim_dir, sprite_name)
-    write_image_data(image_bytes, anim_dir, filename=sprite_name)
+    save_r = await write_image_data(image_bytes, anim_dir, filename=sprite_name)
     logger.info("Sprite image saved for %s", sprite_name)
+    return save_r["filepath"]
 
 
-async def create_pokemon_complete(
-    pokemon: Pokemon, pokemon_data: PokemonInput, session: SessionType
+async def persist_sprite(
+    pokemon_id: int,
+    base_dir: str | Path,
+    session: SessionType,
+    sprite,
+    on_progress: Optional[ProgressCallback] = None,
 ):
+    """Write one sprite and announce it as soon as it is on disk."""
+    with stage_timer("sprite_persist"):
+        sprite_path = await write_sprite_to_data(pokemon_id, base_dir, session, sprite)
+    if sprite_path is None:
+        return None
+    await report_progress(
+        on_progress,
+        "sprite",
+        pokemon_id=pokemon_id,
+        id=sprite["id"],
+        name=sprite["name"],
+        path=str(sprite_path),
+        url=format_image_url(sprite_path),
+        data=sprite["data"],
+    )
+    return sprite_path
+
+
+def load_checkpoint(path: Path, model: type[CheckpointModel]) -> CheckpointModel | None:
+    """Read a stage's saved output; a missing or unreadable file means "redo it"."""
+    if not path.exists():
+        return None
     try:
-        logger.info(
-            "Starting create_pokemon_complete for name=%s",
-            getattr(pokemon_data, "name", None),
+        return model.model_validate_json(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError) as e:
+        logger.warning("Ignoring unreadable checkpoint %s: %s", path, e)
+        return None
+
+
+def drop_completed_sprites(sprite_tasks: list, anim_dir: Path) -> list:
+    """Keep only sprite tasks whose PNG is not on disk yet."""
+    pending = []
+    for meta in sprite_tasks:
+        if (anim_dir / f"{meta['name']}.png").exists():
+            logger.debug("Sprite %s already on disk; skipping", meta["name"])
+            meta["task"].close()  # never awaited; close to avoid a warning
+            continue
+        pending.append(meta)
+    return pending
+
+
+def remove_sprite_files(anim_dir: Path, names: set[str]) -> None:
+    """Delete the sprites `names` (image, variants, metadata) from `anim_dir` (blocking)."""
+    for name in names:
+        image = anim_dir / f"{name}.png"
+        blob_store.remove_file(image)
+        blob_store.remove_file(anim_dir / f"{name}.json")
+        image_variants.remove_variants(image)
+
+
+async def get_base_dir(pokemon_id: int, session: SessionType) -> Path:
+    logger.debug("Fetching directory info for pokemon_id=%s", pokemon_id)
+    dir_info = await svc.get_pokemon_directory(pokemon_id, session)
+    if not getattr(dir_info, "paths", None):
+        logger.error("No directory paths for pokemon_id=%s", pokemon_id)
+        raise HTTPException(status_code=500, detail="Directory setup failed.")
+    base_dir = Path(dir_info.paths[0])
+    logger.info("Base directory set to: %s", base_dir)
+    return base_dir
+
+
+async def run_creation_stages(
+    pokemon_id: int,
+    pokemon_data: PokemonData,
+    session: SessionType,
+    on_progress: Optional[ProgressCallback] = None,
+    deadline: Optional[float] = None,
+):
+    """
+    Run every stage after setup, resuming from whatever is already on disk.
+
+    The stages form a DAG (see `pipeline_dag.Dag`) and each one starts as soon
+    as its inputs exist:
+
+        description -> base_image ----------------------+-> sprites
+                    +-> moveset / expressions -> movesets -+
+
+    Movesets wait for the base image unless `settings.MOVESET_FROM_IMAGE` is
+    off, in which case they are drafted from the description concurrently
+    with it. Each stage is retried `settings.PIPELINE_STAGE_RETRIES` times on
+    non-4xx errors, and the run's critical path is logged, exported as a
+    metric and sent with the final "persist" progress event.
+
+    Each stage checkpoints its output inside the Pokémon's folder and is skipped
+    when that output exists: `data/monster_data.json` (description),
+    `base/base.png`, `data/moveset.json` / `data/expressions.json`, and one
+    `animations/<name>.png` per sprite. For a brand-new Pokémon nothing exists,
+    so every stage runs. Sprites planned from a moveset stream that was then
+    retried are checked against the saved moveset and expressions: those no
+    longer in them are cancelled and their files deleted.
+
+    Optional sprites still rendering at `deadline` are dropped (see
+    `SpriteRunner`) so a straggler cannot hold the whole creation. With
+    `settings.SPRITE_DRAFT_QUALITY` set, sprites render at that quality and
+    are re-rendered at full quality in the background (see `sprite_upgrade`)
+    after this returns.
+    """
+    base_dir = await get_base_dir(pokemon_id, session)
+    data_dir = base_dir / "data"
+    anim_dir = base_dir / "animations"
+
+    # Sprites start rendering the moment they are planned (throttled by the
+    # shared image scheduler) and each is persisted as soon as it completes.
+    # Only sprites that are not on disk yet are regenerated.
+    async def persist(sprite):
+        return await persist_sprite(pokemon_id, base_dir, session, sprite, on_progress)
+
+    runner = SpriteRunner(on_complete=persist, deadline=deadline)
+    planned: set[str] = set()
+    reference: Optional[ReferenceImage] = None
+    waiting: list[tuple[str, PokemonMove | PokemonExpression]] = []
+    # With tiering on, sprites render at draft quality first; `animations`
+    # remembers each one's prompt for the background upgrade.
+    quality = draft_quality()
+    animations: dict[str, str] = {}
+
+    def start(metas: list[dict]) -> None:
+        for pending in drop_completed_sprites(metas, anim_dir):
+            animations[pending["name"]] = pending["animation"]
+            runner.add(pending)
+
+    def start_sprite(sprite_id: str, move: PokemonMove | PokemonExpression) -> None:
+        assert reference is not None
+        start([sprite_task(sprite_id, move, reference, quality)])
+
+    def plan(sprite_id: str, move: PokemonMove | PokemonExpression) -> None:
+        """Start a move's sprite once; hold it until the base image exists."""
+        name = normalize_name(move.name)
+        if name in planned:  # a retried moveset stream repeats its moves
+            return
+        planned.add(name)
+        if reference is None:
+            waiting.append((sprite_id, move))
+        else:
+            start_sprite(sprite_id, move)
+
+    async def description():
+        # (no DB held open)
+        better_description = load_checkpoint(
+            data_dir / MonsterConfig.FILES["description"], PokemonData
         )
+        resumed = better_description is not None
+        if better_description is None:
+            with stage_timer("description"):
+                better_description = await generate_enhance_description(
+                    pokemon_id, pokemon_data, session
+                )
+        await report_progress(
+            on_progress, "description", pokemon_id=pokemon_id, resumed=resumed
+        )
+        return better_description
 
-        # 1) Initial setup (DB write is short)
-        pokemon_id, pokemon_data = await basic_pokemon_setup(
-            pokemon, pokemon_data, session
+    async def base_image(description: PokemonData) -> ReferenceImage:
+        nonlocal reference
+        base_filepath = base_dir / "base" / "base.png"
+        base_response = None
+        resumed = base_filepath.exists()
+        if not resumed:
+            with stage_timer("base_image"):
+                base_response, base_filepath = await generate_base_image(
+                    pokemon_id, description, pokemon_data, base_dir
+                )
+        await report_progress(
+            on_progress,
+            "base_image",
+            pokemon_id=pokemon_id,
+            path=str(base_filepath),
+            url=format_image_url(base_filepath),
+            resumed=resumed,
         )
 
-        # 2) Enhanced description (no DB held open)
-        better_description = await generate_enhance_description(
-            pokemon_id, pokemon_data, session
+        # Read and encode base.png once; every moveset and sprite call shares it.
+        # The base-image response id lets chained sprites skip the re-upload.
+        reference = await load_reference_image(
+            base_filepath, response_id=getattr(base_response, "id", None)
         )
+        # The fallback sprite only needs the base image
+        planned.add("generic")
+        start(await parse_generic(prev_response=reference, quality=quality))
+        for sprite_id, move in waiting:  # drafted before the image existed
+            start_sprite(sprite_id, move)
+        waiting.clear()
+        return reference
+
+    # Moves stream in one by one and each sprite is planned as soon as its
+    # move has been generated, overlapping the moveset tail with rendering.
+    async def moveset(
+        description: PokemonData, base_image: Optional[ReferenceImage] = None
+    ) -> PokemonMoveList:
+        saved = load_checkpoint(data_dir / MonsterConfig.FILES["moveset"], PokemonMoveList)
+        if saved is None:
+            with stage_timer("moveset"):
+                saved = await generate_moveset(
+                    pokemon_id,
+                    description,
+                    base_image,
+                    on_move=lambda i, move: plan(f"move_{i}", move),
+                )
+                await svc.write_pokemon_data(
+                    pokemon_id, saved, session, data_type="moveset"
+                )
+        for i, move in enumerate(saved.move_list, start=1):
+            plan(f"move_{i}", move)
+        return saved
 
-        # 3) Paths
-        logger.debug("Fetching directory info for pokemon_id=%s", pokemon_id)
-        dir_info = await svc.get_pokemon_directory(pokemon_id, session)
-        if not getattr(dir_info, "paths", None):
-            logger.error("No directory paths for pokemon_id=%s", pokemon_id)
-            raise HTTPException(status_code=500, detail="Directory setup failed.")
-        base_dir = Path(dir_info.paths[0])
-        logger.info("Base directory set to: %s", base_dir)
-
-        # 4) Base image (no DB held open)
-        base_img_resp, base_filepath = await generate_base_image(
-            pokemon_id, better_description, pokemon_data, base_dir
+    async def expressions(
+        description: PokemonData, base_image: Optional[ReferenceImage] = None
+    ) -> PokemonExpressionSet:
+        saved = load_checkpoint(
+            data_dir / MonsterConfig.FILES["expressions"], PokemonExpressionSet
         )
+        if saved is None:
+            with stage_timer("expressions"):
+                saved = await generate_expressive_moveset(
+                    pokemon_id,
+                    description,
+                    base_image,
+                    on_expression=lambda i, expr: plan(f"expression_{i}", expr),
+                )
+                await svc.write_pokemon_data(
+                    pokemon_id, saved, session, data_type="expressions"
+                )
+        for i, expression in enumerate(saved.expressions, start=1):
+            plan(f"expression_{i}", expression)
+        return saved
 
-        # 5) Moveset + expressive set (run concurrently)
-        gen_tasks = [
-            generate_moveset(pokemon_id, better_description, base_filepath),
-            generate_expressive_moveset(pokemon_id, better_description, base_filepath),
-        ]
-        moveset_raw, expressive_raw = await asyncio.gather(*gen_tasks)
+    async def movesets(moveset: PokemonMoveList, expressions: PokemonExpressionSet):
+        await report_progress(
+            on_progress,
+            "movesets",
+            pokemon_id=pokemon_id,
+            moves=len(moveset.move_list),
+            expressions=len(expressions.expressions),
+        )
 
-        # Proper typing for editors/type checkers
-        moveset = cast(PokemonMoveList, moveset_raw)
-        expressive_moveset = cast(PokemonExpressionSet, expressive_raw)
+    async def sprites(
+        base_image: ReferenceImage,
+        moveset: PokemonMoveList,
+        expressions: PokemonExpressionSet,
+        movesets: None,
+    ) -> list:
+        # A retried stream can plan moves the saved moveset no longer has
+        final = {"generic"}
+        final.update(normalize_name(m.name) for m in moveset.move_list)
+        final.update(normalize_name(e.name) for e in expressions.expressions)
+        orphans = planned - final
+        if orphans:
+            logger.info("Discarding sprites not in the final moveset: %s", sorted(orphans))
+            await runner.discard(orphans)
+            await to_thread.run_sync(remove_sprite_files, anim_dir, orphans)
+            planned.difference_update(orphans)
+        logger.debug("Awaiting %d sprite tasks…", len(runner))
+        with stage_timer("sprites"):
+            return await runner.results()
 
-        # 6) Parse to sprite jobs (run concurrently; tolerate partial failures)
-        parse_tasks = [
-            parse_moveset(moveset=moveset, prev_response=base_filepath),
-            parse_expression(
-                expressive=expressive_moveset, prev_response=base_filepath
+    retries = settings.PIPELINE_STAGE_RETRIES
+    moveset_deps = (
+        ("description", "base_image")
+        if settings.MOVESET_FROM_IMAGE
+        else ("description",)
+    )
+    dag = Dag(
+        [
+            Node("description", description, retries=retries),
+            Node("base_image", base_image, ("description",), retries=retries),
+            Node("moveset", moveset, moveset_deps, retries=retries),
+            Node("expressions", expressions, moveset_deps, retries=retries),
+            Node("movesets", movesets, ("moveset", "expressions")),
+            Node(
+                "sprites",
+                sprites,
+                ("base_image", "moveset", "expressions", "movesets"),
             ),
-            parse_generic(prev_response=base_filepath),
         ]
-        parse_results = await asyncio.gather(*parse_tasks, return_exceptions=True)
-
-        sprite_tasks: list = []
-        for i, r in enumerate(parse_results):
-            if isinstance(r, Exception):
-                logger.exception("Parse task %d failed: %s", i, r)
-                continue
-            if not isinstance(r, list):
-                logger.exception("Parse task %d failed: %s", i, r)
-            sprite_tasks.extend(r)  # type: ignore
-
-        if not sprite_tasks:
-            logger.warning("No sprite tasks generated for pokemon_id=%s", pokemon_id)
-
-        # 7) Run sprite tasks (consider internal throttling/semaphore)
-        logger.debug("Running %d sprite tasks concurrently…", len(sprite_tasks))
-        completed_sprites = await run_sprite_tasks(sprite_tasks)
-
-        errors = sum(
-            1 for s in completed_sprites if isinstance(s, dict) and s.get("error")
+    )
+    try:
+        run = await dag.run()
+    except BaseException:
+        await runner.cancel()
+        raise
+    completed_sprites = run.outputs["sprites"]
+    critical_path = run.critical_path(dag)
+    logger.info(
+        "Critical path for pokemon_id=%s: %s",
+        pokemon_id,
+        " -> ".join(f"{step['stage']} ({step['seconds']}s)" for step in critical_path),
+    )
+
+    dropped = sum(1 for s in completed_sprites if s.get("dropped"))
+    errors = sum(1 for s in completed_sprites if s.get("error")) - dropped
+    for sprite in completed_sprites:
+        SPRITES_TOTAL.labels(
+            "dropped"
+            if sprite.get("dropped")
+            else "error"
+            if sprite.get("error")
+            else "persist_error" if sprite.get("persist_error") else "ok"
+        ).inc()
+    logger.info(
+        "Sprite tasks completed: %d (errors=%d, dropped=%d)",
+        len(completed_sprites),
+        errors,
+        dropped,
+    )
+    await report_progress(
+        on_progress,
+        "sprites",
+        pokemon_id=pokemon_id,
+        total=len(completed_sprites),
+        errors=errors,
+        dropped=dropped,
+        skipped=len(planned) - len(completed_sprites),
+    )
+
+    # One image with every sprite, for cards that would otherwise load each sheet
+    atlas = await sprite_atlas.refresh_atlas(base_dir)
+
+    # Re-render this run's drafts at full quality after the response is out
+    drafts = [
+        {"name": s["name"], "animation": animations[s["name"]]}
+        for s in completed_sprites
+        if s.get("persisted")
+    ]
+    if quality and drafts:
+        schedule_sprite_upgrade(
+            pokemon_id,
+            run.outputs["base_image"],
+            anim_dir,
+            drafts,
+            bind=session.get_bind(),
         )
-        logger.info(
-            "Sprite tasks completed: %d (errors=%d)", len(completed_sprites), errors
+
+    # Do not fail whole request for partial persist errors; adjust policy if needed.
+    write_errors = [s for s in completed_sprites if s.get("persist_error")]
+    await report_progress(
+        on_progress,
+        "persist",
+        pokemon_id=pokemon_id,
+        errors=len(write_errors),
+        critical_path=critical_path,
+        draft_quality=quality,
+        upgrading=len(drafts) if quality else 0,
+        atlas=atlas["version"] if atlas else None,
+    )
+
+    # 8) Final response (fetch latest from DB)
+    logger.info("Pokemon creation complete for id=%s", pokemon_id)
+    created = pokemon_crud.get_pokemon_by_id(pokemon_id, session)  # type: ignore
+    return PokemonResponse(
+        status=status.HTTP_200_OK,
+        detail="Pokemon Created Successfully",
+        pokemon=created,
+    )
+
+
+async def create_pokemon_complete(
+    pokemon: Pokemon,
+    pokemon_data: PokemonInput,
+    session: SessionType,
+    on_progress: Optional[ProgressCallback] = None,
+):
+    """
+    Create a Pokémon end to end.
+
+    Concurrent calls with the same normalized input (a double-clicked Create,
+    a client retry) share one creation: only the first call's `pokemon` row is
+    used, every caller receives the same result or error, and each caller's
+    `on_progress` sees every stage event.
+    """
+    key = creation_key(pokemon_data)
+    if key is None:  # let the pipeline raise its usual validation error
+        return await _create_pokemon_complete(
+            pokemon, pokemon_data, session, on_progress
         )
 
-        # 8) Persist sprites (short DB writes; tolerate partial failures)
-        write_tasks = [
-            write_sprite_to_data(pokemon_id, base_dir, session, sprite)
-            for sprite in completed_sprites
-        ]
-        write_results = await asyncio.gather(*write_tasks, return_exceptions=True)
-        write_errors = [e for e in write_results if isinstance(e, Exception)]
-        if write_errors:
-            for e in write_errors:
-                logger.exception("Sprite persist error: %s", e)
-            # Do not fail whole request for partial persist errors; adjust policy if needed.
-
-        # 9) Final response (fetch latest from DB)
-        logger.info("Pokemon creation complete for id=%s", pokemon_id)
-        created = pokemon_crud.get_pokemon_by_id(pokemon_id, session)  # type: ignore
-        return PokemonResponse(
-            status=status.HTTP_200_OK,
-            detail="Pokemon Created Successfully",
-            pokemon=created,
+    if key in creation_flight:
+        # A finished flight may linger for one loop tick after its progress entry
+        progress = _creation_progress.get(key) or ProgressFanout()
+    else:
+        progress = _creation_progress[key] = ProgressFanout()
+
+    async def create():
+        try:
+            return await _create_pokemon_complete(
+                pokemon, pokemon_data, session, progress
+            )
+        finally:
+            if _creation_progress.get(key) is progress:
+                del _creation_progress[key]
+
+    unsubscribe = progress.subscribe(on_progress) if on_progress else None
+    try:
+        return await creation_flight.do(key, create)
+    finally:
+        if unsubscribe is not None:
+            await unsubscribe()
+
+
+async def _create_pokemon_complete(
+    pokemon: Pokemon,
+    pokemon_data: PokemonInput,
+    session: SessionType,
+    on_progress: Optional[ProgressCallback] = None,
+):
+    ledger = UsageLedger()
+    pokemon_id = None
+    try:
+        logger.info(
+            "Starting create_pokemon_complete for name=%s",
+            getattr(pokemon_data, "name", None),
         )
 
+        deadline = pipeline_deadline()
+        with (
+            track_usage(ledger),
+            PIPELINES_IN_FLIGHT.track_inprogress(),
+            stage_timer("total"),
+        ):
+            # 1) Initial setup (DB write is short)
+            with stage_timer("setup"):
+                pokemon_id, pokemon_data = await basic_pokemon_setup(
+                    pokemon, pokemon_data, session
+                )
+            await report_progress(on_progress, "setup", pokemon_id=pokemon_id)
+
+            return await run_creation_stages(
+                pokemon_id,
+                cast(PokemonData, pokemon_data),
+                session,
+                on_progress,
+                deadline=deadline,
+            )
+
     except HTTPException:
         logger.exception("HTTPException during create_pokemon_complete")
         raise
@@ -491,3 +1056,106 @@ async def create_pokemon_complete(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Internal error while creating Pokémon.",  # keep generic
         )
+    finally:
+        save_usage(ledger, pokemon_id, session)
+
+
+async def create_pokemon_from_setup(
+    pokemon_id: int,
+    pokemon_data: PokemonData,
+    session: SessionType,
+    on_progress: Optional[ProgressCallback] = None,
+):
+    """
+    `run_creation_stages` for a Pokémon whose setup is already done (see
+    `pokemon_batch`), with the bookkeeping of `create_pokemon_complete`.
+
+    Usage is saved to the ledger, the run counts in the in-flight gauge and
+    is bounded by the pipeline deadline, and it is registered in
+    `creation_flight` (under its own id, so it never coalesces with another
+    creation) so the egg pool yields to it.
+    """
+
+    async def create():
+        ledger = UsageLedger()
+        try:
+            with (
+                track_usage(ledger),
+                PIPELINES_IN_FLIGHT.track_inprogress(),
+                stage_timer("total"),
+            ):
+                return await run_creation_stages(
+                    pokemon_id,
+                    pokemon_data,
+                    session,
+                    on_progress,
+                    deadline=pipeline_deadline(),
+                )
+        finally:
+            save_usage(ledger, pokemon_id, session)
+
+    return await creation_flight.do(("pokemon", pokemon_id), create)
+
+
+async def resume_pokemon_creation(
+    pokemon_id: int,
+    session: SessionType,
+    on_progress: Optional[ProgressCallback] = None,
+):
+    """
+    Finish a Pokémon whose creation stopped part-way.
+
+    Reuses the existing row and folder and picks up from the last checkpoint
+    written by `run_creation_stages`; only missing sprites are regenerated.
+
+    Raises:
+        HTTPException 404: If the Pokémon does not exist.
+        HTTPException 409: If its `data_user.json` was never written, so there
+            is no input to resume from.
+    """
+    ledger = UsageLedger()
+    try:
+        logger.info("Resuming creation for pokemon_id=%s", pokemon_id)
+        pokemon = pokemon_crud.get_pokemon_by_id(pokemon_id, session)
+        if not pokemon.image_directory:
+            await svc.set_pokemon_directory(pokemon_id, session)
+        await svc.add_required_folders_pokemon(pokemon_id, session)
+
+        base_dir = await get_base_dir(pokemon_id, session)
+        pokemon_data = load_checkpoint(
+            base_dir / "data" / MonsterConfig.FILES["base_data"], PokemonData
+        )
+        if pokemon_data is None:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="No saved input data to resume from.",
+            )
+        await report_progress(
+            on_progress, "setup", pokemon_id=pokemon_id, resumed=True
+        )
+
+        with (
+            track_usage(ledger),
+            PIPELINES_IN_FLIGHT.track_inprogress(),
+            stage_timer("resume_total"),
+        ):
+            return await run_creation_stages(
+                pokemon_id,
+                pokemon_data,
+                session,
+                on_progress,
+                deadline=pipeline_deadline(),
+            )
+
+    except HTTPException:
+        logger.exception("HTTPException during resume_pokemon_creation")
+        raise
+    except Exception as e:
+        logger.exception("Unhandled exception during resume_pokemon_creation: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal error while resuming Pokémon.",
+        )
+    finally:
+        if ledger.calls or ledger.stage_seconds:
+            save_usage(ledger, pokemon_id, session)
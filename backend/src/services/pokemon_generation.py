@@ -1,16 +1,31 @@
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import Any, Callable, List, Optional
 from .prompts import *
-from src.services.ai_services import client, multimodal_generation, generate_image
+from src.services.ai_provider import get_client, get_provider
+import asyncio
+from collections import defaultdict
+from src.services.ai_services import (
+    TEXT_MODEL,
+    multimodal_generation,
+    multimodal_generation_async,
+    stream_list_generation_async,
+    generate_image,
+    generate_image_async,
+    text_generation_async,
+)
+from src.core import settings
+from src.services.hedging import LatencyTracker, hedged
+from src.services.metrics import PROVIDER_REQUEST_BYTES, observe_call
+from src.services.scheduler import image_scheduler
+from src.services.singleflight import provider_flight
+from src.utils.image_utils import ReferenceImage
 from src.utils.pokemon_utils import normalize_input, format_prompt
 from src.models import PokemonInput, PokemonData  # ← import the ONE copy
 from typing import Literal
-from openai import AsyncOpenAI
 from dotenv import load_dotenv
 import base64
 
 load_dotenv()
-async_client = AsyncOpenAI()
 
 
 class PokemonDescription(BaseModel):
@@ -28,7 +43,7 @@ def generate_pokemon_description(
     d = normalize_input(data)
     prompt = format_prompt(description_prompt_template, d)
 
-    completion = client.chat.completions.parse(
+    completion = get_client().chat.completions.parse(
         model="gpt-5",
         messages=[{"role": "user", "content": prompt}],
         response_format=PokemonDescription,
@@ -36,6 +51,16 @@ def generate_pokemon_description(
     return completion.choices[0].message.content
 
 
+async def generate_pokemon_description_async(
+    data: PokemonInput,
+    *,
+    description_prompt_template: str,
+):
+    d = normalize_input(data)
+    prompt = format_prompt(description_prompt_template, d)
+    return await text_generation_async(prompt, PokemonDescription)
+
+
 class PokemonMove(BaseModel):
     name: str
     attack_type: str
@@ -108,7 +133,7 @@ def generate_moveset(
         )
     else:
         # text-only fallback (if you have a text completion route)
-        completion = client.chat.completions.parse(
+        completion = get_client().chat.completions.parse(
             model="gpt-5",
             messages=[{"role": "user", "content": prompt}],
             response_format=PokemonMoveList,
@@ -116,6 +141,32 @@ def generate_moveset(
         return completion.choices[0].message.content
 
 
+async def generate_moveset_async(
+    data: PokemonInput,
+    moveset_prompt_template: str,
+    image: Optional[ReferenceImage] = None,
+    on_move: Optional[Callable[[Any], None]] = None,
+):
+    """
+    Awaitable `generate_moveset`; multimodal when a reference image is given.
+    `on_move` receives each raw move dict as soon as it has been generated.
+    """
+    d = normalize_input(data)
+    prompt = format_prompt(moveset_prompt_template, d)
+
+    if on_move is not None:
+        return await stream_list_generation_async(
+            prompt, PokemonMoveList, "move_list", on_move, image=image
+        )
+    if image:
+        return await multimodal_generation_async(
+            prompt=prompt,
+            image=image,
+            response_model=PokemonMoveList,
+        )
+    return await text_generation_async(prompt, PokemonMoveList)
+
+
 def generate_cute_moveset(
     data: PokemonInput,
     cute_prompt_template: str,
@@ -134,7 +185,7 @@ def generate_cute_moveset(
             response_model=PokemonExpressionSet,
         )
     else:
-        completion = client.chat.completions.parse(
+        completion = get_client().chat.completions.parse(
             model="gpt-5",
             messages=[{"role": "user", "content": prompt}],
             response_format=PokemonExpressionSet,
@@ -142,59 +193,162 @@ def generate_cute_moveset(
         return completion.choices[0].message.content
 
 
-def generate_pokemon_base_image(
-    image_description: str, better_description: str, user_input: PokemonInput
+async def generate_cute_moveset_async(
+    data: PokemonInput,
+    cute_prompt_template: str,
+    image: Optional[ReferenceImage] = None,
+    on_expression: Optional[Callable[[Any], None]] = None,
 ):
-    # format the first part of the prompt
+    """Awaitable `generate_cute_moveset`; `on_expression` as `on_move` above."""
+    d = normalize_input(data)
+    prompt = format_prompt(cute_prompt_template, d)
+
+    if on_expression is not None:
+        return await stream_list_generation_async(
+            prompt, PokemonExpressionSet, "expressions", on_expression, image=image
+        )
+    if image:
+        return await multimodal_generation_async(
+            prompt=prompt,
+            image=image,
+            response_model=PokemonExpressionSet,
+        )
+    return await text_generation_async(prompt, PokemonExpressionSet)
+
+
+def format_base_image_prompt(
+    image_description: str, better_description: str, user_input: PokemonInput
+) -> str:
     d = normalize_input(user_input)
-    prompt = pokemon_image_generation_prompt.format(
+    return pokemon_image_generation_prompt.format(
         name=d.name,
         new_description=better_description,
         image_description=image_description,
         ptype=d.ptype,
     )
+
+
+def generate_pokemon_base_image(
+    image_description: str, better_description: str, user_input: PokemonInput
+):
+    prompt = format_base_image_prompt(image_description, better_description, user_input)
     return generate_image(prompt, transparent=False)
 
 
-async def fwp_image_generation(response, prompt, transparent: bool = False):
-    result = await async_client.images.edit(
-        model="gpt-image-1",
-        image=[open(response, "rb")],
-        prompt=prompt,
-        background="opaque",
-        size="1024x1024",
-        quality="high",
+async def generate_pokemon_base_image_async(
+    image_description: str, better_description: str, user_input: PokemonInput
+):
+    prompt = format_base_image_prompt(image_description, better_description, user_input)
+    return await generate_image_async(prompt, transparent=False)
+
+
+SpriteGenerationMode = Literal["edit", "chained"]
+
+# Recent sprite latencies per call kind; the hedge threshold is read from these
+sprite_latency: defaultdict[str, LatencyTracker] = defaultdict(LatencyTracker)
+
+
+async def sprite_request(
+    model: str, call: str, request, request_bytes: int, key: tuple
+):
+    """
+    Run one sprite request through the image scheduler.
+
+    Each attempt is bounded by `settings.SPRITE_TIMEOUT_SECONDS` and, once
+    enough samples exist, hedged past the `SPRITE_HEDGE_PERCENTILE` latency of
+    earlier `call` requests. The hedge takes its own scheduler slot and
+    rate-limit token, so it counts against `IMAGE_MAX_CONCURRENCY`.
+    `request_bytes` is counted for every request actually sent. Concurrent
+    requests with the same `key` (rendered prompt and reference) share one.
+    """
+    tracker = sprite_latency[call]
+
+    def attempt():
+        PROVIDER_REQUEST_BYTES.labels(call).inc(request_bytes)
+        return observe_call(call, model, request())
+
+    async def guarded():
+        pct = settings.SPRITE_HEDGE_PERCENTILE
+        async with asyncio.timeout(settings.SPRITE_TIMEOUT_SECONDS):
+            return await hedged(
+                attempt,
+                tracker.percentile(pct) if pct else None,
+                hedge_slot=lambda: image_scheduler.slot(model),
+                tracker=tracker,
+            )
+
+    return await provider_flight.do(
+        (call, model, *key), lambda: image_scheduler.run(model, guarded)
+    )
+
+
+async def fwp_image_generation(
+    reference: ReferenceImage,
+    prompt,
+    transparent: bool = False,
+    mode: Optional[SpriteGenerationMode] = None,
+    quality: Optional[str] = None,
+):
+    """
+    Generate one image that follows up on `reference`.
+
+    In "chained" mode (see `settings.SPRITE_GENERATION_MODE`) the request
+    continues the response that produced the reference via
+    `previous_response_id`, so only the prompt is sent. "edit" mode, and any
+    reference without a `response_id` (e.g. a base image loaded on resume),
+    uploads the reference image with the prompt. `quality` defaults to
+    `settings.SPRITE_QUALITY`.
+    """
+    mode = mode or settings.SPRITE_GENERATION_MODE
+    quality = quality or settings.SPRITE_QUALITY
+    if mode == "chained" and reference.response_id:
+        result, images = await sprite_request(
+            TEXT_MODEL,
+            "generate_image_chained",
+            lambda: get_provider().generate_image(
+                model=TEXT_MODEL,
+                prompt=prompt,
+                transparent=transparent,
+                previous_response_id=reference.response_id,
+                quality=quality,
+            ),
+            request_bytes=len(prompt.encode("utf-8")),
+            key=(prompt, transparent, quality, reference.response_id),
+        )
+        return (result, images[:1])
+
+    # Every sprite edit goes through the shared scheduler so concurrent
+    # pipelines stay under the provider's rate limit. The reference image is
+    # loaded once per run and shared by all of its sprites.
+    result, images = await sprite_request(
+        "gpt-image-1",
+        "edit_image",
+        lambda: get_provider().edit_image(
+            model="gpt-image-1",
+            image=reference,
+            prompt=prompt,
+            background="opaque",
+            size="1024x1024",
+            quality=quality,
+        ),
+        request_bytes=len(reference.data) + len(prompt.encode("utf-8")),
+        key=(prompt, quality, reference.digest),
     )
-    if not result or not result.data:
-        raise ValueError("Image generation failed, no data returned.")
-    image_base64 = result.data[0].b64_json
-    if not image_base64:
-        raise ValueError("Image generation failed, no data returned.")
-
-    # response_fwup = await async_client.responses.create(
-    #     model="gpt-5",
-    #     previous_response_id=response.id,
-    #     input=prompt,
-    #     tools=[
-    #         {
-    #             "type": "image_generation",
-    #             "background": "transparent" if transparent else "opaque",
-    #             "size": "1024x1024",
-    #             "quality": "high",
-    #         }
-    #     ],
-    # )
-    # image_data = [
-    #     output.result
-    #     for output in response_fwup.output
-    #     if output.type == "image_generation_call"
-    # ]
-    return (result, [image_base64])
-
-
-async def fwp_image_generation_sprite(response, animation: str, transparent=False):
+
+    return (result, images[:1])
+
+
+async def fwp_image_generation_sprite(
+    reference: ReferenceImage,
+    animation: str,
+    transparent=False,
+    mode: Optional[SpriteGenerationMode] = None,
+    quality: Optional[str] = None,
+):
     prompt = pokemon_sprite_base.format(animation=animation)
-    return await fwp_image_generation(response, prompt, transparent=transparent)
+    return await fwp_image_generation(
+        reference, prompt, transparent=transparent, mode=mode, quality=quality
+    )
 
 
 if __name__ == "__main__":
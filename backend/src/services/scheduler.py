@@ -0,0 +1,242 @@
+# Standard library
+import asyncio
+import logging
+import random
+import time
+from collections import defaultdict
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Any, Awaitable, Callable, TypeVar
+
+# Local application
+from src.core import settings
+from src.services.metrics import SCHEDULER_WAIT_SECONDS
+
+logger = logging.getLogger("pokemon.scheduler")
+
+T = TypeVar("T")
+
+RATE_LIMIT_STATUS = 429
+
+
+class TokenBucket:
+    """
+    Per-model request budget that refills continuously.
+
+    The refill rate adapts: a 429 halves it (down to `min_rate`) and empties the
+    bucket until the provider's Retry-After has passed; every success nudges it
+    back toward the configured rate.
+    """
+
+    def __init__(self, rate_per_minute: float, burst: float | None = None):
+        self.max_rate = rate_per_minute / 60.0
+        self.min_rate = self.max_rate / 8
+        self.rate = self.max_rate
+        self.capacity = burst if burst is not None else max(1.0, self.max_rate)
+        self.tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now: float) -> None:
+        elapsed = max(0.0, now - self._updated)
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+        self._updated = max(self._updated, now)
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = max(self._updated - now, (1 - self.tokens) / self.rate)
+                await asyncio.sleep(wait)
+
+    def throttle(self, delay: float) -> None:
+        """Back off after a 429: drain the bucket and pause refills for `delay`s."""
+        self.rate = max(self.min_rate, self.rate / 2)
+        self.tokens = 0.0
+        self._updated = max(self._updated, time.monotonic() + delay)
+
+    def recover(self) -> None:
+        self.rate = min(self.max_rate, self.rate + self.max_rate / 10)
+
+
+def retry_after_seconds(error: BaseException) -> float | None:
+    """Read Retry-After (or retry-after-ms) from a provider error, if present."""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    try:
+        if headers.get("retry-after-ms") is not None:
+            return float(headers["retry-after-ms"]) / 1000
+        if headers.get("retry-after") is not None:
+            return float(headers["retry-after"])
+    except (TypeError, ValueError):
+        return None
+    return None
+
+
+def is_rate_limited(error: BaseException) -> bool:
+    return getattr(error, "status_code", None) == RATE_LIMIT_STATUS
+
+
+class ProviderScheduler:
+    """
+    Process-wide gate in front of provider calls.
+
+    Every call waits for a concurrency slot and then a token from its model's
+    bucket. Rate-limited calls are retried with Retry-After or exponential
+    backoff, so bursts from concurrent pipelines queue here instead of failing.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        rate_per_minute: float,
+        max_retries: int = 4,
+        base_backoff: float = 1.0,
+        rate_limits: dict[str, float] | None = None,
+        name: str = "default",
+    ):
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.rate_per_minute = rate_per_minute
+        self.max_retries = max_retries
+        self.base_backoff = base_backoff
+        self.rate_limits = rate_limits or {}
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._buckets: dict[str, TokenBucket] = {}
+        self.queued = 0
+        self.in_flight = 0
+        self.counters: dict[str, dict[str, int]] = defaultdict(
+            lambda: {"completed": 0, "failed": 0, "rate_limited": 0}
+        )
+
+    def configure(
+        self,
+        max_concurrency: int | None = None,
+        rate_per_minute: float | None = None,
+        base_backoff: float | None = None,
+    ) -> None:
+        """Change limits and reset the gate, buckets and counters (call while idle)."""
+        if max_concurrency is not None:
+            self.max_concurrency = max_concurrency
+        if rate_per_minute is not None:
+            self.rate_per_minute = rate_per_minute
+        if base_backoff is not None:
+            self.base_backoff = base_backoff
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._buckets.clear()
+        self.counters.clear()
+        self.queued = 0
+        self.in_flight = 0
+
+    def bucket(self, model: str) -> TokenBucket:
+        if model not in self._buckets:
+            self._buckets[model] = TokenBucket(
+                self.rate_limits.get(model, self.rate_per_minute)
+            )
+        return self._buckets[model]
+
+    def _backoff(self, attempt: int, error: BaseException) -> float:
+        delay = retry_after_seconds(error)
+        if delay is None:
+            delay = self.base_backoff * (2**attempt)
+        return delay + random.uniform(0, self.base_backoff / 2)
+
+    @asynccontextmanager
+    async def _admitted(self, model: str) -> AsyncIterator[None]:
+        """Hold a concurrency slot, counted in `queued` until then and `in_flight` after."""
+        self.queued += 1
+        admitted = False
+        queued_at = time.perf_counter()
+        try:
+            async with self._semaphore:
+                self.queued -= 1
+                admitted = True
+                SCHEDULER_WAIT_SECONDS.labels(self.name, model).observe(
+                    time.perf_counter() - queued_at
+                )
+                self.in_flight += 1
+                try:
+                    yield
+                finally:
+                    self.in_flight -= 1
+        finally:
+            if not admitted:
+                self.queued -= 1
+
+    @asynccontextmanager
+    async def slot(self, model: str) -> AsyncIterator[None]:
+        """
+        Hold a concurrency slot and one of `model`'s rate tokens for a single
+        request issued outside `run`, e.g. a hedged duplicate. No retries.
+        """
+        async with self._admitted(model):
+            await self.bucket(model).acquire()
+            yield
+
+    async def run(self, model: str, call: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run `call` under the concurrency cap and `model`'s rate limit.
+
+        `call` is a zero-argument factory so a fresh request can be issued on
+        each retry. Non-429 errors propagate unchanged.
+        """
+        bucket = self.bucket(model)
+        counters = self.counters[model]
+        async with self._admitted(model):
+            attempt = 0
+            while True:
+                await bucket.acquire()
+                try:
+                    result = await call()
+                except Exception as e:
+                    if not is_rate_limited(e) or attempt >= self.max_retries:
+                        counters["failed"] += 1
+                        raise
+                    counters["rate_limited"] += 1
+                    delay = self._backoff(attempt, e)
+                    logger.warning(
+                        "Rate limited on model=%s (attempt %d), retrying in %.1fs",
+                        model,
+                        attempt + 1,
+                        delay,
+                    )
+                    bucket.throttle(delay)
+                    attempt += 1
+                    continue
+                bucket.recover()
+                counters["completed"] += 1
+                return result
+
+    def metrics(self) -> dict[str, Any]:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "queue_depth": self.queued,
+            "in_flight": self.in_flight,
+            "models": {
+                model: {
+                    **self.counters[model],
+                    "rate_per_minute": round(bucket.rate * 60, 2),
+                    "tokens": round(bucket.tokens, 2),
+                }
+                for model, bucket in self._buckets.items()
+            },
+        }
+
+
+# Shared by every pipeline in the process
+image_scheduler = ProviderScheduler(
+    max_concurrency=settings.IMAGE_MAX_CONCURRENCY,
+    rate_per_minute=settings.IMAGE_REQUESTS_PER_MINUTE,
+    max_retries=settings.IMAGE_MAX_RETRIES,
+    name="image",
+)
+text_scheduler = ProviderScheduler(
+    max_concurrency=settings.TEXT_MAX_CONCURRENCY,
+    rate_per_minute=settings.TEXT_REQUESTS_PER_MINUTE,
+    max_retries=settings.TEXT_MAX_RETRIES,
+    name="text",
+)
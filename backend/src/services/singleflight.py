@@ -0,0 +1,72 @@
+# Standard library
+import asyncio
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Hashable, TypeVar
+
+# Local application
+from src.services.metrics import SINGLEFLIGHT_COALESCED_TOTAL
+
+T = TypeVar("T")
+
+
+@dataclass
+class _Flight:
+    task: asyncio.Task
+    waiters: int = 0
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls that share a key into one in-flight computation.
+
+    The first caller for a key starts `fn()` as a task; callers arriving while
+    it runs await the same task and receive the same result or exception.
+    Nothing is cached: once the task finishes the next call starts afresh. A
+    caller that is cancelled only stops waiting; the shared task is cancelled
+    when its last waiter goes away.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._flights: dict[Hashable, _Flight] = {}
+
+    def __len__(self) -> int:
+        return len(self._flights)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._flights
+
+    def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+        flight = self._flights.get(key)
+        if flight is not None and flight.task is task:
+            del self._flights[key]
+        if not task.cancelled():
+            task.exception()  # retrieved by the waiters; silence the warning
+
+    async def settle(self, key: Hashable) -> None:
+        """Wait until the flight for `key`, if any, has finished; its outcome is ignored."""
+        flight = self._flights.get(key)
+        if flight is not None:
+            await asyncio.wait([flight.task])
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        flight = self._flights.get(key)
+        if flight is None:
+            task = asyncio.ensure_future(fn())
+            flight = self._flights[key] = _Flight(task)
+            task.add_done_callback(lambda t: self._forget(key, t))
+        else:
+            SINGLEFLIGHT_COALESCED_TOTAL.labels(self.name).inc()
+
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                flight.task.cancel()
+
+
+# Shared by every pipeline in the process
+creation_flight = SingleFlight("creation")
+provider_flight = SingleFlight("provider")
@@ -0,0 +1,243 @@
+"""
+Per-monster sprite atlas: every animation sheet packed into one image.
+
+A monster card otherwise loads each `animations/*.png` separately. The atlas
+puts them on a grid of `settings.SPRITE_ATLAS_CELL` px cells in
+`atlas/atlas.<version>.png`, next to an `atlas/atlas.json` manifest:
+
+    {
+      "version": "3f9c0a1b2d4e",
+      "image": "atlas.3f9c0a1b2d4e.png",
+      "cell": 256, "columns": 4, "rows": 3, "width": 1024, "height": 768,
+      "frame_grid": [2, 2],
+      "sprites": {"tackle": {"slot": 0, "x": 0, "y": 0, "w": 256, "h": 256,
+                             "source": [size, mtime_ns]}, ...}
+    }
+
+The versioned file name changes whenever the atlas content does, so the
+image can be cached forever. Rebuilds are incremental: a sprite keeps its
+slot, and cells whose source file is unchanged are copied from the previous
+atlas instead of decoding and resizing the 1024px sheet again. Needs Pillow;
+without it no atlas is built and clients keep loading sheets one by one.
+"""
+
+# Standard library
+import asyncio
+import hashlib
+import json
+import logging
+import math
+import os
+import tempfile
+from itertools import count
+from pathlib import Path
+from typing import Optional
+
+# Third-party
+from fastapi import HTTPException
+from starlette import status
+
+# Local application
+from src.core import settings
+from src.database.db import SessionType
+from src.services import pokemon_folder_service as folder_service
+from src.services.metrics import stage_timer
+from src.utils import image_variants
+from src.utils.pokemon_utils import format_image_url
+
+try:
+    from PIL import Image
+except ImportError:  # pragma: no cover - depends on the environment
+    Image = None
+
+logger = logging.getLogger("pokemon.atlas")
+
+ATLAS_DIR = "atlas"
+MANIFEST = "atlas.json"
+FRAME_GRID = (2, 2)  # frames per sprite sheet (columns, rows), as drawn by the frontend
+
+# One rebuild at a time per monster folder
+_locks: dict[Path, asyncio.Lock] = {}
+
+
+def read_manifest(monster_dir: str | Path) -> Optional[dict]:
+    path = Path(monster_dir) / ATLAS_DIR / MANIFEST
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def _write_atomic(target: Path, write) -> None:
+    tmp_path = None
+    try:
+        with tempfile.NamedTemporaryFile(
+            dir=target.parent, prefix=f".{target.name}.", suffix=".tmp", delete=False
+        ) as f:
+            tmp_path = Path(f.name)
+            write(f)
+        os.replace(tmp_path, target)
+    except Exception:
+        if tmp_path is not None:
+            tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def _source_stats(sources: dict[str, Path]) -> dict[str, list[int]]:
+    stats = {}
+    for name, path in sources.items():
+        st = path.stat()
+        stats[name] = [st.st_size, st.st_mtime_ns]
+    return stats
+
+
+def _assign_slots(names: list[str], previous: dict) -> dict[str, int]:
+    """Surviving sprites keep their slot; new ones fill the lowest free slots."""
+    slots = {n: previous[n]["slot"] for n in names if n in previous}
+    free = (i for i in count() if i not in set(slots.values()))
+    for name in names:
+        if name not in slots:
+            slots[name] = next(free)
+    return slots
+
+
+def warn_if_unavailable() -> bool:
+    """Log once (at startup) when Pillow is missing; returns whether atlases are on."""
+    if Image is None:
+        logger.warning(
+            "Pillow is not installed; sprite atlases are disabled and /atlas "
+            "answers 404 (install the 'images' extra)"
+        )
+        return False
+    return True
+
+
+def build_atlas(monster_dir: str | Path) -> Optional[dict]:
+    """
+    Bring the atlas of `monster_dir` up to date (blocking) and return its manifest.
+
+    Returns the existing manifest untouched when no sprite changed, and None
+    when there are no sprites or Pillow is missing.
+    """
+    monster_dir = Path(monster_dir)
+    sources = {p.stem: p for p in sorted((monster_dir / "animations").glob("*.png"))}
+    if Image is None or not sources:
+        return None
+
+    cell = settings.SPRITE_ATLAS_CELL
+    stats = _source_stats(sources)
+    old = read_manifest(monster_dir)
+    if old is not None and old.get("cell") != cell:
+        old = None  # cell size changed; nothing can be reused
+    old_sprites = old["sprites"] if old else {}
+    if old and {n: s["source"] for n, s in old_sprites.items()} == stats:
+        return old
+
+    slots = _assign_slots(list(sources), old_sprites)
+    columns = max(1, math.ceil(math.sqrt(max(slots.values()) + 1)))
+    rows = max(slots.values()) // columns + 1
+    atlas = Image.new("RGBA", (columns * cell, rows * cell), (0, 0, 0, 0))
+
+    out_dir = monster_dir / ATLAS_DIR
+    previous = None
+    if old and (out_dir / old["image"]).exists():
+        previous = Image.open(out_dir / old["image"])
+
+    sprites, reused = {}, 0
+    try:
+        for name, path in sources.items():
+            x, y = slots[name] % columns * cell, slots[name] // columns * cell
+            before = old_sprites.get(name)
+            if previous is not None and before and before["source"] == stats[name]:
+                box = (before["x"], before["y"], before["x"] + cell, before["y"] + cell)
+                atlas.paste(previous.crop(box), (x, y))
+                reused += 1
+            else:
+                with Image.open(path) as sheet:
+                    atlas.paste(
+                        sheet.convert("RGBA").resize((cell, cell), Image.Resampling.LANCZOS),
+                        (x, y),
+                    )
+            sprites[name] = {
+                "slot": slots[name], "x": x, "y": y, "w": cell, "h": cell,
+                "source": stats[name],
+            }
+    finally:
+        if previous is not None:
+            previous.close()
+
+    version = hashlib.sha256(
+        json.dumps([cell, columns, sprites], sort_keys=True).encode("utf-8")
+    ).hexdigest()[:12]
+    manifest = {
+        "version": version,
+        "image": f"atlas.{version}.png",
+        "cell": cell,
+        "columns": columns,
+        "rows": rows,
+        "width": atlas.width,
+        "height": atlas.height,
+        "frame_grid": list(FRAME_GRID),
+        "sprites": sprites,
+    }
+
+    out_dir.mkdir(exist_ok=True)
+    image_path = out_dir / manifest["image"]
+    _write_atomic(image_path, lambda f: atlas.save(f, format="PNG", optimize=True))
+    try:
+        image_variants.build_variants(image_path)
+    except Exception as e:
+        logger.warning("Could not build variants of %s: %s", image_path, e)
+    _write_atomic(
+        out_dir / MANIFEST,
+        lambda f: f.write(json.dumps(manifest, indent=2).encode("utf-8")),
+    )
+
+    # Keep the previous version for clients holding the old manifest
+    keep = {manifest["image"], old["image"] if old else None}
+    for stale in out_dir.glob("atlas.*.png"):
+        if stale.name not in keep:
+            image_variants.remove_variants(stale)
+            stale.unlink(missing_ok=True)
+
+    logger.info(
+        "Atlas %s for %s: %d sprites (%d reused)",
+        version, monster_dir.name, len(sprites), reused,
+    )
+    return manifest
+
+
+async def refresh_atlas(monster_dir: str | Path) -> Optional[dict]:
+    """`build_atlas` off the event loop; failures are logged, never raised."""
+    monster_dir = Path(monster_dir)
+    lock = _locks.setdefault(monster_dir, asyncio.Lock())
+    async with lock:
+        try:
+            with stage_timer("atlas"):
+                return await asyncio.to_thread(build_atlas, monster_dir)
+        except Exception as e:
+            logger.warning("Could not build the sprite atlas of %s: %s", monster_dir, e)
+            return None
+
+
+async def pokemon_dir(pokemon_id: int, session: SessionType) -> Path:
+    dir_info = await folder_service.get_pokemon_directory(pokemon_id, session)
+    return Path(dir_info.paths[0])
+
+
+async def get_pokemon_atlas(pokemon_id: int, session: SessionType) -> dict:
+    """
+    The atlas manifest of a Pokémon, with the public `url` of its image.
+
+    Raises:
+        HTTPException 404: If the Pokémon has no sprites (or no atlas support).
+    """
+    base_dir = await pokemon_dir(pokemon_id, session)
+    manifest = await refresh_atlas(base_dir)
+    if manifest is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No sprite atlas available for this Pokémon",
+        )
+    url = await asyncio.to_thread(format_image_url, base_dir / ATLAS_DIR / manifest["image"])
+    return {**manifest, "url": url}
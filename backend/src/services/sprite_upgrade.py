@@ -0,0 +1,92 @@
+# Standard library
+import asyncio
+import logging
+from pathlib import Path
+from typing import Optional
+
+# Third-party
+from sqlalchemy.engine import Engine
+
+# Local application
+from src.core import settings
+from src.database.db import engine
+from src.services import pokemon_generation, sprite_atlas
+from src.services.metrics import SPRITE_UPGRADES_TOTAL, stage_timer
+from src.services.usage import UsageLedger, save_usage_with, track_usage
+from src.utils import ReferenceImage, replace_image_data
+
+logger = logging.getLogger("pokemon.upgrade")
+
+# Strong references so running upgrades are not garbage collected mid-flight
+_background_tasks: set[asyncio.Task] = set()
+
+
+def draft_quality() -> Optional[str]:
+    """The quality creations render sprites at first, or None when tiering is off."""
+    draft = settings.SPRITE_DRAFT_QUALITY
+    return draft if draft and draft != settings.SPRITE_QUALITY else None
+
+
+async def upgrade_sprite(reference: ReferenceImage, anim_dir: Path, sprite: dict) -> bool:
+    """Re-render one draft sprite at `settings.SPRITE_QUALITY` and swap it in."""
+    try:
+        _, images = await pokemon_generation.fwp_image_generation_sprite(
+            reference, sprite["animation"], quality=settings.SPRITE_QUALITY
+        )
+        await replace_image_data(images, anim_dir / f"{sprite['name']}.png")
+    except Exception as e:
+        # The draft stays in place; it is still a valid sprite
+        logger.warning("Could not upgrade sprite %s: %s", sprite["name"], e)
+        SPRITE_UPGRADES_TOTAL.labels("error").inc()
+        return False
+    SPRITE_UPGRADES_TOTAL.labels("ok").inc()
+    return True
+
+
+async def upgrade_sprites(
+    pokemon_id: int,
+    reference: ReferenceImage,
+    anim_dir: Path,
+    sprites: list[dict],
+    bind: Optional[Engine] = None,
+) -> int:
+    """
+    Upgrade every draft sprite of one Pokémon; returns how many were replaced.
+
+    Requests go through the shared image scheduler like any other sprite, and
+    each file is replaced atomically, so the animations folder always holds a
+    complete image per sprite. Their usage is saved for `pokemon_id` under the
+    "sprite_upgrade" stage.
+    """
+    ledger = UsageLedger()
+    with track_usage(ledger), stage_timer("sprite_upgrade"):
+        results = await asyncio.gather(
+            *(upgrade_sprite(reference, anim_dir, sprite) for sprite in sprites)
+        )
+    save_usage_with(ledger, pokemon_id, bind or engine)
+    upgraded = sum(results)
+    if upgraded:
+        await sprite_atlas.refresh_atlas(anim_dir.parent)
+    logger.info(
+        "Upgraded %d/%d sprites for pokemon_id=%s", upgraded, len(sprites), pokemon_id
+    )
+    return upgraded
+
+
+def schedule_sprite_upgrade(
+    pokemon_id: int,
+    reference: ReferenceImage,
+    anim_dir: Path,
+    sprites: list[dict],
+    bind: Optional[Engine] = None,
+) -> asyncio.Task:
+    """Start `upgrade_sprites` in the background and return its task."""
+    task = asyncio.create_task(
+        upgrade_sprites(pokemon_id, reference, anim_dir, sprites, bind)
+    )
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    logger.info(
+        "Queued upgrade of %d draft sprites for pokemon_id=%s", len(sprites), pokemon_id
+    )
+    return task
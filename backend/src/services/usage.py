@@ -0,0 +1,169 @@
+# Standard library
+import logging
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Iterator, Optional, Sequence
+
+# Third-party
+from sqlmodel import Session
+
+# Local application
+from src.core import settings
+from src.database import usage as usage_db
+from src.database.db import SessionType
+from src.models import PokemonUsage
+
+logger = logging.getLogger("pokemon.usage")
+
+
+@dataclass
+class CallRecord:
+    """One provider attempt: where it ran, how long it took and what it used."""
+
+    stage: str
+    call: str
+    model: str
+    seconds: float = 0.0
+    outcome: str = "ok"
+    input_tokens: int = 0
+    output_tokens: int = 0
+    images: int = 0
+
+    @property
+    def cost_usd(self) -> float:
+        price_in, price_out = settings.MODEL_PRICES.get(self.model, (0.0, 0.0))
+        return (self.input_tokens * price_in + self.output_tokens * price_out) / 1e6
+
+
+@dataclass
+class UsageLedger:
+    """Provider calls and stage wall times collected during one creation run."""
+
+    calls: list[CallRecord] = field(default_factory=list)
+    stage_seconds: defaultdict[str, float] = field(
+        default_factory=lambda: defaultdict(float)
+    )
+
+    def rows(self, pokemon_id: int) -> list[PokemonUsage]:
+        """One `PokemonUsage` row per stage that took time or made calls."""
+        rows: dict[str, PokemonUsage] = {}
+
+        def row(stage: str) -> PokemonUsage:
+            if stage not in rows:
+                rows[stage] = PokemonUsage(pokemon_id=pokemon_id, stage=stage)
+            return rows[stage]
+
+        for stage, seconds in self.stage_seconds.items():
+            row(stage).seconds = round(seconds, 4)
+        for record in self.calls:
+            usage = row(record.stage)
+            usage.calls += 1
+            usage.call_seconds += record.seconds
+            usage.retries += record.outcome in ("rate_limited", "error")
+            usage.image_calls += record.images > 0
+            usage.input_tokens += record.input_tokens
+            usage.output_tokens += record.output_tokens
+            usage.cost_usd += record.cost_usd
+        return list(rows.values())
+
+
+# The ledger of the creation running in this context, the innermost
+# `stage_timer` stage, and the provider attempt currently being awaited
+current_ledger: ContextVar[Optional[UsageLedger]] = ContextVar(
+    "current_ledger", default=None
+)
+current_stage: ContextVar[str] = ContextVar("current_stage", default="other")
+current_call: ContextVar[Optional[CallRecord]] = ContextVar("current_call", default=None)
+
+
+@contextmanager
+def track_usage(ledger: UsageLedger) -> Iterator[UsageLedger]:
+    """Attribute provider calls made in this context (and tasks it starts) to `ledger`."""
+    token = current_ledger.set(ledger)
+    try:
+        yield ledger
+    finally:
+        current_ledger.reset(token)
+
+
+def report_usage(input_tokens: int = 0, output_tokens: int = 0, images: int = 0) -> None:
+    """Called by providers with the token counts of the response they received."""
+    record = current_call.get()
+    if record is None:
+        return
+    record.input_tokens += input_tokens or 0
+    record.output_tokens += output_tokens or 0
+    record.images += images
+
+
+def save_usage(
+    ledger: UsageLedger, pokemon_id: Optional[int], session: SessionType
+) -> None:
+    """Persist `ledger` for `pokemon_id`; accounting never fails a creation."""
+    if pokemon_id is None:
+        return
+    try:
+        usage_db.add_usage(ledger.rows(pokemon_id), session)
+    except Exception as e:
+        session.rollback()
+        logger.warning("Could not save usage for pokemon_id=%s: %s", pokemon_id, e)
+
+
+def save_usage_with(ledger: UsageLedger, pokemon_id: int, bind) -> None:
+    """`save_usage` on a fresh session, for background work outliving its request."""
+    with Session(bind) as session:
+        save_usage(ledger, pokemon_id, session)
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    rank = min(len(ordered) - 1, int(round((len(ordered) - 1) * pct / 100)))
+    return ordered[rank]
+
+
+def summarize_stages(rows: Sequence[PokemonUsage]) -> list[dict]:
+    """Latency percentiles and cost per stage across the given usage rows."""
+    by_stage: defaultdict[str, list[PokemonUsage]] = defaultdict(list)
+    for row in rows:
+        by_stage[row.stage].append(row)
+
+    summary = []
+    for stage, stage_rows in sorted(by_stage.items()):
+        seconds = [r.seconds for r in stage_rows]
+        cost = sum(r.cost_usd for r in stage_rows)
+        summary.append(
+            {
+                "stage": stage,
+                "runs": len(stage_rows),
+                "p50_s": round(_percentile(seconds, 50), 3),
+                "p95_s": round(_percentile(seconds, 95), 3),
+                "calls": sum(r.calls for r in stage_rows),
+                "retries": sum(r.retries for r in stage_rows),
+                "image_calls": sum(r.image_calls for r in stage_rows),
+                "input_tokens": sum(r.input_tokens for r in stage_rows),
+                "output_tokens": sum(r.output_tokens for r in stage_rows),
+                "cost_usd": round(cost, 6),
+                "cost_per_run_usd": round(cost / len(stage_rows), 6),
+            }
+        )
+    return summary
+
+
+def stage_report(hours: float, session: SessionType) -> dict:
+    """`summarize_stages` over the last `hours`, plus per-monster totals."""
+    since = datetime.now() - timedelta(hours=hours)
+    rows = usage_db.get_usage_since(since, session)
+    monsters = {r.pokemon_id for r in rows}
+    cost = sum(r.cost_usd for r in rows)
+    return {
+        "since": since,
+        "monsters": len(monsters),
+        "cost_usd": round(cost, 6),
+        "cost_per_monster_usd": round(cost / len(monsters), 6) if monsters else 0.0,
+        "stages": summarize_stages(rows),
+    }
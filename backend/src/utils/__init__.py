@@ -1,3 +1,4 @@
 from src.utils.generic import *
 from src.utils.image_utils import *
+from src.utils.json_stream import *
 from src.utils.pokemon_utils import *
\ No newline at end of file
@@ -0,0 +1,383 @@
+"""
+Content-addressed store behind the monster folders.
+
+Every file written into `MonsterConfig.MONSTER_DIR/<monster>/` through
+`put_chunks`/`put_bytes` is stored once, by SHA-256, under
+`MONSTER_DIR/.blobs/ab/cd/<digest>`, and the monster's own path becomes a
+hard link to that blob. The folders keep their layout (URLs, the /images
+mount and readers are unchanged) while byte-identical generations across
+monsters or retries share one file on disk.
+
+Each monster folder has a `manifest.json` mapping its relative paths to
+`{"sha256", "size"}`. Rewriting a file with the same content is a no-op,
+`verify_monster` checks a folder against its manifest without reading
+linked files, and `remove_file`/`remove_monster`/`gc_blobs` drop blobs no
+folder refers to any more.
+
+Blobs are read-only and only ever replaced, never edited in place, so one
+monster's write can't change another monster's file. Where hard links are
+unavailable the file is copied out of the store instead.
+
+Creating, linking and deleting a blob happen under a lock on its digest,
+and writes into a monster folder are serialized with its removal under a
+lock on the folder, so a late write never resurrects a removed folder. Both
+are `fcntl.flock` on striped lock files, so they hold across worker
+processes too.
+"""
+
+# Standard library
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+from collections.abc import Iterable, Iterator
+from contextlib import AbstractContextManager, ExitStack, contextmanager
+from pathlib import Path
+from typing import Optional
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows: locks are per process only
+    fcntl = None
+
+# Local application
+from src.core.pokemon_config import MonsterConfig
+
+logger = logging.getLogger("pokemon.blobs")
+
+BLOBS_DIR = ".blobs"
+MANIFEST = "manifest.json"
+LOCK_STRIPES = 256  # lock files each for blobs and for monster folders
+TMP_GRACE_SECONDS = 3600  # staging files older than this are abandoned writes
+
+_stripe_locks = {
+    kind: [threading.Lock() for _ in range(LOCK_STRIPES)] for kind in ("", "monster-")
+}
+
+
+def blob_root() -> Path:
+    return MonsterConfig.MONSTER_DIR / BLOBS_DIR
+
+
+def blob_path(digest: str) -> Path:
+    """Where the blob with SHA-256 `digest` lives, sharded by its first two bytes."""
+    return blob_root() / digest[:2] / digest[2:4] / digest
+
+
+def _monster_entry(target: Path) -> Optional[tuple[Path, str]]:
+    """(monster folder, path inside it) for a file under MONSTER_DIR, else None."""
+    try:
+        rel = target.resolve().relative_to(MonsterConfig.MONSTER_DIR.resolve())
+    except ValueError:
+        return None
+    if len(rel.parts) < 2 or rel.parts[0].startswith("."):
+        return None
+    return MonsterConfig.MONSTER_DIR / rel.parts[0], Path(*rel.parts[1:]).as_posix()
+
+
+@contextmanager
+def _stripe_lock(kind: str, stripe: int) -> Iterator[None]:
+    """Hold lock `stripe` of `kind`, in this process and (with fcntl) all others."""
+    with _stripe_locks[kind][stripe]:
+        if fcntl is None:
+            yield
+            return
+        locks = blob_root() / "locks"
+        locks.mkdir(parents=True, exist_ok=True)
+        fd = os.open(locks / f"{kind}{stripe:02x}", os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            yield
+        finally:
+            os.close(fd)  # releases the flock
+
+
+def _blob_lock(digest: str) -> AbstractContextManager[None]:
+    return _stripe_lock("", int(digest[:2], 16))
+
+
+def _monster_lock(monster_dir: Path) -> AbstractContextManager[None]:
+    """Lock of the folder; taken before any blob lock, and never two at once."""
+    name_hash = hashlib.sha256(monster_dir.name.encode("utf-8")).digest()
+    return _stripe_lock("monster-", name_hash[0])
+
+
+def read_manifest(monster_dir: str | Path) -> dict:
+    """`{relative path: {"sha256", "size"}}` of `monster_dir`; empty without a manifest."""
+    try:
+        text = (Path(monster_dir) / MANIFEST).read_text(encoding="utf-8")
+        return json.loads(text).get("files", {})
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_temp(directory: Path, name: str, chunks: Iterable[bytes]) -> tuple[Path, str, int]:
+    """Stream `chunks` into a temporary file in `directory`; returns (path, sha256, size)."""
+    digest = hashlib.sha256()
+    size = 0
+    with tempfile.NamedTemporaryFile(
+        dir=directory, prefix=f".{name}.", suffix=".tmp", delete=False
+    ) as f:
+        tmp_path = Path(f.name)
+        try:
+            for chunk in chunks:
+                digest.update(chunk)
+                size += len(chunk)
+                f.write(chunk)
+        except BaseException:
+            f.close()
+            tmp_path.unlink(missing_ok=True)
+            raise
+    return tmp_path, digest.hexdigest(), size
+
+
+def _link_into(blob: Path, target: Path) -> None:
+    """Point `target` at `blob` atomically: a hard link, or a copy where links fail."""
+    tmp_path = target.with_name(f".{target.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp_path.unlink(missing_ok=True)
+    try:
+        os.link(blob, tmp_path)
+    except OSError:
+        shutil.copyfile(blob, tmp_path)
+    try:
+        os.replace(tmp_path, target)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def _write_manifest(monster_dir: Path, files: dict) -> None:
+    """Replace the manifest atomically; the caller holds the monster's lock."""
+    text = json.dumps({"files": dict(sorted(files.items()))}, indent=2)
+    with tempfile.NamedTemporaryFile(
+        "w", encoding="utf-8", dir=monster_dir, prefix=f".{MANIFEST}.", suffix=".tmp",
+        delete=False,
+    ) as f:
+        f.write(text)
+    os.replace(f.name, monster_dir / MANIFEST)
+
+
+def _record(monster_dir: Path, rel: str, digest: str, size: int) -> None:
+    """Add `rel` to the manifest; the caller holds the monster's lock."""
+    entry = {"sha256": digest, "size": size}
+    files = read_manifest(monster_dir)
+    if files.get(rel) == entry:
+        return
+    files[rel] = entry
+    _write_manifest(monster_dir, files)
+
+
+def _is_same_file(a: Path, b: Path) -> bool:
+    try:
+        return os.path.samefile(a, b)
+    except OSError:
+        return False
+
+
+def put_chunks(chunks: Iterable[bytes], target: str | Path) -> Path:
+    """
+    Write `chunks` to `target` atomically (blocking) and return `target`.
+
+    Inside a monster folder the content goes to the blob store, deduplicated
+    by hash, and `target` is linked to it and recorded in the manifest;
+    anywhere else it is a plain temp-file-and-rename write. Readers see the
+    old file or the new one, never a partial write.
+
+    Raises:
+        FileNotFoundError: If the monster folder does not exist (any more).
+    """
+    target = Path(target)
+    entry = _monster_entry(target)
+    if entry is None:
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path, _, _ = _write_temp(target.parent, target.name, chunks)
+        os.replace(tmp_path, target)
+        return target
+
+    monster_dir, rel = entry
+    staging = blob_root() / "tmp"
+    staging.mkdir(parents=True, exist_ok=True)
+    tmp_path, digest, size = _write_temp(staging, target.name, chunks)
+    blob = blob_path(digest)
+    try:
+        with _monster_lock(monster_dir):
+            if not monster_dir.is_dir():
+                raise FileNotFoundError(f"Monster folder {monster_dir} was removed")
+            target.parent.mkdir(parents=True, exist_ok=True)
+            with _blob_lock(digest):
+                if not blob.exists():
+                    blob.parent.mkdir(parents=True, exist_ok=True)
+                    os.chmod(tmp_path, 0o444)
+                    os.replace(tmp_path, blob)
+                # Same content as before: leave the file (and its mtime-keyed caches) alone
+                if not _is_same_file(blob, target):
+                    _link_into(blob, target)
+                _record(monster_dir, rel, digest, size)
+    finally:
+        tmp_path.unlink(missing_ok=True)  # already stored, or the write failed
+    return target
+
+
+def put_bytes(data: bytes, target: str | Path) -> Path:
+    """`put_chunks` for content already in memory (JSON data, uploads)."""
+    return put_chunks([data], target)
+
+
+def _hash_file(path: Path) -> str:
+    with open(path, "rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+def verify_monster(monster_dir: str | Path, deep: bool = False) -> list[dict]:
+    """
+    Problems found checking `monster_dir` against its manifest (blocking).
+
+    A file still hard-linked to its blob is checked by inode and size only,
+    without reading it; copies and replaced files are hashed. `deep` also
+    rehashes every blob against its name, to catch bit rot in the store.
+    """
+    monster_dir = Path(monster_dir)
+    problems = []
+    for rel, entry in read_manifest(monster_dir).items():
+        path = monster_dir / rel
+        blob = blob_path(entry["sha256"])
+        if not path.is_file():
+            problems.append({"path": rel, "problem": "missing file"})
+            continue
+        if not blob.is_file():
+            problems.append({"path": rel, "problem": "missing blob"})
+        elif deep and _hash_file(blob) != entry["sha256"]:
+            problems.append({"path": rel, "problem": "corrupt blob"})
+            continue
+
+        if path.stat().st_size != entry["size"]:
+            problems.append({"path": rel, "problem": "size mismatch"})
+        elif not _is_same_file(path, blob) and _hash_file(path) != entry["sha256"]:
+            problems.append({"path": rel, "problem": "content mismatch"})
+    return problems
+
+
+def _unlink_if_unused(blob: Path, referenced: set[str] = frozenset()) -> bool:
+    """Delete `blob` unless a file links to it or `referenced` names it; hold its lock."""
+    try:
+        if blob.stat().st_nlink > 1 or blob.name in referenced:
+            return False
+        blob.unlink()
+        return True
+    except FileNotFoundError:
+        return False
+
+
+def remove_file(target: str | Path) -> bool:
+    """
+    Delete `target` (blocking); returns whether it existed. Inside a monster
+    folder its manifest entry goes too, and its blob if nothing else links to it.
+    """
+    target = Path(target)
+    entry = _monster_entry(target)
+    if entry is None:
+        try:
+            target.unlink()
+            return True
+        except FileNotFoundError:
+            return False
+
+    monster_dir, rel = entry
+    blob = None
+    with _monster_lock(monster_dir):
+        files = read_manifest(monster_dir)
+        recorded = files.pop(rel, None)
+        if recorded is not None:
+            if _is_same_file(target, blob_path(recorded["sha256"])):
+                blob = blob_path(recorded["sha256"])
+            _write_manifest(monster_dir, files)
+        try:
+            target.unlink()
+            existed = True
+        except FileNotFoundError:
+            existed = False
+    if blob is not None:
+        with _blob_lock(blob.name):
+            _unlink_if_unused(blob)
+    return existed
+
+
+def remove_monster(monster_dir: str | Path) -> int:
+    """
+    Delete `monster_dir` and the blobs only it linked to (blocking); returns
+    how many blobs were deleted. Blobs of copied files are left to `gc_blobs`.
+    Writes into the folder still running finish first; later ones fail.
+    """
+    monster_dir = Path(monster_dir)
+    with _monster_lock(monster_dir):
+        linked = {
+            blob_path(entry["sha256"])
+            for rel, entry in read_manifest(monster_dir).items()
+            if _is_same_file(monster_dir / rel, blob_path(entry["sha256"]))
+        }
+        shutil.rmtree(monster_dir, ignore_errors=True)
+
+    deleted = 0
+    for blob in linked:
+        with _blob_lock(blob.name):
+            deleted += _unlink_if_unused(blob)
+    return deleted
+
+
+def _only_in_store(blob: Path) -> bool:
+    """True if no file links to `blob`; False once a concurrent removal deleted it."""
+    try:
+        return blob.stat().st_nlink == 1
+    except FileNotFoundError:
+        return False
+
+
+def _referenced_digests() -> set[str]:
+    referenced = set()
+    for manifest in MonsterConfig.MONSTER_DIR.glob(f"*/{MANIFEST}"):
+        referenced.update(e["sha256"] for e in read_manifest(manifest.parent).values())
+    return referenced
+
+
+def gc_blobs() -> int:
+    """
+    Delete blobs no file links to and no manifest refers to, e.g. those of
+    copied files of removed monsters, and staging files abandoned by
+    interrupted writes (blocking); returns how many blobs were deleted.
+
+    Safe while other threads or workers write: candidates are rechecked
+    against manifests read again while holding their locks, and a write
+    holds its blob's lock until its manifest entry lands.
+    """
+    root = blob_root()
+    if not root.is_dir():
+        return 0
+    cutoff = time.time() - TMP_GRACE_SECONDS
+    for leftover in (root / "tmp").glob("*"):
+        try:
+            if leftover.stat().st_mtime < cutoff:
+                leftover.unlink()
+        except FileNotFoundError:
+            pass
+
+    referenced = _referenced_digests()
+    candidates = [
+        blob
+        for blob in root.glob("??/??/*")
+        if blob.name not in referenced and _only_in_store(blob)
+    ]
+    if not candidates:
+        return 0
+    with ExitStack() as stack:
+        # Stripes in a fixed order; writers only ever hold one
+        for digest in sorted({blob.name[:2] for blob in candidates}):
+            stack.enter_context(_blob_lock(digest))
+        referenced = _referenced_digests()  # includes writes that landed meanwhile
+        deleted = sum(_unlink_if_unused(blob, referenced) for blob in candidates)
+    if deleted:
+        logger.info("Deleted %d unreferenced blobs", deleted)
+    return deleted
@@ -1,29 +1,46 @@
 # Standard library
 import base64
+import binascii
+import mimetypes
+import hashlib
+import logging
+from dataclasses import dataclass
+from functools import cached_property
 from pathlib import Path
+from typing import Iterator, Optional
 
 # Third-party
+from anyio import to_thread
 from fastapi import HTTPException
 
 # Local application
-import base64
-from fastapi import HTTPException
+from src.utils import blob_store, image_variants, static_assets
+
+logger = logging.getLogger("pokemon.images")
 
+# Base64 characters decoded per step when writing an image; a multiple of 4
+# so every chunk decodes on its own (1 MiB in -> 768 KiB out)
+IMAGE_DECODE_CHUNK = 1 << 20
+_WHITESPACE = (" ", "\n", "\r", "\t")
 
-def extract_base64(image_data) -> bytes:
+
+def extract_base64(image_data) -> str | bytes:
     """
     Extract and normalize base64 content from various image_data shapes.
 
     Accepts:
       - list/tuple where first element is str/bytes/dict/object with 'b64_json'
+        (the `images` list of an `ImageResult`)
       - dict with 'b64_json' or 'image_base64'
-      - plain str/bytes/bytearray
+      - plain str/bytes/bytearray, optionally a `data:...;base64,` URL
 
     Returns:
-      Decoded raw bytes.
+      The base64 payload, still encoded and without whitespace. Strings are
+      returned as-is rather than copied, so multi-megabyte images are not
+      duplicated before `iter_base64_chunks` decodes them.
 
     Raises:
-      HTTPException(500) if base64 is missing or cannot be decoded.
+      HTTPException(500) if base64 is missing or has an unexpected type.
     """
     b64_val = None
 
@@ -45,39 +62,148 @@ def extract_base64(image_data) -> bytes:
     if b64_val is None:
         raise HTTPException(status_code=500, detail="Missing base64 image data")
 
-    # Normalize to bytes
-    if isinstance(b64_val, str):
-        try:
-            b64_bytes = b64_val.encode("ascii")
-        except Exception:
-            b64_bytes = b64_val.encode("utf-8")
-    elif isinstance(b64_val, (bytes, bytearray)):
-        b64_bytes = bytes(b64_val)
-    else:
+    if isinstance(b64_val, bytearray):
+        b64_val = bytes(b64_val)
+    elif not isinstance(b64_val, (str, bytes)):
         raise HTTPException(
             status_code=500,
             detail=f"Unexpected type for base64 data: {type(b64_val).__name__}",
         )
 
-    try:
-        return base64.b64decode(b64_bytes)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Base64 decode failed: {e}")
+    if isinstance(b64_val, str):
+        if b64_val.startswith("data:"):
+            b64_val = b64_val.partition(",")[2]
+        if any(ws in b64_val for ws in _WHITESPACE):
+            b64_val = "".join(b64_val.split())
+    else:
+        if b64_val.startswith(b"data:"):
+            b64_val = b64_val.partition(b",")[2]
+        if any(ws.encode() in b64_val for ws in _WHITESPACE):
+            b64_val = b"".join(b64_val.split())
+    return b64_val
+
 
+def iter_base64_chunks(
+    b64: str | bytes, chunk_size: Optional[int] = None
+) -> Iterator[bytes]:
+    """
+    Decode `b64` (as returned by `extract_base64`) a chunk at a time.
 
-def write_image_data(image_data, folder_path, filename):
+    `chunk_size` defaults to `IMAGE_DECODE_CHUNK` and must be a multiple of 4.
+
+    Raises:
+      HTTPException(500) if the payload is not valid base64.
+    """
+    chunk_size = chunk_size or IMAGE_DECODE_CHUNK
     try:
-        fpath = Path(folder_path)
-        if not fpath.exists():
-            fpath.mkdir(parents=True, exist_ok=True)
+        for start in range(0, len(b64), chunk_size):
+            yield base64.b64decode(b64[start : start + chunk_size], validate=True)
+    except (binascii.Error, ValueError) as e:
+        raise HTTPException(status_code=500, detail=f"Base64 decode failed: {e}")
 
-        image_base64 = image_data[0]
-        save_path = fpath / f"{filename}.png"
 
-        with open(save_path, "wb") as f:
-            f.write(base64.b64decode(image_base64))
+def decode_base64(image_data) -> bytes:
+    """All of `image_data` decoded, for callers that need the bytes in memory."""
+    return b"".join(iter_base64_chunks(extract_base64(image_data)))
 
-        return {"status": "ok", "filepath": save_path}
 
+def save_image_file(image_data, filepath) -> Path:
+    """
+    Decode `image_data` into `filepath` atomically (blocking; see `write_image`).
+
+    The payload is decoded chunk by chunk into a temporary file, which is then
+    renamed over the target: peak memory stays at one chunk beyond the base64
+    string, and readers see either the old image or the new one, never a
+    half-written file. Inside a monster folder the image is stored once per
+    content in the blob store (see `blob_store.put_chunks`).
+    """
+    try:
+        return blob_store.put_chunks(
+            iter_base64_chunks(extract_base64(image_data)), filepath
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Could not save image {str(e)}")
+
+
+def save_image_with_variants(image_data, filepath) -> Path:
+    """`save_image_file`, then its WebP/AVIF/thumbnail derivatives."""
+    path = save_image_file(image_data, filepath)
+    try:
+        image_variants.build_variants(path)
+    except Exception as e:
+        # The original is saved and always served as a fallback
+        image_variants.remove_variants(path)
+        logger.warning("Could not build variants of %s: %s", path, e)
+    static_assets.asset_info(path)  # hash now, off the loop, for its versioned URL
+    return path
+
+
+async def write_image(image_data, filepath) -> Path:
+    """`save_image_with_variants` on a worker thread, keeping the event loop free."""
+    return await to_thread.run_sync(save_image_with_variants, image_data, filepath)
+
+
+async def write_image_data(image_data, folder_path, filename):
+    """Save the first image in `image_data` as `<folder_path>/<filename>.png`."""
+    save_path = await write_image(image_data, Path(folder_path) / f"{filename}.png")
+    return {"status": "ok", "filepath": save_path}
+
+
+async def replace_image_data(image_data, filepath) -> Path:
+    """Overwrite `filepath` with the first image in `image_data`, atomically."""
+    return await write_image(image_data, filepath)
+
+
+@dataclass(frozen=True)
+class ReferenceImage:
+    """
+    An image read from disk and base64-encoded exactly once.
+
+    A pipeline run loads its `base.png` into one of these and hands the same
+    instance to every moveset and sprite call, so the file is not re-read,
+    re-encoded or left open once per request. `response_id` is the provider
+    response that generated the image, when this run produced it; chained
+    sprite generation continues that response instead of uploading `data`.
+    """
+
+    path: Path
+    data: bytes
+    b64: str
+    response_id: Optional[str] = None
+
+    @cached_property
+    def digest(self) -> str:
+        """SHA-256 of the image bytes; identifies the image in request keys."""
+        return hashlib.sha256(self.data).hexdigest()
+
+    @property
+    def mime_type(self) -> str:
+        return mimetypes.guess_type(self.path.name)[0] or "image/png"
+
+    @property
+    def data_url(self) -> str:
+        return f"data:{self.mime_type};base64,{self.b64}"
+
+    def as_upload(self) -> tuple[str, bytes, str]:
+        """(filename, content, mime type) as accepted by multipart uploads."""
+        return (self.path.name, self.data, self.mime_type)
+
+
+def read_reference_image(
+    path: str | Path, response_id: Optional[str] = None
+) -> ReferenceImage:
+    path = Path(path)
+    data = path.read_bytes()
+    return ReferenceImage(
+        path=path,
+        data=data,
+        b64=base64.b64encode(data).decode("ascii"),
+        response_id=response_id,
+    )
+
+
+async def load_reference_image(
+    path: str | Path, response_id: Optional[str] = None
+) -> ReferenceImage:
+    """`read_reference_image` off the event loop."""
+    return await to_thread.run_sync(read_reference_image, path, response_id)
@@ -0,0 +1,193 @@
+"""
+Smaller derivatives of stored images, and picking one for a request.
+
+Every PNG written through `image_utils.write_image` gets its variants in a
+`_variants` folder next to it:
+
+    animations/tackle.png                  original (always served as fallback)
+    animations/_variants/tackle.webp       full size in each configured format
+    animations/_variants/tackle@256.webp   thumbnail in each configured format
+    animations/_variants/tackle@256.png    thumbnail for clients without WebP
+
+Formats and sizes come from `settings.IMAGE_VARIANT_FORMATS` and
+`settings.IMAGE_THUMBNAIL_SIZES`. Pillow is optional: without it (or without
+its AVIF/WebP codecs) the affected variants are simply not written.
+"""
+
+# Standard library
+import logging
+import os
+import tempfile
+from functools import cache
+from pathlib import Path, PurePosixPath
+from typing import Optional
+
+# Local application
+from src.core import settings
+
+try:
+    from PIL import Image, features
+except ImportError:  # pragma: no cover - depends on the environment
+    Image = None
+    features = None
+
+logger = logging.getLogger("pokemon.images")
+
+VARIANTS_DIR = "_variants"
+MEDIA_TYPES = {"avif": "image/avif", "webp": "image/webp", "png": "image/png"}
+SAVE_OPTIONS = {
+    "avif": lambda quality: {"quality": quality},
+    "webp": lambda quality: {"quality": quality, "method": 4},
+    "png": lambda quality: {"optimize": True},
+}
+
+
+def variant_name(stem: str, fmt: str, size: Optional[int] = None) -> str:
+    return f"{stem}@{size}.{fmt}" if size else f"{stem}.{fmt}"
+
+
+def variant_path(path: str | Path, fmt: str, size: Optional[int] = None) -> Path:
+    path = Path(path)
+    return path.parent / VARIANTS_DIR / variant_name(path.stem, fmt, size)
+
+
+@cache
+def _codec_available(fmt: str) -> bool:
+    if Image is None:
+        return False
+    if fmt == "png":
+        return True
+    if features.check(fmt):
+        return True
+    logger.warning("Pillow cannot encode %s; skipping those image variants", fmt)
+    return False
+
+
+def warn_if_unavailable() -> bool:
+    """Log once (at startup) when Pillow is missing; returns whether variants are on."""
+    if Image is None:
+        logger.warning(
+            "Pillow is not installed; image variants are disabled and only the "
+            "original PNGs are served (install the 'images' extra)"
+        )
+        return False
+    return True
+
+
+def encodable_formats() -> list[str]:
+    """Configured variant formats the installed Pillow can write."""
+    return [f for f in settings.IMAGE_VARIANT_FORMATS if _codec_available(f)]
+
+
+def remove_variants(path: str | Path) -> None:
+    """Delete the variants of `path`, e.g. before its image is replaced."""
+    path = Path(path)
+    folder = path.parent / VARIANTS_DIR
+    if not folder.is_dir():
+        return
+    for entry in folder.iterdir():
+        if entry.name.startswith((f"{path.stem}.", f"{path.stem}@")):
+            entry.unlink(missing_ok=True)
+
+
+def _save_atomic(image, target: Path, fmt: str) -> None:
+    tmp_path = None
+    try:
+        with tempfile.NamedTemporaryFile(
+            dir=target.parent, prefix=f".{target.name}.", suffix=".tmp", delete=False
+        ) as f:
+            tmp_path = Path(f.name)
+            image.save(f, format=fmt.upper(), **SAVE_OPTIONS[fmt](settings.IMAGE_VARIANT_QUALITY))
+        os.replace(tmp_path, target)
+    except Exception:
+        if tmp_path is not None:
+            tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def build_variants(path: str | Path) -> list[Path]:
+    """
+    Write every configured derivative of the PNG at `path` (blocking).
+
+    Old variants are removed first so a replaced image never serves stale
+    derivatives, and a variant no smaller than the original is dropped (flat
+    pixel art can compress better as PNG). Returns the files written; an
+    empty list without Pillow.
+    """
+    path = Path(path)
+    if Image is None or path.suffix.lower() != ".png":
+        return []
+    formats = encodable_formats()
+    remove_variants(path)
+
+    written = []
+    original_size = path.stat().st_size
+    with Image.open(path) as original:
+        original.load()
+        (path.parent / VARIANTS_DIR).mkdir(exist_ok=True)
+        for size in [None, *sorted(settings.IMAGE_THUMBNAIL_SIZES)]:
+            if size is None:
+                image = original
+            else:
+                image = original.copy()
+                image.thumbnail((size, size), Image.Resampling.LANCZOS)
+            for fmt in formats + (["png"] if size else []):
+                target = variant_path(path, fmt, size)
+                _save_atomic(image, target, fmt)
+                if target.stat().st_size >= original_size:
+                    target.unlink()
+                    continue
+                written.append(target)
+    return written
+
+
+def accepted_media_types(accept: str) -> set[str]:
+    """Media types an `Accept` header lists explicitly with q > 0."""
+    accepted = set()
+    for part in accept.split(","):
+        media_type, *params = [p.strip() for p in part.split(";")]
+        q = 1.0
+        for param in params:
+            if param.startswith("q="):
+                try:
+                    q = float(param[2:])
+                except ValueError:
+                    q = 0.0
+        if media_type and q > 0:
+            accepted.add(media_type.lower())
+    return accepted
+
+
+def thumbnail_size(requested: Optional[int]) -> Optional[int]:
+    """Smallest configured thumbnail at least `requested` px, or None for full size."""
+    if not requested:
+        return None
+    fitting = [s for s in settings.IMAGE_THUMBNAIL_SIZES if s >= requested]
+    return min(fitting) if fitting else None
+
+
+def variant_candidates(path: str, accept: str, size: Optional[int] = None) -> list[str]:
+    """
+    Paths (relative, like `path`) to try for a request, best first.
+
+    Prefers AVIF, then WebP, when the client accepts them and they are
+    configured; a thumbnail when `size` fits one. Ends with `path` itself,
+    which always exists for a stored image.
+    """
+    original = PurePosixPath(path)
+    if original.suffix.lower() != ".png" or VARIANTS_DIR in original.parts:
+        return [path]
+
+    accepted = accepted_media_types(accept)
+    formats = [
+        fmt
+        for fmt in ("avif", "webp")
+        if fmt in settings.IMAGE_VARIANT_FORMATS and MEDIA_TYPES[fmt] in accepted
+    ]
+    folder = original.parent / VARIANTS_DIR
+    thumb = thumbnail_size(size)
+    if thumb:
+        names = [variant_name(original.stem, f, thumb) for f in [*formats, "png"]]
+    else:
+        names = [variant_name(original.stem, f) for f in formats]
+    return [str(folder / name) for name in names] + [path]
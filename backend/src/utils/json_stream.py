@@ -0,0 +1,66 @@
+import json
+from typing import Any
+
+
+class JsonListItems:
+    """
+    Incrementally pull the elements of one top-level list out of streamed JSON.
+
+    Feed text chunks of a JSON object such as `{"move_list": [{...}, {...}]}` as
+    they arrive; `feed` returns each object (or array) element of `field` as
+    soon as its closing bracket has been seen, long before the whole document
+    is complete. Every character is scanned once.
+    """
+
+    def __init__(self, field: str):
+        self.field = field
+        self.count = 0  # elements returned so far
+        self._text = ""
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        self._last_key: str | None = None
+        self._in_list = False
+        self._item_start: int | None = None
+
+    def feed(self, chunk: str) -> list[tuple[int, Any]]:
+        """Consume `chunk`; return (index, element) for every element it completed."""
+        items: list[tuple[int, Any]] = []
+        offset = len(self._text)
+        self._text += chunk
+
+        for i, ch in enumerate(chunk, start=offset):
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    if self._depth == 1:
+                        self._last_key = json.loads(self._text[self._string_start : i + 1])
+                continue
+
+            if ch == '"':
+                self._in_string = True
+                self._string_start = i
+            elif ch in "{[":
+                if self._in_list and self._depth == 2:
+                    self._item_start = i
+                elif ch == "[" and self._depth == 1 and self._last_key == self.field:
+                    self._in_list = True
+                self._depth += 1
+            elif ch in "}]":
+                self._depth -= 1
+                if self._in_list and self._depth == 2 and self._item_start is not None:
+                    items.append(
+                        (self.count, json.loads(self._text[self._item_start : i + 1]))
+                    )
+                    self.count += 1
+                    self._item_start = None
+                elif self._in_list and self._depth == 1:
+                    self._in_list = False
+            elif ch == "," and self._depth == 1:
+                self._last_key = None
+        return items
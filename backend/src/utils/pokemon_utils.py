@@ -1,5 +1,8 @@
+from pathlib import Path
 from ..services.prompts import *
 from src.models import *
+from src.core.pokemon_config import MonsterConfig
+from src.utils.static_assets import versioned_url
 
 PokemonSearchInput = Union[Pokemon, Mapping[str, int | str]]
 
@@ -49,3 +52,14 @@ def format_pokemon_folder_name(data: PokemonSearchInput):
         return name.strip().lower()
     except Exception as e:
         raise e
+
+
+def format_image_url(path: str | Path) -> str:
+    """
+    Public URL of a file stored under MonsterConfig.MONSTER_DIR.
+
+    The URL carries the file's content hash (`?v=`), so clients may cache it
+    forever and a replaced image (e.g. an upgraded draft) gets a new URL.
+    """
+    rel = Path(path).resolve().relative_to(MonsterConfig.MONSTER_DIR.resolve())
+    return versioned_url(f"{MonsterConfig.MONSTER_URL}/{rel.as_posix()}", path)
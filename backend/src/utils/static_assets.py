@@ -0,0 +1,149 @@
+"""
+Content hashes and precompressed siblings of files served statically.
+
+`asset_info` hashes a file once per (size, mtime) and remembers which
+precompressed `.br`/`.gz` siblings are current, for strong ETags and
+versioned URLs (`versioned_url`). `precompress_dir` writes those siblings
+for a built frontend bundle; brotli is optional, gzip always available.
+"""
+
+# Standard library
+import gzip
+import hashlib
+import logging
+import os
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - depends on the environment
+    brotli = None
+
+logger = logging.getLogger("pokemon.static")
+
+# Content-Encoding -> file suffix, in server preference order
+ENCODINGS = {"br": ".br", "gzip": ".gz"}
+COMPRESSIBLE_SUFFIXES = {".html", ".js", ".mjs", ".css", ".json", ".svg", ".txt", ".map", ".wasm"}
+VERSION_LENGTH = 12  # hex digits of the content hash used in `?v=` URLs
+MAX_CACHED_ASSETS = 4096
+
+
+@dataclass(frozen=True)
+class AssetInfo:
+    """A file's strong content hash and its up-to-date precompressed siblings."""
+
+    size: int
+    mtime_ns: int
+    digest: str
+    encoded: dict[str, tuple[str, os.stat_result]] = field(default_factory=dict)
+
+    @property
+    def version(self) -> str:
+        return self.digest[:VERSION_LENGTH]
+
+
+_assets: OrderedDict[str, AssetInfo] = OrderedDict()
+_assets_lock = threading.Lock()
+
+
+def _hash_file(path: str) -> str:
+    with open(path, "rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+def _encoded_siblings(path: str, stat_result: os.stat_result) -> dict:
+    encoded = {}
+    for encoding, suffix in ENCODINGS.items():
+        try:
+            sibling = os.stat(path + suffix)
+        except OSError:
+            continue
+        # A sibling older than its source is stale; serve the source instead
+        if sibling.st_mtime_ns >= stat_result.st_mtime_ns:
+            encoded[encoding] = (path + suffix, sibling)
+    return encoded
+
+
+def asset_info(path: str | Path, stat_result: Optional[os.stat_result] = None) -> AssetInfo:
+    """
+    `AssetInfo` of the file at `path` (blocking on a cache miss).
+
+    Entries are keyed by path and reused while size and mtime match, so a
+    file is read and hashed once per change rather than once per request.
+    """
+    path = str(path)
+    stat_result = stat_result or os.stat(path)
+    with _assets_lock:
+        info = _assets.get(path)
+        if (
+            info is not None
+            and info.size == stat_result.st_size
+            and info.mtime_ns == stat_result.st_mtime_ns
+        ):
+            _assets.move_to_end(path)
+            return info
+
+    info = AssetInfo(
+        size=stat_result.st_size,
+        mtime_ns=stat_result.st_mtime_ns,
+        digest=_hash_file(path),
+        encoded=_encoded_siblings(path, stat_result),
+    )
+    with _assets_lock:
+        _assets[path] = info
+        _assets.move_to_end(path)
+        while len(_assets) > MAX_CACHED_ASSETS:
+            _assets.popitem(last=False)
+    return info
+
+
+def versioned_url(url: str, path: str | Path) -> str:
+    """`url` with `?v=<content hash>`, which the static mounts cache as immutable."""
+    try:
+        return f"{url}?v={asset_info(path).version}"
+    except OSError:
+        return url
+
+
+def _compress_to(source: Path, target: Path, compress) -> None:
+    data = compress(source.read_bytes())
+    with tempfile.NamedTemporaryFile(
+        dir=target.parent, prefix=f".{target.name}.", suffix=".tmp", delete=False
+    ) as f:
+        f.write(data)
+    os.replace(f.name, target)
+    shutil.copystat(source, target)
+
+
+def precompress_dir(directory: str | Path, min_size: int = 1024) -> int:
+    """
+    Write `.gz` (and `.br` with brotli installed) next to every compressible
+    file in `directory` that lacks a current one; returns how many were written.
+    """
+    compressors = {".gz": lambda data: gzip.compress(data, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        compressors[".br"] = lambda data: brotli.compress(data, quality=11)
+
+    written = 0
+    for source in Path(directory).rglob("*"):
+        if (
+            not source.is_file()
+            or source.suffix not in COMPRESSIBLE_SUFFIXES
+            or source.stat().st_size < min_size
+        ):
+            continue
+        for suffix, compress in compressors.items():
+            target = source.with_name(source.name + suffix)
+            if target.exists() and target.stat().st_mtime_ns >= source.stat().st_mtime_ns:
+                continue
+            _compress_to(source, target, compress)
+            written += 1
+    if written:
+        logger.info("Precompressed %d files in %s", written, directory)
+    return written
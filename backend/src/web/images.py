@@ -0,0 +1,47 @@
+# Standard library
+import stat
+
+# Third-party
+from anyio import to_thread
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.types import Scope
+
+# Local application
+from src.utils.image_variants import variant_candidates
+from src.web.static_files import CachedStaticFiles
+
+
+class ImageFiles(CachedStaticFiles):
+    """
+    The /images mount: serves the best stored variant of each PNG.
+
+    `Accept` picks AVIF or WebP over PNG and `?size=N` the smallest thumbnail
+    of at least N px (see `image_variants.variant_candidates`). Images without
+    a matching variant are served as stored, so clients can always ask. A
+    `?v=` version refers to the stored PNG, whichever variant is served.
+    """
+
+    def pick_variant(self, candidates: list[str]) -> str:
+        for candidate in candidates[:-1]:
+            _, stat_result = self.lookup_path(candidate)
+            if stat_result and stat.S_ISREG(stat_result.st_mode):
+                return candidate
+        return candidates[-1]
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        request = Request(scope)
+        size = request.query_params.get("size", "")
+        candidates = variant_candidates(
+            path,
+            request.headers.get("accept", ""),
+            int(size) if size.isdigit() else None,
+        )
+        if len(candidates) == 1:
+            return await self.cached_response(path, scope)
+
+        chosen = await to_thread.run_sync(self.pick_variant, candidates)
+        response = await self.cached_response(chosen, scope, version_path=path)
+        vary = response.headers.get("vary")
+        response.headers["vary"] = f"{vary}, Accept" if vary else "Accept"
+        return response
@@ -0,0 +1,16 @@
+from fastapi import APIRouter, HTTPException
+
+from src.database.db import SessionType
+from src.models import PokemonJob
+from src.services import job_service
+
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+
+@router.get("/{job_id}")
+async def get_job(job_id: str, session: SessionType) -> PokemonJob:
+    """Report the stage, progress and (once finished) result of a creation job."""
+    try:
+        return job_service.get_job_status(job_id, session)
+    except HTTPException as e:
+        raise e
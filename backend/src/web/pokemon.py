@@ -1,15 +1,23 @@
-import shutil
 from pathlib import Path
 from typing import List, Optional
 
-from fastapi import APIRouter, Form, HTTPException
+from anyio import to_thread
+from fastapi import APIRouter, Form, HTTPException, Response
+from fastapi.responses import StreamingResponse
+from starlette import status
 from sqlmodel import select
 
 from src.database.db import SessionType
-from src.models import Pokemon, PokemonInput
+from src.models import Pokemon, PokemonData, PokemonInput, PokemonState
+from src.response_models import BatchCreateResponse
 from src.services import pokemon_full
 from src.services import pokemon_folder_service as svc
 from src.services import pokemon_crud
+from src.services import job_service
+from src.services import pipeline_stream
+from src.services import pokemon_batch
+from src.services.egg_pool import egg_pool
+from src.utils import blob_store
 
 router = APIRouter(prefix="/pokemon", tags=["pokemon"])
 
@@ -39,15 +47,98 @@ async def add_pokemon(pokemon_name: str, session: SessionType) -> Pokemon:
 
 @router.post("/create/complete/{pokemon_name}")
 async def add_pokemon_complete(
-    pokemon_name: str, pokemon_data: PokemonInput, session: SessionType
+    pokemon_name: str,
+    pokemon_data: PokemonInput,
+    session: SessionType,
+    response: Response,
+    background: bool = False,
 ):
+    """Create a monster end to end.
+
+    With `background=true` the pipeline runs as a job: the route answers 202 with
+    the job row right away and progress is polled from `/jobs/{job_id}`.
+    """
     try:
-        response = await pokemon_full.create_pokemon_complete(
+        if background:
+            response.status_code = status.HTTP_202_ACCEPTED
+            return job_service.submit_pokemon_job(pokemon_name, pokemon_data, session)
+        result = await pokemon_full.create_pokemon_complete(
             pokemon=Pokemon(name=pokemon_name),
             pokemon_data=pokemon_data,
             session=session,
         )
-        return response
+        return result
+    except HTTPException as e:
+        raise e
+
+
+@router.post("/create/batch")
+async def add_pokemon_batch(
+    pokemon_data: List[PokemonData], session: SessionType
+) -> BatchCreateResponse:
+    """Create several monsters in one request; stages overlap across monsters.
+
+    Reports per-monster status and timings plus batch totals. Failed entries can
+    be finished later with `/pokemon/{pokemon_id}/resume`.
+    """
+    try:
+        return await pokemon_batch.create_pokemon_batch(pokemon_data, session)
+    except HTTPException as e:
+        raise e
+
+
+@router.post("/hatch")
+async def hatch_pokemon(session: SessionType):
+    """Hatch a pre-generated monster from the egg pool.
+
+    Returns in milliseconds: the egg was fully generated in the background and
+    is claimed with a single UPDATE. It keeps the name it was generated with,
+    which its description and sprites already use. Answers 503 while the pool
+    is empty; the refill worker is woken either way.
+    """
+    try:
+        return egg_pool.hatch(session)
+    except HTTPException as e:
+        raise e
+
+
+@router.post("/{pokemon_id}/resume")
+async def resume_pokemon(
+    pokemon_id: int,
+    session: SessionType,
+    response: Response,
+    background: bool = False,
+):
+    """Finish an interrupted creation from its last checkpoint.
+
+    Only the missing outputs (description, base image, movesets, sprites) are
+    generated. With `background=true` this runs as a job polled from `/jobs/{job_id}`.
+    """
+    try:
+        if background:
+            response.status_code = status.HTTP_202_ACCEPTED
+            return job_service.submit_resume_job(pokemon_id, session)
+        return await pokemon_full.resume_pokemon_creation(pokemon_id, session)
+    except HTTPException as e:
+        raise e
+
+
+@router.post("/create/stream/{pokemon_name}")
+async def add_pokemon_complete_stream(pokemon_name: str, pokemon_data: PokemonInput):
+    """Create a monster end to end, streaming progress as server-sent events.
+
+    Events: one per stage (setup, description, base_image, movesets, sprites,
+    persist), `sprite` for each sprite once written, then `complete` or `error`.
+    """
+    try:
+        events = await pipeline_stream.stream_pokemon_creation(
+            pokemon_name, pokemon_data
+        )
+        return StreamingResponse(
+            events,
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
     except HTTPException as e:
         raise e
 
@@ -97,13 +188,14 @@ async def delete_pokemon(pokemon_id: int, session: SessionType):
             # If directory service raises (e.g., 404), keep going and just delete the DB row
             dir_path = None
 
-        # 3) Delete directory tree if present
-        if dir_path and dir_path.exists() and dir_path.is_dir():
-            shutil.rmtree(dir_path)
-
-        # 4) Delete DB row
+        # 3) Delete DB row (its usage rows cascade) before the files, so a
+        # failed delete never leaves a row pointing at a removed folder
         pokemon_crud.delete_pokemon(pokemon_id=pokemon_id, session=session)
 
+        # 4) Delete directory tree if present
+        if dir_path and dir_path.exists() and dir_path.is_dir():
+            await to_thread.run_sync(blob_store.remove_monster, dir_path)
+
         return {"detail": f"Pokémon {pokemon_id} deleted successfully."}
 
     except HTTPException:
@@ -114,4 +206,5 @@ async def delete_pokemon(pokemon_id: int, session: SessionType):
 
 @router.post("/get_all")
 def list_pokemon(session: SessionType) -> List[Pokemon]:
-    return list(session.exec(select(Pokemon)).all())
+    statement = select(Pokemon).where(Pokemon.state == PokemonState.active)
+    return list(session.exec(statement).all())
@@ -3,6 +3,7 @@ from src.database.db import SessionType
 from src.models import PokemonInput
 from typing import Literal
 from src.services import pokemon_folder_service as svc
+from src.services import sprite_atlas
 from fastapi import UploadFile
 from fastapi import HTTPException
 
@@ -89,7 +90,11 @@ async def upload_pokemon_image(
 ):
     """Upload an image into a Pokémon subfolder (e.g., base or animations)."""
     try:
-        return await svc.add_pokemon_image(pokemon_id, folder, session, file)
+        response = await svc.add_pokemon_image(pokemon_id, folder, session, file)
+        if folder == "animations":
+            base_dir = await sprite_atlas.pokemon_dir(pokemon_id, session)
+            await sprite_atlas.refresh_atlas(base_dir)
+        return response
     except HTTPException:
         raise
     except Exception as e:
@@ -109,3 +114,31 @@ async def list_pokemon_images(
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/{pokemon_id}/atlas")
+async def read_pokemon_atlas(pokemon_id: int, session: SessionType):
+    """
+    Manifest of the Pokémon's sprite atlas: one image (`url`) holding every
+    animation sheet, and each sheet's rectangle in it under `sprites`.
+    """
+    try:
+        return await sprite_atlas.get_pokemon_atlas(pokemon_id, session)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/{pokemon_id}/verify")
+async def verify_pokemon_files(pokemon_id: int, session: SessionType, deep: bool = False):
+    """
+    Integrity check of the Pokémon's stored files against their content
+    hashes; `?deep=true` also rereads the shared blobs.
+    """
+    try:
+        return await svc.verify_pokemon_files(pokemon_id, session, deep)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
@@ -0,0 +1,123 @@
+# Standard library
+import mimetypes
+import os
+import re
+import stat
+from pathlib import Path
+from typing import Optional
+
+# Third-party
+from anyio import to_thread
+from starlette.datastructures import Headers
+from starlette.requests import Request
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, PathLike, StaticFiles
+from starlette.types import Scope
+
+# Local application
+from src.utils.image_variants import accepted_media_types
+from src.utils.static_assets import ENCODINGS, AssetInfo, asset_info
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"  # may be stored, but revalidated (a cheap 304) on every use
+
+
+class CachedStaticFiles(StaticFiles):
+    """
+    StaticFiles with strong ETags, immutable versioned URLs and precompression.
+
+    - ETags are the SHA-256 of the content (see `static_assets.asset_info`), so
+      `If-None-Match` and `If-Range` stay valid across restarts and copies.
+    - A URL whose `?v=` matches the content hash, or whose path matches
+      `immutable` (e.g. Vite's hashed `assets/`), is cached for a year;
+      everything else must be revalidated.
+    - A current `.br`/`.gz` sibling is served when `Accept-Encoding` allows it.
+    - Range requests are answered by `FileResponse` against the same ETag.
+
+    Dot-prefixed files and folders (the blob store, temp files) are never
+    served. Hashing and sibling lookups run in `lookup_path`, which
+    StaticFiles calls on a worker thread.
+    """
+
+    def __init__(self, *args, immutable: Optional[str] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.immutable = re.compile(immutable) if immutable else None
+
+    def lookup_path(self, path: str) -> tuple[str, Optional[os.stat_result]]:
+        if any(part.startswith(".") for part in Path(path).parts):
+            return "", None
+        full_path, stat_result = super().lookup_path(path)
+        if stat_result is not None and stat.S_ISREG(stat_result.st_mode):
+            asset_info(full_path, stat_result)  # warm the cache off the event loop
+        return full_path, stat_result
+
+    def file_response(
+        self,
+        full_path: PathLike,
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        request_headers = Headers(scope=scope)
+        info = asset_info(full_path, stat_result)
+        encoding = self.pick_encoding(info, request_headers.get("accept-encoding", ""))
+        if encoding:
+            encoded_path, encoded_stat = info.encoded[encoding]
+            response = FileResponse(
+                encoded_path,
+                status_code=status_code,
+                stat_result=encoded_stat,
+                media_type=mimetypes.guess_type(str(full_path))[0],
+                headers={"content-encoding": encoding, "etag": f'"{info.digest}-{encoding}"'},
+            )
+        else:
+            response = FileResponse(
+                full_path,
+                status_code=status_code,
+                stat_result=stat_result,
+                headers={"etag": f'"{info.digest}"'},
+            )
+        if info.encoded:
+            response.headers["vary"] = "Accept-Encoding"
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
+
+    @staticmethod
+    def pick_encoding(info: AssetInfo, accept_encoding: str) -> Optional[str]:
+        if not info.encoded:
+            return None
+        accepted = accepted_media_types(accept_encoding)
+        for encoding in ENCODINGS:
+            if encoding in info.encoded and encoding in accepted:
+                return encoding
+        return None
+
+    def matches_version(self, path: str, version: str) -> bool:
+        """True when `version` is the content hash of `path` (blocking on a cache miss)."""
+        full_path, stat_result = super().lookup_path(path)
+        if stat_result is None or not stat.S_ISREG(stat_result.st_mode):
+            return False
+        return asset_info(full_path, stat_result).version == version
+
+    async def cache_control(self, path: str, scope: Scope) -> str:
+        if self.immutable is not None and self.immutable.search(path):
+            return IMMUTABLE
+        version = Request(scope).query_params.get("v")
+        if version and await to_thread.run_sync(self.matches_version, path, version):
+            return IMMUTABLE
+        return REVALIDATE
+
+    async def cached_response(
+        self, path: str, scope: Scope, version_path: Optional[str] = None
+    ) -> Response:
+        """Serve `path`, with Cache-Control decided by the URL of `version_path`."""
+        response = await super().get_response(path, scope)
+        if response.status_code in (200, 206, 304):
+            response.headers["cache-control"] = await self.cache_control(
+                version_path or path, scope
+            )
+        return response
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        return await self.cached_response(path, scope)
@@ -0,0 +1,38 @@
+from typing import List
+
+from fastapi import APIRouter, HTTPException, Query
+
+from src.database import usage as usage_db
+from src.database.db import SessionType
+from src.models import PokemonUsage
+from src.services import usage
+
+router = APIRouter(prefix="/usage", tags=["usage"])
+
+
+@router.get("/stages")
+async def usage_by_stage(
+    session: SessionType, hours: float = Query(default=24, gt=0)
+) -> dict:
+    """p50/p95 latency, calls, retries, tokens and cost per stage over the last `hours`.
+
+    Compare windows (e.g. `hours=1` against `hours=168`) to spot prompt or model
+    changes that made a stage slower or more expensive.
+    """
+    try:
+        return usage.stage_report(hours, session)
+    except HTTPException as e:
+        raise e
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/pokemon/{pokemon_id}")
+async def usage_for_pokemon(pokemon_id: int, session: SessionType) -> List[PokemonUsage]:
+    """Per-stage usage rows of every creation run (and upgrade) of one monster."""
+    try:
+        return list(usage_db.get_usage_for_pokemon(pokemon_id, session))
+    except HTTPException as e:
+        raise e
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
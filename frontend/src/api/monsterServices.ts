@@ -1,4 +1,5 @@
 import api from "./api";
+import { API_URL } from "../config";
 
 type Option = "animations" | "base";
 
@@ -17,3 +18,80 @@ export const GetPokemonFiles = async (pokemon_id: number, option: Option) => {
     console.log(error);
   }
 };
+
+export type CreationEvent = {
+  event: string;
+  data: any;
+};
+
+// Posts to the SSE creation route and calls onEvent for every server-sent event.
+export const streamMonsterCreation = async (
+  name: string,
+  payload: Record<string, string>,
+  onEvent: (event: CreationEvent) => void
+) => {
+  const response = await fetch(`${API_URL}/pokemon/create/stream/${name}`, {
+    method: "POST",
+    headers: { "Content-Type": "application/json" },
+    body: JSON.stringify(payload),
+    credentials: "include",
+  });
+  if (!response.ok || !response.body) {
+    throw new Error(`Monster creation failed: ${response.status}`);
+  }
+
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = "";
+  while (true) {
+    const { value, done } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
+    const chunks = buffer.split("\n\n");
+    buffer = chunks.pop() ?? "";
+    for (const chunk of chunks) {
+      if (chunk.startsWith(":")) continue; // keep-alive
+      let event = "message";
+      let data = "";
+      for (const line of chunk.split("\n")) {
+        if (line.startsWith("event: ")) event = line.slice("event: ".length);
+        if (line.startsWith("data: ")) data += line.slice("data: ".length);
+      }
+      onEvent({ event, data: data ? JSON.parse(data) : null });
+    }
+  }
+};
+
+// Claims a pre-generated monster from the egg pool; rejects with a 503 while none is ready.
+export const hatchMonster = async () => {
+  const response = await api.post("/pokemon/hatch");
+  return response.data;
+};
+
+export type AtlasRegion = { x: number; y: number; w: number; h: number };
+
+export type SpriteAtlas = {
+  version: string;
+  url: string;
+  width: number;
+  height: number;
+  frame_grid: [number, number];
+  sprites: Record<string, AtlasRegion>;
+};
+
+// One image holding every animation sheet of a monster; undefined when the
+// backend has no atlas for it (callers then load sheets one by one).
+export const getMonsterAtlas = async (
+  pokemon_id: number
+): Promise<SpriteAtlas | undefined> => {
+  try {
+    // 404 only means there is no atlas (no sprites yet, or no Pillow server-side)
+    const response = await api.get(`/pf/${pokemon_id}/atlas`, {
+      validateStatus: (status) => status === 200 || status === 404,
+    });
+    return response.status === 200 ? response.data : undefined;
+  } catch (error) {
+    console.log(error);
+    return undefined;
+  }
+};
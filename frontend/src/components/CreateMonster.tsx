@@ -1,6 +1,7 @@
 import { useState } from "react";
 import { MyButton } from "./MyButton";
-import api from "../api/api";
+import { streamMonsterCreation } from "../api/monsterServices";
+import { imageUrl } from "../config";
 
 
 
@@ -12,11 +13,15 @@ export default function CreateMonster() {
 
     const [loading, setLoading] = useState(false);
     const [result, setResult] = useState<string | null>(null);
+    const [stage, setStage] = useState<string | null>(null);
+    const [sprites, setSprites] = useState<string[]>([]);
 
     const handleSubmit = async (e: React.FormEvent<HTMLFormElement>) => {
 
         setLoading(true);
         setResult(null);
+        setStage(null);
+        setSprites([]);
         e.preventDefault();
         const payload = {
             name: monsterName,
@@ -26,11 +31,15 @@ export default function CreateMonster() {
         };
 
         try {
-            const result = await api.post(`/pokemon/create/complete/${monsterName}`, payload, {
-                headers: { "Content-Type": "application/json" },
+            await streamMonsterCreation(monsterName, payload, ({ event, data }) => {
+                if (event === "sprite" || event === "base_image") {
+                    setSprites((prev) => [...prev, data.url]);
+                } else if (event === "complete" || event === "error") {
+                    setResult(data.detail);
+                } else {
+                    setStage(event);
+                }
             });
-
-
         } catch (error) {
             console.log(error)
         } finally {
@@ -40,7 +49,14 @@ export default function CreateMonster() {
 
     if (loading) {
         return (
-            <div>Loading</div>
+            <div className="flex flex-col items-center gap-4 text-white">
+                <div>Loading{stage ? ` (${stage} done)` : ""}</div>
+                <div className="flex flex-wrap gap-2">
+                    {sprites.map((url) => (
+                        <img key={url} src={imageUrl(url)} className="w-24 h-24" />
+                    ))}
+                </div>
+            </div>
         )
     }
 
@@ -4,6 +4,7 @@ import { useEffect, useRef, forwardRef } from "react";
 import Konva from "konva";
 import { useContainerSize } from "./ResizableContainer";
 import { imageUrl } from "../config";
+import type { AtlasRegion } from "../api/monsterServices";
 
 type Size = {
     width: number;
@@ -14,6 +15,10 @@ type SpriteWalkingProps = {
     height: number;
     src: string;
     size: Size;
+    // Ask /images for a thumbnail of at least this many px (e.g. galleries)
+    thumbSize?: number;
+    // The sheet's rectangle when `src` is a sprite atlas (see getMonsterAtlas)
+    region?: AtlasRegion;
 };
 
 const URLImage = forwardRef<
@@ -29,9 +34,11 @@ export function SpriteWalking({
     height: BASE_H,
     src,
     size,
+    thumbSize,
+    region,
 }: SpriteWalkingProps) {
     const imageRef = useRef<Konva.Image>(null);
-    // sprite sheet: 2x2 frames on a 1024x1024 image
+    // sprite sheet: 2x2 frames; thumbnails are smaller than the 1024px original
     const scale = Math.min(size.width / BASE_W, size.height / BASE_H) || 1;
 
     const stageWidth = BASE_W * scale;
@@ -40,8 +47,7 @@ export function SpriteWalking({
     const frameCols = 2;
     const frameRows = 2;
     const sheetSize = 1024;
-    const spriteWidth = sheetSize / frameCols;
-    const spriteHeight = sheetSize / frameRows;
+    const query = thumbSize ? `?size=${thumbSize}` : "";
 
     useEffect(() => {
         if (!imageRef.current) return;
@@ -67,9 +73,16 @@ export function SpriteWalking({
                 }
             }
 
+            // Crop by the loaded sheet's size: a thumbnail, or the original
+            // when no thumbnail has been generated for it
+            const sheet = img.image() as HTMLImageElement | undefined;
+            const sheetWidth = region?.w ?? (sheet?.naturalWidth || sheetSize);
+            const sheetHeight = region?.h ?? (sheet?.naturalHeight || sheetSize);
+            const spriteWidth = sheetWidth / frameCols;
+            const spriteHeight = sheetHeight / frameRows;
             imageRef.current.crop({
-                x: ix * spriteWidth,
-                y: iy * spriteHeight,
+                x: (region?.x ?? 0) + ix * spriteWidth,
+                y: (region?.y ?? 0) + iy * spriteHeight,
                 width: spriteWidth,
                 height: spriteHeight,
             });
@@ -87,7 +100,7 @@ export function SpriteWalking({
         return () => {
             anim.stop();
         };
-    }, [BASE_W, BASE_H, spriteHeight, spriteWidth]);
+    }, [BASE_W, BASE_H, region]);
 
     return (
         <Stage
@@ -98,7 +111,7 @@ export function SpriteWalking({
             className="flex items-center justify-center"
         >
             <Layer>
-                <URLImage ref={imageRef} src={imageUrl("/images/" + src)} />
+                <URLImage ref={imageRef} src={imageUrl("/images/" + src + query)} />
             </Layer>
         </Stage>
     );
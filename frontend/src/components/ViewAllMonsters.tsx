@@ -38,7 +38,7 @@ function IndividualMonsterContainer({ src }: IndividualProps) {
             ref={containerRef}
             className="flex items-center justify-center w-40 h-40 rounded-xl border border-gray-700 bg-gray-800 hover:scale-105 transition-transform duration-200 shadow-md"
         >
-            <SpriteWalking width={100} height={100} src={src} size={size} />
+            <SpriteWalking width={100} height={100} src={src} size={size} thumbSize={256} />
         </div>
     );
 }
@@ -1,6 +1,7 @@
 import React, { useRef, useState, useEffect } from "react";
 import { SpriteWalking } from "./SpriteAnimation";
-import { GetPokemonFiles } from "../api/monsterServices";
+import { GetPokemonFiles, getMonsterAtlas } from "../api/monsterServices";
+import type { SpriteAtlas } from "../api/monsterServices";
 import { SplitFileNames } from "../utils";
 import { Dropdown } from "./DropDown";
 import { useContainerSize } from "./ResizableContainer";
@@ -14,12 +15,18 @@ export type MonsterData = {
 export function ViewIndividualMonster() {
     const [monsterData, setMonsterData] = useState<MonsterData[]>([]);
     const [selectedAnimation, setSelectedAnimation] = useState("");
+    const [atlas, setAtlas] = useState<SpriteAtlas>();
     const { ref: containerRef, size } = useContainerSize<HTMLDivElement>();
     useEffect(() => {
         const getMonster = async () => {
-            const monsterAnimation = await GetPokemonFiles(36, "animations");
+            // One atlas request replaces a request per animation sheet
+            const [monsterAnimation, monsterAtlas] = await Promise.all([
+                GetPokemonFiles(36, "animations"),
+                getMonsterAtlas(36),
+            ]);
             const data = SplitFileNames(monsterAnimation);
             setMonsterData(data);
+            setAtlas(monsterAtlas);
 
             if (data.length && !selectedAnimation) {
                 setSelectedAnimation(data[0].name);
@@ -33,11 +40,12 @@ export function ViewIndividualMonster() {
     const srcObj = monsterData.find(
         (v) => v.name.toLowerCase() === selectedAnimation.toLowerCase()
     );
-    const src = srcObj?.image_path;
+    const region = srcObj && atlas?.sprites[srcObj.name];
+    const src = atlas && region ? atlas.url.replace(/^\/images/, "") : srcObj?.image_path;
     return (
         <div ref={containerRef} className="md:w-1/2 md:h-1/2 w-full h-full flex flex-col justify-center items-center border rounded-lg overflow-hidden">
             <div>
-                <SpriteWalking width={100} src={src} height={100} size={size} />
+                <SpriteWalking width={100} src={src} height={100} size={size} region={region} />
             </div>
             <Dropdown
                 animations={animationNames}